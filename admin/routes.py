@@ -7,7 +7,7 @@ from models import (
     db, AdminUser, Notice, ActivityPost, Newsletter,
     DonationApplication, SiteInfo, BusinessArea, VolunteerArea, DonationArea, DonationUsage,
     HistorySection, HistoryItem, ActivityPhoto, ActivityCategory, File,
-    BusStop, BusRoute, OperatingHours, OfficeInfo, BuildStatus
+    BusStop, BusRoute, OperatingHours, OfficeInfo, BuildStatus, FileReference
 )
 from . import admin_bp
 from .auth import login_required, super_admin_required, get_current_admin
@@ -104,20 +104,28 @@ def dashboard():
 @login_required
 def notices_list():
     """공지사항 목록"""
+    from search_index import search_subquery, search_highlights
+
     page = request.args.get('page', 1, type=int)
-    q = request.args.get('q', '')
+    q = request.args.get('q', '').strip()
 
     query = Notice.query
 
     if q:
-        query = query.filter(Notice.title.contains(q))
-
-    # 고정 공지 먼저, 그 다음 최신순
-    query = query.order_by(Notice.is_pinned.desc(), Notice.created_at.desc())
+        # 제목 + 본문 전문 검색 (관련도순)
+        hits = search_subquery('notice', q)
+        query = query.join(hits, hits.c.owner_id == Notice.id)\
+            .order_by(hits.c.rank, Notice.created_at.desc())
+    else:
+        # 고정 공지 먼저, 그 다음 최신순
+        query = query.order_by(Notice.is_pinned.desc(), Notice.created_at.desc())
     pagination = query.paginate(page=page, per_page=20, error_out=False)
 
+    highlights = search_highlights('notice', q, [n.id for n in pagination.items]) if q else {}
+
     return render_template('admin/notices/list.html',
                            pagination=pagination,
+                           highlights=highlights,
                            q=q)
 
 
@@ -158,9 +166,16 @@ def notices_new():
             for file in files:
                 if file and file.filename:
                     file_record = save_uploaded_file(file)
-                    if file_record:
+                    # 같은 내용이면 기존 File 이 돌아오므로 이미 첨부된 파일은 건너뜀
+                    if file_record and file_record not in notice.attachments:
                         notice.attachments.append(file_record)
 
+        # 직접 업로드(R2)된 첨부파일 연결
+        from .utils import get_direct_uploads
+        for file_record in get_direct_uploads(request.form.getlist('attachment_ids', type=int)):
+            if file_record not in notice.attachments:
+                notice.attachments.append(file_record)
+
         db.session.commit()
 
         flash('공지사항이 등록되었습니다.', 'success')
@@ -202,14 +217,22 @@ def notices_edit(id):
             for file in files:
                 if file and file.filename:
                     file_record = save_uploaded_file(file)
-                    if file_record:
+                    # 같은 내용이면 기존 File 이 돌아오므로 이미 첨부된 파일은 건너뜀
+                    if file_record and file_record not in notice.attachments:
                         notice.attachments.append(file_record)
 
+        # 직접 업로드(R2)된 첨부파일 연결
+        from .utils import get_direct_uploads
+        for file_record in get_direct_uploads(request.form.getlist('attachment_ids', type=int)):
+            if file_record not in notice.attachments:
+                notice.attachments.append(file_record)
+
         db.session.commit()
 
         # 삭제된 이미지 정리
         from .utils import cleanup_orphaned_images
         cleanup_orphaned_images(old_content, notice.content or '')
+        db.session.commit()
 
         flash('공지사항이 수정되었습니다.', 'success')
         return redirect(url_for('admin.notices_list'))
@@ -228,15 +251,9 @@ def notices_attachment_delete(id, file_id):
         # 1. 관계 끊기
         notice.attachments.remove(file_record)
 
-        # 2. 실제 파일 삭제
-        import os
-        from config import Config
-        filepath = os.path.join(Config.DIST_DIR, 'uploads', file_record.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-
-        # 3. File 레코드 삭제
-        db.session.delete(file_record)
+        # 2. 파일 참조 해제 (다른 곳에서 쓰지 않으면 R2/레코드 삭제)
+        from .utils import release_file
+        release_file(file_record)
         db.session.commit()
 
     if request.headers.get('HX-Request'):
@@ -251,31 +268,29 @@ def notices_delete(id):
     """공지사항 삭제"""
     notice = Notice.query.get_or_404(id)
 
-    # 1. 첨부파일 삭제 (관계 끊고 파일 삭제)
     import os
     from config import Config
+    from .utils import release_file, cleanup_all_content_images
     attachments_to_delete = list(notice.attachments)  # 복사
-    notice.attachments.clear()  # 관계 먼저 끊기
+    content = notice.content
 
+    # 1. DB에서 게시물 삭제 (flush 로 역참조를 먼저 지워야 아래에서 파일이 미사용으로 판정됨)
+    notice.attachments.clear()
+    db.session.delete(notice)
+    db.session.flush()
+
+    # 2. 첨부파일 참조 해제 (다른 곳에서 쓰지 않으면 R2/레코드 삭제)
     for attachment in attachments_to_delete:
-        # 실제 파일 삭제
-        filepath = os.path.join(Config.DIST_DIR, 'uploads', attachment.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        # File 레코드 삭제
-        db.session.delete(attachment)
+        release_file(attachment)
 
-    # 2. 본문 내 이미지 삭제
-    from .utils import cleanup_all_content_images
-    cleanup_all_content_images(notice.content)
+    # 3. 본문 내 이미지 삭제
+    cleanup_all_content_images(content)
 
-    # 3. dist 폴더의 HTML 파일 삭제
+    # 4. dist 폴더의 HTML 파일 삭제
     html_path = os.path.join(Config.DIST_DIR, 'notice', f'{id}.html')
     if os.path.exists(html_path):
         os.remove(html_path)
 
-    # 4. DB에서 게시물 삭제
-    db.session.delete(notice)
     db.session.commit()
 
     flash('공지사항이 삭제되었습니다.', 'success')
@@ -308,14 +323,18 @@ def notices_toggle_pin(id):
 @login_required
 def activities_list():
     """활동후기 목록"""
+    from search_index import search_subquery, search_highlights
+
     page = request.args.get('page', 1, type=int)
-    q = request.args.get('q', '')
+    q = request.args.get('q', '').strip()
     category = request.args.get('category', '')
 
     query = ActivityPost.query
 
     if q:
-        query = query.filter(ActivityPost.title.contains(q))
+        # 제목 + 본문 전문 검색 (관련도순)
+        hits = search_subquery('activity', q)
+        query = query.join(hits, hits.c.owner_id == ActivityPost.id).order_by(hits.c.rank)
     if category:
         if category == '__none__':
             query = query.filter((ActivityPost.category == None) | (ActivityPost.category == ''))
@@ -325,6 +344,8 @@ def activities_list():
     query = query.order_by(ActivityPost.created_at.desc())
     pagination = query.paginate(page=page, per_page=20, error_out=False)
 
+    highlights = search_highlights('activity', q, [a.id for a in pagination.items]) if q else {}
+
     # 필터 드롭다운용 활성 카테고리
     active_categories = ActivityCategory.query.filter_by(is_active=True).order_by(ActivityCategory.display_order).all()
     # 색상 표시용 모든 카테고리
@@ -334,6 +355,7 @@ def activities_list():
                            pagination=pagination,
                            categories=active_categories,
                            all_categories=all_categories,
+                           highlights=highlights,
                            q=q,
                            current_category=category)
 
@@ -392,9 +414,16 @@ def activities_new():
             for file in files:
                 if file and file.filename:
                     file_record = save_uploaded_file(file)
-                    if file_record:
+                    # 같은 내용이면 기존 File 이 돌아오므로 이미 첨부된 파일은 건너뜀
+                    if file_record and file_record not in activity.attachments:
                         activity.attachments.append(file_record)
 
+        # 직접 업로드(R2)된 첨부파일 연결
+        from .utils import get_direct_uploads
+        for file_record in get_direct_uploads(request.form.getlist('attachment_ids', type=int)):
+            if file_record not in activity.attachments:
+                activity.attachments.append(file_record)
+
         db.session.commit()
 
         flash('활동후기가 등록되었습니다.', 'success')
@@ -451,14 +480,22 @@ def activities_edit(id):
             for file in files:
                 if file and file.filename:
                     file_record = save_uploaded_file(file)
-                    if file_record:
+                    # 같은 내용이면 기존 File 이 돌아오므로 이미 첨부된 파일은 건너뜀
+                    if file_record and file_record not in activity.attachments:
                         activity.attachments.append(file_record)
 
+        # 직접 업로드(R2)된 첨부파일 연결
+        from .utils import get_direct_uploads
+        for file_record in get_direct_uploads(request.form.getlist('attachment_ids', type=int)):
+            if file_record not in activity.attachments:
+                activity.attachments.append(file_record)
+
         db.session.commit()
 
         # 삭제된 이미지 정리
         from .utils import cleanup_orphaned_images
         cleanup_orphaned_images(old_content, activity.content or '')
+        db.session.commit()
 
         flash('활동후기가 수정되었습니다.', 'success')
         return redirect(url_for('admin.activities_list'))
@@ -474,37 +511,30 @@ def activities_delete(id):
 
     import os
     from config import Config
+    from .utils import release_file, cleanup_all_content_images
+    files_to_release = list(activity.attachments)  # 복사
+    if activity.thumbnail:
+        files_to_release.append(activity.thumbnail)
+    content = activity.content
 
-    # 1. 첨부파일 삭제 (관계 끊고 파일 삭제)
-    attachments_to_delete = list(activity.attachments)  # 복사
-    activity.attachments.clear()  # 관계 먼저 끊기
+    # 1. DB에서 게시물 삭제 (flush 로 역참조를 먼저 지워야 아래에서 파일이 미사용으로 판정됨)
+    activity.attachments.clear()
+    activity.thumbnail = None
+    db.session.delete(activity)
+    db.session.flush()
 
-    for attachment in attachments_to_delete:
-        # 실제 파일 삭제
-        filepath = os.path.join(Config.DIST_DIR, 'uploads', attachment.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        # File 레코드 삭제
-        db.session.delete(attachment)
-
-    # 2. 썸네일 파일 삭제
-    if activity.thumbnail:
-        filepath = os.path.join(Config.DIST_DIR, 'uploads', activity.thumbnail.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        db.session.delete(activity.thumbnail)
+    # 2. 첨부파일/썸네일 참조 해제 (다른 곳에서 쓰지 않으면 R2/레코드 삭제)
+    for file_record in files_to_release:
+        release_file(file_record)
 
     # 3. 본문 내 이미지 삭제
-    from .utils import cleanup_all_content_images
-    cleanup_all_content_images(activity.content)
+    cleanup_all_content_images(content)
 
     # 4. dist 폴더의 HTML 파일 삭제
     html_path = os.path.join(Config.DIST_DIR, 'activity', f'{id}.html')
     if os.path.exists(html_path):
         os.remove(html_path)
 
-    # 5. DB에서 게시물 삭제
-    db.session.delete(activity)
     db.session.commit()
 
     flash('활동후기가 삭제되었습니다.', 'success')
@@ -526,15 +556,9 @@ def activities_attachment_delete(id, file_id):
         # 1. 관계 끊기
         activity.attachments.remove(file_record)
 
-        # 2. 실제 파일 삭제
-        import os
-        from config import Config
-        filepath = os.path.join(Config.DIST_DIR, 'uploads', file_record.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-
-        # 3. File 레코드 삭제
-        db.session.delete(file_record)
+        # 2. 파일 참조 해제 (다른 곳에서 쓰지 않으면 R2/레코드 삭제)
+        from .utils import release_file
+        release_file(file_record)
         db.session.commit()
 
     if request.headers.get('HX-Request'):
@@ -550,12 +574,25 @@ def activities_attachment_delete(id, file_id):
 @login_required
 def newsletters_list():
     """소식지 목록"""
+    from search_index import search_subquery, search_highlights
+
     page = request.args.get('page', 1, type=int)
+    q = request.args.get('q', '').strip()
 
-    query = Newsletter.query.order_by(Newsletter.published_at.desc().nullslast(), Newsletter.created_at.desc())
+    query = Newsletter.query
+    if q:
+        # 제목 + 설명/본문 전문 검색 (관련도순)
+        hits = search_subquery('newsletter', q)
+        query = query.join(hits, hits.c.owner_id == Newsletter.id).order_by(hits.c.rank)
+    query = query.order_by(Newsletter.published_at.desc().nullslast(), Newsletter.created_at.desc())
     pagination = query.paginate(page=page, per_page=20, error_out=False)
 
-    return render_template('admin/newsletters/list.html', pagination=pagination)
+    highlights = search_highlights('newsletter', q, [n.id for n in pagination.items]) if q else {}
+
+    return render_template('admin/newsletters/list.html',
+                           pagination=pagination,
+                           highlights=highlights,
+                           q=q)
 
 
 @admin_bp.route('/newsletters/new', methods=['GET', 'POST'])
@@ -651,6 +688,7 @@ def newsletters_edit(id):
         # 삭제된 이미지 정리
         from .utils import cleanup_orphaned_images
         cleanup_orphaned_images(old_content, newsletter.html_content or '')
+        db.session.commit()
 
         flash('소식지가 수정되었습니다.', 'success')
         return redirect(url_for('admin.newsletters_list'))
@@ -664,19 +702,23 @@ def newsletters_delete(id):
     """소식지 삭제"""
     newsletter = Newsletter.query.get_or_404(id)
 
-    # 1. 본문 내 이미지 삭제
+    content = newsletter.html_content
+
+    # 1. DB에서 게시물 삭제 (flush 로 역참조를 먼저 지워야 아래에서 이미지가 미사용으로 판정됨)
+    db.session.delete(newsletter)
+    db.session.flush()
+
+    # 2. 본문 내 이미지 삭제
     from .utils import cleanup_all_content_images
-    cleanup_all_content_images(newsletter.html_content)
+    cleanup_all_content_images(content)
 
-    # 2. dist 폴더의 HTML 파일 삭제
+    # 3. dist 폴더의 HTML 파일 삭제
     import os
     from config import Config
     html_path = os.path.join(Config.DIST_DIR, 'newsletter', f'{id}.html')
     if os.path.exists(html_path):
         os.remove(html_path)
 
-    # 3. DB에서 게시물 삭제
-    db.session.delete(newsletter)
     db.session.commit()
 
     flash('소식지가 삭제되었습니다.', 'success')
@@ -899,24 +941,12 @@ def users_delete(id):
 @login_required
 def upload_image():
     """에디터에서 이미지 업로드 (붙여넣기, 드래그앤드롭)"""
-    from .utils import save_uploaded_file, save_base64_image, ALLOWED_IMAGE_EXTENSIONS, check_storage_available
-    import base64
-    import json
+    from .utils import save_uploaded_file, save_base64_image, ALLOWED_IMAGE_EXTENSIONS
 
-    # 파일 업로드 방식
+    # 파일 업로드 방식 (전체 저장 공간 확인은 save_uploaded_file에서 처리)
     if 'file' in request.files:
         file = request.files['file']
         if file and file.filename:
-            # 파일 크기 체크 (전체 용량 확인용)
-            file.seek(0, 2)
-            size = file.tell()
-            file.seek(0)
-
-            # 전체 저장 공간 확인
-            is_available, error_msg = check_storage_available(size)
-            if not is_available:
-                return jsonify({'success': False, 'error': error_msg}), 400
-
             file_record = save_uploaded_file(file, ALLOWED_IMAGE_EXTENSIONS)
             if file_record:
                 db.session.commit()
@@ -925,30 +955,12 @@ def upload_image():
                     'url': file_record.url,
                     'filename': file_record.original_filename
                 })
-            return jsonify({'success': False, 'error': '이미지 저장 실패 (파일 크기 또는 형식을 확인하세요)'}), 400
+            return jsonify({'success': False, 'error': '이미지 저장 실패 (파일 크기, 형식 또는 저장 공간을 확인하세요)'}), 400
 
     # Base64 방식 (붙여넣기)
     data = request.get_json()
     if data and 'image' in data:
-        base64_data = data['image']
-
-        # Base64 데이터 크기 추정
-        try:
-            if ',' in base64_data:
-                _, data_part = base64_data.split(',', 1)
-            else:
-                data_part = base64_data
-            import base64 as b64
-            estimated_size = len(b64.b64decode(data_part))
-
-            # 전체 저장 공간 확인
-            is_available, error_msg = check_storage_available(estimated_size)
-            if not is_available:
-                return jsonify({'success': False, 'error': error_msg}), 400
-        except:
-            pass  # 크기 추정 실패 시 계속 진행
-
-        file_record = save_base64_image(base64_data)
+        file_record = save_base64_image(data['image'])
         if file_record:
             db.session.commit()
             return jsonify({
@@ -956,11 +968,52 @@ def upload_image():
                 'url': file_record.url,
                 'filename': file_record.original_filename
             })
-        return jsonify({'success': False, 'error': 'Base64 이미지 저장 실패 (파일 크기 또는 형식을 확인하세요)'}), 400
+        return jsonify({'success': False, 'error': 'Base64 이미지 저장 실패 (파일 크기, 형식 또는 저장 공간을 확인하세요)'}), 400
 
     return jsonify({'success': False, 'error': '이미지가 없습니다'}), 400
 
 
+@admin_bp.route('/upload/presign', methods=['POST'])
+@login_required
+def upload_presign():
+    """R2 직접 업로드용 presigned URL 발급 (브라우저가 R2로 바로 PUT)"""
+    from .utils import create_direct_upload, ALLOWED_IMAGE_EXTENSIONS
+
+    data = request.get_json() or {}
+    allowed = ALLOWED_IMAGE_EXTENSIONS if data.get('kind') == 'image' else None
+
+    try:
+        size = int(data.get('size', 0))
+    except (TypeError, ValueError):
+        size = 0
+
+    ticket, error_msg = create_direct_upload(data.get('filename', ''), size, allowed, data.get('sha256'))
+    if not ticket:
+        return jsonify({'success': False, 'error': error_msg}), 400
+
+    return jsonify({'success': True, **ticket})
+
+
+@admin_bp.route('/upload/confirm', methods=['POST'])
+@login_required
+def upload_confirm():
+    """R2 직접 업로드 완료 확인 및 File 레코드 생성"""
+    from .utils import confirm_direct_upload
+
+    data = request.get_json() or {}
+    file_record, error_msg = confirm_direct_upload(data.get('token', ''))
+    if not file_record:
+        return jsonify({'success': False, 'error': error_msg}), 400
+
+    db.session.commit()
+    return jsonify({
+        'success': True,
+        'id': file_record.id,
+        'url': file_record.url,
+        'filename': file_record.original_filename
+    })
+
+
 # ==========================================
 # 사업분야 관리
 # ==========================================
@@ -2028,6 +2081,17 @@ def operating_hours_office():
 # ==========================================
 # 파일 관리
 # ==========================================
+
+# 사용처 링크 (FileReference.owner_type → 수정 페이지)
+REFERENCE_EDIT_ENDPOINTS = {
+    'notice': 'admin.notices_edit',
+    'activity': 'admin.activities_edit',
+    'newsletter': 'admin.newsletters_edit',
+    'business_area': 'admin.business_areas_edit',
+    'activity_photo': 'admin.hero_photos_edit',
+}
+
+
 @admin_bp.route('/files')
 @login_required
 def files_list():
@@ -2043,6 +2107,16 @@ def files_list():
         page=page, per_page=per_page, error_out=False
     )
 
+    # 파일별 사용처 (현재 페이지 파일만 한 번에 조회)
+    file_ids = [f.id for f in pagination.items]
+    references = {}
+    if file_ids:
+        refs = FileReference.query.filter(FileReference.file_id.in_(file_ids)).order_by(
+            FileReference.owner_type, FileReference.owner_id
+        ).all()
+        for ref in refs:
+            references.setdefault(ref.file_id, []).append(ref)
+
     # 저장 공간 정보
     total_usage = get_total_storage_usage()
     max_storage = Config.MAX_TOTAL_STORAGE
@@ -2062,6 +2136,8 @@ def files_list():
     return render_template('admin/files.html',
                          files=pagination.items,
                          pagination=pagination,
+                         references=references,
+                         reference_endpoints=REFERENCE_EDIT_ENDPOINTS,
                          storage_info=storage_info)
 
 
@@ -2090,6 +2166,18 @@ def file_delete(file_id):
     return redirect(url_for('admin.files_list'))
 
 
+# ==========================================
+# 캐시 통계
+# ==========================================
+@admin_bp.route('/cache/stats')
+@login_required
+def cache_stats():
+    """프로세스 내 캐시 히트/미스 통계 (현재 워커 기준, AJAX)"""
+    import os
+    from app_cache import all_stats
+    return jsonify({'pid': os.getpid(), 'caches': all_stats()})
+
+
 # ==========================================
 # SSG 빌드 관리
 # ==========================================
@@ -4,27 +4,32 @@
 import os
 import uuid
 import re
+import base64
+import hashlib
+import mimetypes
 import requests
 from bs4 import BeautifulSoup
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from werkzeug.utils import secure_filename
 from flask import current_app
-from models import db, File
-from r2_storage import upload_to_r2, delete_from_r2
+from models import db, File, StorageUsage
+from r2_storage import upload_to_r2, delete_from_r2, generate_presigned_put, head_r2_object
 
 # 허용 파일 확장자
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'pdf', 'hwp', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'zip'}
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+HASH_CHUNK_SIZE = 64 * 1024  # SHA-256 계산 시 읽기 단위
+SHA256_PATTERN = re.compile(r'[0-9a-f]{64}')
 
 
 def get_total_storage_usage():
     """
-    현재 전체 업로드 파일 용량 계산
+    현재 전체 업로드 파일 용량 (storage_usage 집계값, 1행 조회)
     Returns: 총 사용 용량 (bytes)
     """
-    total = db.session.query(db.func.sum(File.size)).scalar()
-    return total or 0
+    return StorageUsage.get_total()
 
 
 def check_storage_available(new_file_size):
@@ -47,6 +52,45 @@ def check_storage_available(new_file_size):
     return True, None
 
 
+def compute_sha256(stream):
+    """
+    스트림을 청크 단위로 읽으며 SHA-256 계산 (전체를 메모리에 올리지 않음)
+    계산 후 스트림 위치는 처음으로 되돌림
+    Returns: hex digest
+    """
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def find_duplicate_file(sha256):
+    """같은 내용의 기존 File 레코드 조회"""
+    if not sha256:
+        return None
+    return File.query.filter_by(sha256=sha256).order_by(File.id).first()
+
+
+def release_file(file_record):
+    """
+    파일 참조 해제 - 관계/본문에서 뺀 뒤 호출, 더 쓰는 콘텐츠가 없으면 R2 객체와 레코드 삭제
+    사용 여부는 flush 때 갱신되는 file_references 기준 (같은 파일을 여러 번 올리거나 붙여 넣어도 중복 계산 없음)
+    Returns: 실제 삭제 여부 (bool)
+    """
+    if not file_record:
+        return False
+
+    db.session.flush()
+    if file_record.is_used():
+        return False
+
+    delete_from_r2(file_record.filename)
+    db.session.delete(file_record)
+    return True
+
+
 def allowed_file(filename, allowed=None):
     """파일 확장자 확인"""
     if allowed is None:
@@ -57,6 +101,7 @@ def allowed_file(filename, allowed=None):
 def save_uploaded_file(file, allowed=None):
     """
     업로드된 파일 저장 및 File 레코드 생성
+    같은 내용(SHA-256)의 파일이 이미 있으면 업로드 없이 기존 레코드 재사용
     Returns: File 객체 또는 None
     """
     if not file or not file.filename:
@@ -73,6 +118,12 @@ def save_uploaded_file(file, allowed=None):
     if size > MAX_FILE_SIZE:
         return None
 
+    # 중복 파일 확인 (스트리밍 해시)
+    sha256 = compute_sha256(file.stream)
+    duplicate = find_duplicate_file(sha256)
+    if duplicate:
+        return duplicate
+
     # 전체 저장 공간 확인
     is_available, error_msg = check_storage_available(size)
     if not is_available:
@@ -88,16 +139,16 @@ def save_uploaded_file(file, allowed=None):
     # 저장용 고유 파일명 (UUID 기반)
     unique_filename = f"{uuid.uuid4().hex}.{ext}"
 
-    # R2에 업로드
-    file_data = file.read()
-    upload_to_r2(file_data, unique_filename, file.content_type)
+    # R2에 업로드 (스트림 그대로 전송)
+    upload_to_r2(file.stream, unique_filename, file.content_type)
 
     # File 레코드 생성
     file_record = File(
         filename=unique_filename,
         original_filename=original_filename,
         mimetype=file.content_type,
-        size=size
+        size=size,
+        sha256=sha256
     )
     db.session.add(file_record)
     db.session.flush()
@@ -112,8 +163,6 @@ def save_base64_image(base64_data):
         base64_data: data:image/png;base64,... 형태의 문자열
     Returns: File 객체 또는 None
     """
-    import base64
-
     try:
         # data:image/png;base64,... 형식 파싱
         if ',' in base64_data:
@@ -142,6 +191,12 @@ def save_base64_image(base64_data):
         if size > MAX_FILE_SIZE:
             return None
 
+        # 중복 파일 확인
+        sha256 = hashlib.sha256(image_data).hexdigest()
+        duplicate = find_duplicate_file(sha256)
+        if duplicate:
+            return duplicate
+
         # 전체 저장 공간 확인
         is_available, error_msg = check_storage_available(size)
         if not is_available:
@@ -160,7 +215,8 @@ def save_base64_image(base64_data):
             filename=unique_filename,
             original_filename=original_filename,
             mimetype=mimetype,
-            size=size
+            size=size,
+            sha256=sha256
         )
         db.session.add(file_record)
         db.session.flush()
@@ -172,6 +228,134 @@ def save_base64_image(base64_data):
         return None
 
 
+def _upload_ticket_serializer():
+    """직접 업로드 티켓 서명용 serializer"""
+    return URLSafeTimedSerializer(current_app.secret_key, salt='r2-direct-upload')
+
+
+def create_direct_upload(original_filename, size, allowed=None, sha256=None):
+    """
+    브라우저 → R2 직접 업로드 준비 (presigned PUT URL 발급)
+    Args:
+        original_filename: 원본 파일명
+        size: 업로드할 파일 크기 (bytes)
+        allowed: 허용 확장자 (기본값: ALLOWED_EXTENSIONS)
+        sha256: 브라우저에서 계산한 내용 해시 (hex, 선택)
+    Returns: (업로드 정보 dict, 에러 메시지)
+        같은 내용의 파일이 이미 있으면 업로드 없이 {'duplicate': True, ...} 반환
+        (참조는 폼 저장 때 콘텐츠에 연결되면서 file_references 로 집계)
+    """
+    if not original_filename or not allowed_file(original_filename, allowed):
+        return None, '허용되지 않는 파일 형식입니다.'
+
+    if not size or size <= 0:
+        return None, '파일 크기를 확인할 수 없습니다.'
+
+    if size > MAX_FILE_SIZE:
+        return None, f'파일 크기는 {MAX_FILE_SIZE // (1024 * 1024)}MB를 넘을 수 없습니다.'
+
+    # 같은 내용의 파일이 이미 있으면 업로드 생략
+    sha256 = (sha256 or '').lower()
+    if not SHA256_PATTERN.fullmatch(sha256):
+        sha256 = None
+    duplicate = find_duplicate_file(sha256)
+    if duplicate:
+        return {
+            'duplicate': True,
+            'id': duplicate.id,
+            'url': duplicate.url,
+            'filename': duplicate.original_filename
+        }, None
+
+    # 전체 저장 공간 확인
+    is_available, error_msg = check_storage_available(size)
+    if not is_available:
+        return None, error_msg
+
+    ext = original_filename.rsplit('.', 1)[1].lower()
+    unique_filename = f"{uuid.uuid4().hex}.{ext}"
+
+    # Content-Type은 서버가 확장자로 결정 (브라우저가 보내는 값은 신뢰하지 않음)
+    mimetype = mimetypes.guess_type(original_filename)[0] or 'application/octet-stream'
+
+    # 해시가 있으면 R2가 업로드 내용과 해시 일치 여부를 검증 (x-amz-checksum-sha256)
+    headers = {'Content-Type': mimetype}
+    checksum = None
+    if sha256:
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        headers['x-amz-checksum-sha256'] = checksum
+
+    upload_url = generate_presigned_put(unique_filename, mimetype, size, checksum)
+    token = _upload_ticket_serializer().dumps({
+        'filename': unique_filename,
+        'original_filename': original_filename,
+        'mimetype': mimetype,
+        'size': size,
+        'sha256': sha256
+    })
+
+    return {
+        'upload_url': upload_url,
+        'headers': headers,
+        'token': token
+    }, None
+
+
+def confirm_direct_upload(token):
+    """
+    직접 업로드 완료 확인 후 File 레코드 생성
+    Args:
+        token: create_direct_upload()가 발급한 티켓
+    Returns: (File 객체, 에러 메시지)
+    """
+    from config import Config
+
+    try:
+        # presigned URL 만료 후에도 업로드가 끝날 수 있도록 여유를 둠
+        ticket = _upload_ticket_serializer().loads(token, max_age=Config.R2_PRESIGNED_EXPIRES * 2)
+    except SignatureExpired:
+        return None, '업로드 시간이 만료되었습니다. 다시 시도해주세요.'
+    except BadSignature:
+        return None, '올바르지 않은 업로드 요청입니다.'
+
+    # 같은 티켓으로 중복 확인 요청이 와도 레코드는 하나만 생성
+    file_record = File.query.filter_by(filename=ticket['filename']).first()
+    if file_record:
+        return file_record, None
+
+    obj = head_r2_object(ticket['filename'])
+    if not obj:
+        return None, '업로드된 파일을 찾을 수 없습니다.'
+
+    if obj.get('ContentLength') != ticket['size']:
+        delete_from_r2(ticket['filename'])
+        return None, '업로드된 파일 크기가 요청과 다릅니다.'
+
+    file_record = File(
+        filename=ticket['filename'],
+        original_filename=ticket['original_filename'],
+        mimetype=ticket['mimetype'],
+        size=ticket['size'],
+        sha256=ticket.get('sha256')
+    )
+    db.session.add(file_record)
+    db.session.flush()
+
+    return file_record, None
+
+
+def get_direct_uploads(file_ids):
+    """
+    직접 업로드로 생성된 File 레코드 조회 (폼 제출 시 첨부파일 연결용)
+    Args:
+        file_ids: File ID 목록
+    Returns: File 객체 리스트
+    """
+    if not file_ids:
+        return []
+    return File.query.filter(File.id.in_(file_ids)).all()
+
+
 def extract_image_urls(html_content):
     """
     HTML 콘텐츠에서 이미지 URL 추출
@@ -192,6 +376,21 @@ def extract_image_urls(html_content):
     return set(full_matches)
 
 
+def release_image(filename):
+    """
+    콘텐츠에서 빠진 이미지 참조 해제
+    - File 레코드가 있으면 참조 카운트 감소 (0이 되면 R2/레코드 삭제)
+    - 레코드 없는 레거시 이미지는 R2에서 바로 삭제
+    Returns: 실제 삭제 여부 (bool)
+    """
+    file_record = File.query.filter_by(filename=filename).first()
+    if file_record:
+        return release_file(file_record)
+
+    delete_from_r2(filename)
+    return True
+
+
 def cleanup_orphaned_images(old_content, new_content):
     """
     이전 콘텐츠에는 있지만 새 콘텐츠에는 없는 이미지 삭제
@@ -208,14 +407,8 @@ def cleanup_orphaned_images(old_content, new_content):
         filename = url.replace('/uploads/', '')
 
         try:
-            # R2에서 삭제
-            delete_from_r2(filename)
-            deleted_count += 1
-
-            # File 레코드도 삭제
-            file_record = File.query.filter_by(filename=filename).first()
-            if file_record:
-                db.session.delete(file_record)
+            if release_image(filename):
+                deleted_count += 1
         except Exception as e:
             print(f"이미지 삭제 실패: {filename} - {e}")
 
@@ -263,14 +456,8 @@ def cleanup_all_content_images(content):
         filename = url.replace('/uploads/', '')
 
         try:
-            # R2에서 삭제
-            delete_from_r2(filename)
-            deleted_count += 1
-
-            # File 레코드도 삭제
-            file_record = File.query.filter_by(filename=filename).first()
-            if file_record:
-                db.session.delete(file_record)
+            if release_image(filename):
+                deleted_count += 1
         except Exception as e:
             print(f"이미지 삭제 실패: {filename} - {e}")
 
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, jsonify, request, redirect, send_from_directory
+from flask import Flask, render_template, jsonify, request, redirect, send_from_directory, url_for
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from config import Config
@@ -6,11 +6,16 @@ from models import db, File, SiteInfo, ActivityPhoto, BusinessArea, SponsorshipI
 from models import HistorySection, HistoryItem, Notice, ActivityPost, Newsletter, DonationApplication, ActivityCategory
 from models import AdminUser, BuildStatus
 from r2_storage import upload_to_r2, get_r2_url
+from app_cache import VersionedCache, invalidate_on_commit, cached_response
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import selectinload, load_only
 import os
+import json
 import uuid
+import base64
 import logging
 from logging.handlers import RotatingFileHandler
-from datetime import datetime
+from datetime import datetime, date
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -83,9 +88,17 @@ app.register_blueprint(admin_bp)
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # 빌드 트리거 시스템 활성화
-from build_triggers import setup_build_triggers
+from build_triggers import setup_build_triggers, get_trigger_model_classes
 setup_build_triggers(app)
 
+# 관리자 전문 검색 인덱스 자동 갱신
+from search_index import setup_search_index
+setup_search_index(app)
+
+# 읽기 전용 JSON API 응답 캐시 (빌드 트리거와 같은 모델 변경 시 무효화)
+api_cache = VersionedCache('api')
+invalidate_on_commit(get_trigger_model_classes().values(), 'api')
+
 
 # ==========================================
 # 템플릿 필터
@@ -106,17 +119,22 @@ def fix_upload_urls(content):
 # ==========================================
 # 컨텍스트 프로세서 (Admin 템플릿용)
 # ==========================================
-@app.context_processor
-def inject_site_info():
-    """사이트 정보를 모든 템플릿에 주입 (Admin 페이지용)"""
+# SiteInfo는 단일 레코드 → 워커별 메모리 캐시, 변경 커밋 시 모든 워커에서 무효화
+site_info_cache = VersionedCache('site_info')
+invalidate_on_commit([SiteInfo], 'site_info')
+
+
+def load_site_info():
+    """사이트 정보 dict (없으면 빈 dict)"""
     site_info = SiteInfo.query.first()
-    if site_info:
-        site = site_info.to_dict()
-    else:
-        site = {}
+    return site_info.to_dict() if site_info else {}
 
+
+@app.context_processor
+def inject_site_info():
+    """사이트 정보를 모든 템플릿에 주입 (Admin 페이지용, 캐시 사용)"""
     return {
-        'site': site,
+        'site': site_info_cache.get('site', load_site_info),
         'STATIC_SITE_URL': Config.STATIC_DOMAIN
     }
 
@@ -195,28 +213,167 @@ def donation_apply():
 # ==========================================
 # API 라우트 (CMS용)
 # ==========================================
+# 목록 API 공통 (커서 페이지네이션 / fields= 선택 / 조건부 GET)
+# 응답 본문은 기존과 같은 배열, 다음 페이지는 Link / X-Next-Cursor 헤더로 전달
+#   GET /api/notices?limit=20&fields=id,title,created_at
+#   GET /api/notices?cursor=<X-Next-Cursor 값>
+
+# 필드별로 읽어야 하는 컬럼 (지정 안 된 필드는 같은 이름의 컬럼)
+API_FIELD_COLUMNS = {
+    'image_url': ['thumbnail_url', 'thumbnail_file_id', 'content'],
+    'file_url': ['pdf_url', 'pdf_file_id'],
+    'attachments': [],
+}
+
+# 필드별 eager 로딩할 관계
+API_FIELD_RELATIONS = {
+    'attachments': ['attachments'],
+    'image_url': ['thumbnail'],
+    'file_url': ['pdf_file'],
+}
+
+
+def _encode_cursor(sort_value, row_id):
+    """마지막 행의 (정렬값, id) → 커서 문자열"""
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, sort_column):
+    """커서 문자열 → (정렬값, id), 잘못된 값이면 None"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if sort_value is not None:
+            parse = datetime.fromisoformat if isinstance(sort_column.type, db.DateTime) else date.fromisoformat
+            sort_value = parse(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def _api_field_value(obj, name):
+    """fields= 로 선택한 필드 값 (to_dict와 같은 형식)"""
+    value = getattr(obj, name)
+    if name == 'attachments':
+        return [f.to_dict() for f in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def api_list_response(model, sort_column, default_limit, allowed_fields):
+    """
+    게시판 목록 API 응답
+    - cursor: (정렬 컬럼 DESC, id DESC) 키셋 페이지네이션 → 아카이브가 커져도 페이지 비용 일정
+      limit/cursor 가 모두 없으면 기존처럼 전체 목록 (기존 클라이언트 호환)
+    - fields: 필요한 컬럼만 읽고 본문 HTML 등은 제외 가능
+    - ETag / Last-Modified: 변경 없으면 304
+    """
+    limit = None
+    if 'limit' in request.args or 'cursor' in request.args:
+        limit = min(max(request.args.get('limit', default_limit, type=int), 1), Config.API_MAX_PAGE_SIZE)
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f for f in allowed_fields if f in request.args['fields'].split(',')]
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+
+    query = model.query
+
+    # 필요한 컬럼/관계만 로딩 (Last-Modified 계산용 시각 컬럼은 항상 포함)
+    timestamp_columns = [c for c in ('updated_at', 'created_at') if hasattr(model, c)]
+    selected = fields or allowed_fields
+    if fields is not None:
+        columns = {'id', sort_column.key, *timestamp_columns}
+        for name in fields:
+            columns.update(API_FIELD_COLUMNS.get(name, [name]))
+        query = query.options(load_only(*[getattr(model, c) for c in columns]))
+    for name in selected:
+        for relation in API_FIELD_RELATIONS.get(name, []):
+            query = query.options(selectinload(getattr(model, relation)))
+
+    # 커서 이후 행만 (DESC 정렬에서 NULL은 마지막)
+    cursor = request.args.get('cursor')
+    if cursor:
+        decoded = _decode_cursor(cursor, sort_column)
+        if decoded is None:
+            return jsonify({'error': '잘못된 cursor 값입니다'}), 400
+        sort_value, row_id = decoded
+        if sort_value is None:
+            query = query.filter(sort_column.is_(None), model.id < row_id)
+        else:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, model.id < row_id),
+                sort_column.is_(None)
+            ))
+
+    query = query.order_by(sort_column.desc(), model.id.desc())
+    if limit is None:
+        rows = query.all()
+        has_next = False
+    else:
+        rows = query.limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+    if fields is None:
+        items = [row.to_dict() for row in rows]
+    else:
+        items = [{name: _api_field_value(row, name) for name in fields} for row in rows]
+
+    response = jsonify(items)
+
+    if has_next:
+        next_cursor = _encode_cursor(getattr(rows[-1], sort_column.key), rows[-1].id)
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        next_url = url_for(request.endpoint, _external=True, **args)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+
+    # 조건부 GET (ETag는 본문 기준, Last-Modified는 페이지 내 최신 수정 시각)
+    modified = [m for m in (
+        next((getattr(row, c) for c in timestamp_columns if getattr(row, c)), None) for row in rows
+    ) if m]
+    if modified:
+        response.last_modified = max(modified)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @app.route('/api/notices')
 def api_notices():
     """공지사항 API"""
-    notices = Notice.query.order_by(Notice.created_at.desc()).all()
-    return jsonify([n.to_dict() for n in notices])
+    return api_list_response(
+        Notice, Notice.created_at, Config.PAGINATION['notice'],
+        ['id', 'title', 'content', 'is_pinned', 'attachments', 'created_at', 'updated_at']
+    )
 
 
 @app.route('/api/activities')
 def api_activities():
     """활동후기 API"""
-    posts = ActivityPost.query.order_by(ActivityPost.created_at.desc()).all()
-    return jsonify([p.to_dict() for p in posts])
+    return api_list_response(
+        ActivityPost, ActivityPost.created_at, Config.PAGINATION['activity'],
+        ['id', 'title', 'content', 'category', 'image_url', 'attachments', 'created_at', 'updated_at']
+    )
 
 
 @app.route('/api/newsletters')
 def api_newsletters():
     """소식지 API"""
-    newsletters = Newsletter.query.order_by(Newsletter.published_at.desc()).all()
-    return jsonify([n.to_dict() for n in newsletters])
+    return api_list_response(
+        Newsletter, Newsletter.published_at, Config.PAGINATION['newsletter'],
+        ['id', 'title', 'issue_number', 'description', 'content_type', 'file_url',
+         'external_url', 'html_content', 'published_at', 'created_at']
+    )
 
 
 @app.route('/api/business-areas')
+@cached_response(api_cache)
 def api_business_areas():
     """사업분야 API"""
     areas = BusinessArea.query.order_by(BusinessArea.display_order).all()
@@ -224,6 +381,7 @@ def api_business_areas():
 
 
 @app.route('/api/history')
+@cached_response(api_cache)
 def api_history():
     """연혁 API"""
     sections = HistorySection.query.order_by(HistorySection.display_order).all()
@@ -233,7 +391,7 @@ def api_history():
 @app.route('/api/upload', methods=['POST'])
 def api_upload():
     """이미지 업로드 API"""
-    from admin.utils import check_storage_available
+    from admin.utils import check_storage_available, compute_sha256, find_duplicate_file
 
     if 'file' not in request.files:
         return jsonify({'error': '파일이 없습니다'}), 400
@@ -248,6 +406,12 @@ def api_upload():
         size = file.tell()
         file.seek(0)
 
+        # 같은 내용의 파일이 있으면 업로드 없이 재사용
+        sha256 = compute_sha256(file.stream)
+        duplicate = find_duplicate_file(sha256)
+        if duplicate:
+            return jsonify({'url': duplicate.url, 'filename': duplicate.filename})
+
         # 전체 저장 공간 확인
         is_available, error_msg = check_storage_available(size)
         if not is_available:
@@ -258,16 +422,16 @@ def api_upload():
         filename = f"{uuid.uuid4().hex}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{ext}"
         filename = secure_filename(filename)
 
-        # R2에 업로드
-        file_data = file.read()
-        upload_to_r2(file_data, filename, file.content_type)
+        # R2에 업로드 (스트림 그대로 전송)
+        upload_to_r2(file.stream, filename, file.content_type)
 
         # File 레코드 생성
         file_record = File(
             filename=filename,
             original_filename=file.filename,
             mimetype=file.content_type,
-            size=size
+            size=size,
+            sha256=sha256
         )
         db.session.add(file_record)
         db.session.commit()
@@ -366,6 +530,7 @@ def api_delete_activity(id):
 
 # 카테고리 API
 @app.route('/api/categories')
+@cached_response(api_cache)
 def api_categories():
     """카테고리 목록 API"""
     categories = ActivityCategory.query.filter_by(is_active=True)\
@@ -426,6 +591,7 @@ def api_delete_category(id):
 
 # 사이트 정보 API
 @app.route('/api/site-info')
+@cached_response(api_cache)
 def api_site_info():
     """사이트 정보 조회 API"""
     site_info = SiteInfo.query.first()
@@ -678,6 +844,7 @@ def api_delete_business_area(id):
 
 # 주요 활동사진 API (CRUD)
 @app.route('/api/activity-photos')
+@cached_response(api_cache)
 def api_activity_photos():
     """주요 활동사진 목록 API"""
     photos = ActivityPhoto.query.order_by(ActivityPhoto.display_order).all()
@@ -779,10 +946,55 @@ def api_delete_activity_photo(id):
 @app.cli.command('init-db')
 def init_db():
     """데이터베이스 초기화"""
+    from models import StorageUsage
     db.create_all()
+    StorageUsage.reconcile()
+    db.session.commit()
     print('Database initialized.')
 
 
+@app.cli.command('upgrade-db')
+def upgrade_db():
+    """기존 데이터베이스에 신규 테이블/컬럼 반영"""
+    from models import upgrade_schema
+    added = upgrade_schema()
+    for column in added:
+        print(f'  + {column}')
+    print(f'Database upgraded. ({len(added)} columns added)')
+
+
+@app.cli.command('rebuild-file-refs')
+def rebuild_file_refs():
+    """파일 역참조(file_references) 전체 재생성"""
+    from models import rebuild_file_references
+    count = rebuild_file_references()
+    db.session.commit()
+    print(f'File references rebuilt: {count}')
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """관리자 전문 검색 인덱스(FTS5) 전체 재생성"""
+    from search_index import rebuild_search_index
+    count = rebuild_search_index()
+    db.session.commit()
+    print(f'Search index rebuilt: {count} documents')
+
+
+@app.cli.command('reconcile-storage')
+def reconcile_storage():
+    """저장 용량 집계값을 files 테이블 실제 합계로 재계산"""
+    from models import StorageUsage
+    before, actual = StorageUsage.reconcile()
+    db.session.commit()
+    if before is None:
+        print(f'Storage usage initialized: {actual} bytes')
+    elif before != actual:
+        print(f'Storage usage corrected: {before} -> {actual} bytes (diff {actual - before:+d})')
+    else:
+        print(f'Storage usage OK: {actual} bytes')
+
+
 @app.cli.command('create-admin')
 def create_admin():
     """슈퍼관리자 계정 생성"""
@@ -0,0 +1,177 @@
+"""
+프로세스 내 캐시 + 워커 간 버전 토큰
+
+gunicorn 워커마다 메모리에 캐시를 두고, 관련 모델 변경이 커밋되면
+버전 파일을 새 토큰으로 교체합니다. 각 워커는 캐시를 읽기 전에
+버전 파일만 확인하므로 DB 조회 없이 다른 워커의 변경도 반영됩니다.
+"""
+import os
+import uuid
+import threading
+import logging
+from functools import wraps
+from flask import request, current_app, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# session.info에 커밋 후 무효화할 캐시 이름을 모아두는 키
+PENDING_KEY = 'app_cache_pending'
+
+# 생성된 캐시 목록 (통계 조회용)
+CACHES = {}
+
+
+def _version_path(name):
+    return os.path.join(Config.CACHE_VERSION_DIR, f'{name}.version')
+
+
+def get_version(name):
+    """캐시 버전 토큰 (파일이 없으면 빈 문자열)"""
+    try:
+        with open(_version_path(name), 'r') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ''
+
+
+def bump_version(name):
+    """캐시 버전 토큰 교체 (모든 워커의 해당 캐시 무효화)"""
+    os.makedirs(Config.CACHE_VERSION_DIR, exist_ok=True)
+    path = _version_path(name)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(uuid.uuid4().hex)
+    os.replace(tmp_path, path)
+
+
+class VersionedCache:
+    """버전 토큰이 바뀌면 통째로 비워지는 프로세스 내 캐시"""
+
+    def __init__(self, name):
+        self.name = name
+        self._data = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        CACHES[name] = self
+
+    def get(self, key, loader, store_if=None):
+        """
+        캐시 값 반환, 없으면 loader() 결과를 저장 후 반환
+        Args:
+            key: 캐시 키 (hashable)
+            loader: 값을 만드는 함수 (인자 없음)
+            store_if: 저장 여부 판단 함수 (기본값: 항상 저장)
+        """
+        version = get_version(self.name)
+        with self._lock:
+            if version != self._version:
+                self._data = {}
+                self._version = version
+            if key in self._data:
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = loader()
+        if store_if is not None and not store_if(value):
+            return value
+
+        with self._lock:
+            # 로딩 중 버전이 바뀌었으면 저장하지 않음
+            if self._version == version:
+                self._data[key] = value
+        return value
+
+    def invalidate(self):
+        """이 캐시를 모든 워커에서 무효화"""
+        bump_version(self.name)
+
+    def stats(self):
+        """히트/미스 통계"""
+        total = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0
+        }
+
+
+def all_stats():
+    """모든 캐시의 히트/미스 통계"""
+    return [cache.stats() for cache in CACHES.values()]
+
+
+def cached_response(cache):
+    """
+    읽기 전용 뷰 응답을 경로 + 쿼리 파라미터 기준으로 캐시하는 데코레이터
+    (200 응답만 저장)
+
+    Usage:
+        @app.route('/api/business-areas')
+        @cached_response(api_cache)
+        def api_business_areas(): ...
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+
+            def load():
+                response = make_response(view(*args, **kwargs))
+                return response.status_code, response.get_data(), response.mimetype
+
+            status, body, mimetype = cache.get(key, load, store_if=lambda value: value[0] == 200)
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+        return wrapper
+    return decorator
+
+
+def _mark_pending(names):
+    def on_model_change(mapper, connection, target):
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault(PENDING_KEY, set()).update(names)
+    return on_model_change
+
+
+def _on_after_commit(session):
+    for name in session.info.pop(PENDING_KEY, ()):
+        try:
+            bump_version(name)
+        except OSError as e:
+            logger.warning(f"캐시 버전 갱신 실패 ({name}): {e}")
+
+
+def _on_after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+_session_listeners_installed = False
+
+
+def invalidate_on_commit(models, *names):
+    """
+    모델 변경(insert/update/delete)이 커밋되면 지정한 캐시 무효화
+    롤백된 변경은 무시
+
+    Usage:
+        invalidate_on_commit([SiteInfo], 'site_info')
+    """
+    global _session_listeners_installed
+
+    listener = _mark_pending(names)
+    for model in models:
+        for event_name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, event_name, listener)
+
+    if not _session_listeners_installed:
+        event.listen(Session, 'after_commit', _on_after_commit)
+        event.listen(Session, 'after_rollback', _on_after_rollback)
+        _session_listeners_installed = True
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+SSG 상세 페이지 렌더링 벤치마크 (공통 조각 캐시 사용/미사용 비교)
+
+현재 DB의 공지/활동후기/소식지 상세 페이지를 임시 폴더에 빌드하면서
+페이지당 템플릿 렌더링 시간(지연 로딩 DB 조회가 끝난 뒤 같은 페이지를 다시 렌더링한 시간)과
+전체 시간을 재고,
+두 방식의 출력 HTML이 같은지 확인한다.
+
+사용법:
+    python bench_render.py              # 기본 3회 반복, 최솟값 비교
+    python bench_render.py --rounds 5
+"""
+import io
+import os
+import sys
+import time
+import filecmp
+import argparse
+import tempfile
+import contextlib
+
+import build
+from config import Config
+from models import Notice, ActivityPost, Newsletter
+
+DETAIL_BUILDERS = [build.build_notice_detail, build.build_activity_detail, build.build_newsletter_detail]
+
+
+def count_pages(app):
+    with app.app_context():
+        return Notice.query.count() + ActivityPost.query.count() + Newsletter.query.count()
+
+
+def run_once(fragment_cache, out_dir):
+    """상세 페이지 전체 빌드 1회 → (렌더링 초, 전체 초, 캐시된 조각 수)"""
+    app = build.create_app(fragment_cache=fragment_cache)
+    app.jinja_env.globals['LOGO_TEXT_COLOR'] = Config.LOGO_TEXT_COLOR
+    Config.DIST_DIR = out_dir
+
+    # build.py 가 쓰는 render_template 을 감싸 렌더링 시간만 합산
+    # (첫 렌더링은 템플릿 안의 관계 지연 로딩 쿼리가 섞이므로 같은 인자로 한 번 더 렌더링해 측정)
+    render_template = build.render_template
+    rendering = 0.0
+
+    def timed_render(*args, **kwargs):
+        nonlocal rendering
+        html = render_template(*args, **kwargs)
+        start = time.perf_counter()
+        render_template(*args, **kwargs)
+        rendering += time.perf_counter() - start
+        return html
+
+    build.render_template = timed_render
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for builder in DETAIL_BUILDERS:
+                builder(app)
+    finally:
+        build.render_template = render_template
+    return rendering, time.perf_counter() - start, len(app.extensions['fragment_cache'])
+
+
+def same_output(left, right):
+    """두 빌드 결과 폴더의 HTML이 모두 같은지"""
+    for root, _, names in os.walk(left):
+        for name in names:
+            path = os.path.join(root, name)
+            other = os.path.join(right, os.path.relpath(path, left))
+            if not os.path.exists(other) or not filecmp.cmp(path, other, shallow=False):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SSG 렌더링 벤치마크')
+    parser.add_argument('--rounds', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    original_dist = Config.DIST_DIR
+    pages = count_pages(build.create_app())
+    if not pages:
+        print("상세 페이지가 없습니다 (DB 확인)")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, enabled in (('캐시 미사용', False), ('캐시 사용', True)):
+            out_dir = os.path.join(tmp, label)
+            runs = [run_once(enabled, out_dir) for _ in range(args.rounds)]
+            rendering = min(run[0] for run in runs)
+            total = min(run[1] for run in runs)
+            results[label] = (rendering, total, runs[-1][2], out_dir)
+        Config.DIST_DIR = original_dist
+
+        print(f"상세 페이지 {pages}개, {args.rounds}회 반복 중 최솟값")
+        for label, (rendering, total, fragments, _) in results.items():
+            print(f"  {label}: 렌더링 페이지당 {rendering / pages * 1000:.3f}ms "
+                  f"(전체 {total:.3f}초, 캐시된 조각 {fragments}개)")
+
+        before, after = results['캐시 미사용'][0], results['캐시 사용'][0]
+        print(f"  → 렌더링 페이지당 {(before - after) / pages * 1000:.3f}ms 단축 ({(1 - after / before) * 100:.0f}%)")
+        identical = same_output(results['캐시 미사용'][3], results['캐시 사용'][3])
+        print(f"  출력 HTML 동일: {'예' if identical else '아니오'}")
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
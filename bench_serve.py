@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+정적 파일 서버 처리량 벤치마크 (ssg_serve.py 캐시 방식 vs 기존 방식)
+
+dist/ 의 페이지(깔끔한 URL 포함), CSS/JS, 검색 인덱스 파일 요청을 WSGI 앱에 직접 반복 호출해
+초당 요청 수와 전송 바이트를 비교한다. 요청 environ 은 미리 만들어 두므로
+소켓/WSGI 서버/테스트 클라이언트 비용은 빼고 앱의 요청 처리 비용만 잰다.
+
+- 첫 요청: Accept-Encoding: gzip, br
+- 재검증: 첫 응답의 ETag 로 If-None-Match (브라우저 새로고침)
+
+사용법:
+    python bench_serve.py                    # dist/ 기준, URL마다 5회
+    python bench_serve.py --rounds 20 --dist /path/to/dist
+"""
+import io
+import os
+import time
+import argparse
+import contextlib
+
+from werkzeug.test import EnvironBuilder
+
+import ssg_serve
+
+ACCEPT = {'Accept-Encoding': 'gzip, br'}
+
+
+def collect_urls(dist_dir):
+    """벤치마크 URL: HTML 페이지(깔끔한 URL 포함) + CSS/JS + 검색 인덱스"""
+    urls = []
+    for dirpath, _, names in os.walk(dist_dir):
+        for name in names:
+            url = '/' + os.path.relpath(os.path.join(dirpath, name), dist_dir).replace(os.sep, '/')
+            if url.startswith('/uploads/') or url.endswith('.gz'):
+                continue
+            if url.endswith('/index.html'):
+                urls.append(url[:-len('index.html')])
+            elif url.endswith('.html'):
+                urls.append(url[:-len('.html')])
+            if url.endswith(('.html', '.css', '.js', '.json')):
+                urls.append(url)
+    return sorted(urls)
+
+
+def request(app, url, headers):
+    """WSGI 앱 직접 호출 → (상태 코드, 헤더, 본문 바이트 수)"""
+    environ = EnvironBuilder(path=url, headers=headers).get_environ()
+    return call(app, environ)
+
+
+def call(app, environ):
+    status = []
+    body = app.wsgi_app(dict(environ), lambda code, headers, exc_info=None: status.append((code, headers)))
+    try:
+        size = sum(len(chunk) for chunk in body)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    code, headers = status[0]
+    return int(code.split()[0]), dict(headers), size
+
+
+def run(app, urls, rounds, revalidate):
+    """URL 목록을 rounds 회 요청 → (초당 요청 수, 응답 본문 바이트 합계)"""
+    with contextlib.redirect_stdout(io.StringIO()):   # 기존 방식의 요청별 print 출력 숨김
+        environs = []
+        for url in urls:
+            headers = dict(ACCEPT)
+            if revalidate:
+                etag = request(app, url, ACCEPT)[1].get('ETag')
+                if etag:
+                    headers['If-None-Match'] = etag
+            environs.append(EnvironBuilder(path=url, headers=headers).get_environ())
+
+        sent = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for environ in environs:
+                sent += call(app, environ)[2]
+        elapsed = time.perf_counter() - start
+    return rounds * len(urls) / elapsed, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description='정적 파일 서버 벤치마크')
+    parser.add_argument('--rounds', type=int, default=5, help='URL별 반복 횟수')
+    parser.add_argument('--dist', default=ssg_serve.DIST_DIR, help='dist 폴더')
+    args = parser.parse_args()
+
+    ssg_serve.DIST_DIR = args.dist
+    ssg_serve.site = ssg_serve.StaticSite(args.dist)
+    urls = collect_urls(args.dist)
+    print(f"URL {len(urls)}개 × {args.rounds}회")
+
+    for label, revalidate in (('첫 요청', False), ('재검증 (If-None-Match)', True)):
+        print(f"\n[{label}]")
+        results = {}
+        for name, legacy in (('기존 방식', True), ('캐시 방식', False)):
+            app = ssg_serve.create_app(legacy=legacy)
+            run(app, urls, 1, revalidate)   # 라우트 테이블/캐시 준비
+            results[name] = run(app, urls, args.rounds, revalidate)
+            rate, sent = results[name]
+            print(f"  {name}: {rate:,.0f} req/s, 전송 {sent / 1024 / 1024:.1f}MB")
+        ratio = results['캐시 방식'][0] / results['기존 방식'][0]
+        print(f"  → 처리량 {ratio:.1f}배")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@ SSG 빌드 스크립트
 사용법:
     python build.py          # 전체 빌드
     python build.py --clean  # dist 폴더 초기화 후 빌드
+    python build.py --changed templates/ssg/notice_detail.html  # 변경 파일에 영향받는 페이지만 빌드
+    python build.py --no-minify  # 페이지 HTML 최소화 생략 (MINIFY_HTML=False 와 같음)
 """
 
 import os
@@ -13,13 +15,20 @@ import sys
 import shutil
 import argparse
 import re
+import glob
+import json
+from contextlib import contextmanager
 from datetime import datetime
 from math import ceil
 from types import SimpleNamespace
 
 # Flask 앱 컨텍스트 사용
 from flask import Flask, render_template
+from jinja2 import FileSystemBytecodeCache, meta, pass_context
+from markupsafe import Markup
 from config import Config
+from html_minify import minify_html
+from template_graph import FRAGMENT_TEMPLATE, build_graph, affected_roots, template_name
 from models import (
     db, SiteInfo, ActivityPhoto, BusinessArea, SponsorshipInfo,
     VolunteerArea, DonationArea, DonationUsage, HistorySection,
@@ -39,8 +48,29 @@ def strip_html_tags(text):
     return clean_text.strip()
 
 
-def create_app():
-    """SSG 빌드용 Flask 앱 생성"""
+# 공통 조각(ssg/partials/<이름>.html) → 출력이 의존하는 컨텍스트 변수
+# 빌드 중 같은 값 조합은 한 번만 렌더링하고 모든 페이지가 재사용한다 (create_app 의 fragment())
+FRAGMENT_KEYS = {
+    '_head': (),
+    '_header': ('current_page', 'LOGO_TEXT_COLOR'),
+    '_footer': ('site',),
+}
+
+
+def _fragment_key_value(value):
+    """조각 캐시 키용 값 (dict 등은 정렬된 JSON 문자열)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return value
+
+
+def create_app(fragment_cache=True):
+    """
+    SSG 빌드용 Flask 앱 생성
+
+    Args:
+        fragment_cache: 공통 조각 캐시 사용 여부 (False 면 페이지마다 렌더링 - 벤치마크 비교용)
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -63,10 +93,44 @@ def create_app():
     app.jinja_env.globals['SEO'] = Config.SEO_DEFAULTS
     app.jinja_env.globals['now'] = datetime.now()
     app.jinja_env.globals['build_time'] = datetime.now().isoformat()
+
+    # 컴파일된 템플릿을 디스크에 캐시 → 빌드 프로세스마다 템플릿을 다시 컴파일하지 않음
+    if Config.TEMPLATE_CACHE_DIR:
+        os.makedirs(Config.TEMPLATE_CACHE_DIR, mode=0o700, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(Config.TEMPLATE_CACHE_DIR)
+
+    # 공통 조각 캐시 (FRAGMENT_KEYS) - 키: (조각 이름, 의존 변수 값...)
+    fragments = {}
+    app.extensions['fragment_cache'] = fragments
+
+    @app.template_global('fragment')
+    @pass_context
+    def render_fragment(context, name):
+        """ssg/partials/<name>.html 렌더링 (같은 키는 캐시된 결과 재사용)"""
+        template = context.environment.get_template(FRAGMENT_TEMPLATE.format(name))
+        if not fragment_cache:
+            return Markup(template.render(context.get_all()))
+
+        key = (name,) + tuple(_fragment_key_value(context.get(var)) for var in FRAGMENT_KEYS[name])
+        html = fragments.get(key)
+        if html is None:
+            _check_fragment_keys(context.environment, template, name)
+            html = fragments[key] = Markup(template.render(context.get_all()))
+        return html
+
     db.init_app(app)
     return app
 
 
+def _check_fragment_keys(env, template, name):
+    """조각이 캐시 키에 없는 변수를 쓰면 페이지마다 달라야 할 출력이 재사용되므로 빌드 중단"""
+    source = env.loader.get_source(env, template.name)[0]
+    used = meta.find_undeclared_variables(env.parse(source))
+    missing = used - set(FRAGMENT_KEYS[name]) - set(env.globals)
+    if missing:
+        raise RuntimeError(f"{template.name}: FRAGMENT_KEYS['{name}'] 에 없는 변수 사용 - {sorted(missing)}")
+
+
 def clean_dist():
     """dist 폴더 초기화 (uploads 폴더는 보존)"""
     if os.path.exists(Config.DIST_DIR):
@@ -89,17 +153,18 @@ def clean_dist():
     print(f"✓ dist 폴더 초기화 완료 (uploads 보존): {Config.DIST_DIR}")
 
 
+# 복사할 static 폴더 목록 (uploads 제외)
+STATIC_FOLDERS = ['css', 'js', 'images']
+
+
 def copy_static_files():
     """정적 파일 복사 (css, js, images)"""
     static_src = os.path.join(Config.BASE_DIR, 'static')
     static_dst = os.path.join(Config.DIST_DIR, 'static')
 
-    # 복사할 폴더 목록 (uploads 제외)
-    folders_to_copy = ['css', 'js', 'images']
-
     os.makedirs(static_dst, exist_ok=True)
 
-    for folder in folders_to_copy:
+    for folder in STATIC_FOLDERS:
         src_path = os.path.join(static_src, folder)
         dst_path = os.path.join(static_dst, folder)
 
@@ -112,8 +177,52 @@ def copy_static_files():
     print(f"✓ 정적 파일 복사 완료")
 
 
+# track_written_pages() 안에서 저장한 페이지 경로 (dist 기준) - dev_server 증분 빌드용
+_written_pages = None
+
+
+@contextmanager
+def track_written_pages():
+    """블록 안에서 save_html 로 저장한 페이지 경로 목록을 모은다"""
+    global _written_pages
+    _written_pages = written = []
+    try:
+        yield written
+    finally:
+        _written_pages = None
+
+
+# 페이지 종류별 HTML 최소화 결과 {종류: [페이지 수, 원본 바이트, 최소화 바이트]} - build_site 에서 출력
+_minify_stats = {}
+
+
+def page_type(path):
+    """dist 기준 페이지 경로 → 종류 ('notice/3.html' → 'notice 상세', 'notice/page/2.html' → 'notice 목록')"""
+    section, _, rest = path.partition('/')
+    if not rest:
+        return section[:-len('.html')] if section.endswith('.html') else section
+    return f"{section} {'상세' if rest.split('/')[0][:-len('.html')].isdigit() else '목록'}"
+
+
+def report_minify():
+    """페이지 종류별 최소화로 줄인 크기 출력"""
+    if not _minify_stats:
+        return
+    before_total = after_total = 0
+    for name, (count, before, after) in sorted(_minify_stats.items()):
+        before_total += before
+        after_total += after
+        print(f"  ✓ HTML 최소화 {name} {count}개: {before / 1024:.1f}KB → {after / 1024:.1f}KB "
+              f"(페이지당 {(before - after) / count / 1024:.1f}KB, -{(1 - after / before) * 100:.0f}%)")
+    print(f"  ✓ HTML 최소화 합계: {(before_total - after_total) / 1024:.1f}KB 절약 "
+          f"(-{(1 - after_total / before_total) * 100:.0f}%)")
+    _minify_stats.clear()
+
+
 def save_html(path, content):
-    """HTML 파일 저장 (업로드 경로를 R2 URL로 변환)"""
+    """HTML 파일 저장 (업로드 경로를 R2 URL로 변환, Config.MINIFY_HTML 이면 최소화)"""
+    if _written_pages is not None:
+        _written_pages.append(path)
     full_path = os.path.join(Config.DIST_DIR, path)
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
@@ -123,6 +232,14 @@ def save_html(path, content):
         content = content.replace('/static/uploads/', f'{r2_url}/')
         content = content.replace('/uploads/', f'{r2_url}/')
 
+    if Config.MINIFY_HTML:
+        before = len(content.encode('utf-8'))
+        content = minify_html(content)
+        stats = _minify_stats.setdefault(page_type(path), [0, 0, 0])
+        stats[0] += 1
+        stats[1] += before
+        stats[2] += len(content.encode('utf-8'))
+
     with open(full_path, 'w', encoding='utf-8') as f:
         f.write(content)
 
@@ -135,6 +252,21 @@ def get_site_context():
     }
 
 
+def list_page_url(section_url, page):
+    """목록 페이지 URL ('/notice/', 1 → '/notice/', '/notice/', 2 → '/notice/page/2.html')"""
+    return section_url if page == 1 else f'{section_url}page/{page}.html'
+
+
+def next_page_prefetch(section_url, pagination):
+    """목록 페이지에서 미리 받을 페이지 (다음 쪽) - base.html 이 main.js 에 넘김"""
+    return [list_page_url(section_url, pagination.next_num)] if pagination.next_num else []
+
+
+def neighbor_prefetch(url_format, older, newer):
+    """상세 페이지에서 미리 받을 페이지 (이전 글 → 다음 글 순, 느린 연결에서는 첫 번째만)"""
+    return [url_format.format(id=item.id) for item in (older, newer) if item]
+
+
 def normalize_seo(seo):
     """
     SEO 설정 정규화 - og_image를 절대 URL로 변환
@@ -279,6 +411,7 @@ def build_notice_list(app):
             html = render_template('ssg/notice.html',
                 **ctx,
                 pagination=pagination,
+                prefetch=next_page_prefetch('/notice/', pagination),
                 seo=seo,
                 current_page='notice_list'
             )
@@ -313,6 +446,7 @@ def build_notice_detail(app):
                 notice=notice,
                 prev_notice=prev_notice,
                 next_notice=next_notice,
+                prefetch=neighbor_prefetch('/notice/{id}.html', prev_notice, next_notice),
                 seo=seo,
                 current_page='notice_detail'
             )
@@ -355,6 +489,7 @@ def build_activity_list(app):
             html = render_template('ssg/activity.html',
                 **ctx,
                 pagination=pagination,
+                prefetch=next_page_prefetch('/activity/', pagination),
                 categories=categories,
                 current_category=None,
                 seo=seo,
@@ -389,16 +524,17 @@ def build_activity_list(app):
                     next_num=page + 1 if page < cat_pages else None,
                 )
 
+                cat_slug = cat.name.replace(' ', '-')
                 html = render_template('ssg/activity.html',
                     **ctx,
                     pagination=pagination,
+                    prefetch=next_page_prefetch(f'/activity/category/{cat_slug}/', pagination),
                     categories=categories,
                     current_category=cat.name,
                     seo=seo,
                     current_page='activity_list'
                 )
 
-                cat_slug = cat.name.replace(' ', '-')
                 if page == 1:
                     save_html(f'activity/category/{cat_slug}/index.html', html)
                 else:
@@ -414,7 +550,10 @@ def build_activity_detail(app):
 
         activities = ActivityPost.query.order_by(ActivityPost.created_at.desc()).all()
 
-        for post in activities:
+        for i, post in enumerate(activities):
+            prev_post = activities[i + 1] if i + 1 < len(activities) else None
+            next_post = activities[i - 1] if i > 0 else None
+
             category_obj = None
             if post.category:
                 category_obj = ActivityCategory.query.filter_by(name=post.category).first()
@@ -438,6 +577,7 @@ def build_activity_detail(app):
                 post=post,
                 related_posts=related_posts,
                 category_obj=category_obj,
+                prefetch=neighbor_prefetch('/activity/{id}.html', prev_post, next_post),
                 seo=seo,
                 current_page='activity_detail'
             )
@@ -476,6 +616,7 @@ def build_newsletter_list(app):
             html = render_template('ssg/newsletter.html',
                 **ctx,
                 pagination=pagination,
+                prefetch=next_page_prefetch('/newsletter/', pagination),
                 seo=seo,
                 current_page='newsletter_list'
             )
@@ -510,6 +651,7 @@ def build_newsletter_detail(app):
                 newsletter=newsletter,
                 prev_newsletter=prev_newsletter,
                 next_newsletter=next_newsletter,
+                prefetch=neighbor_prefetch('/newsletter/{id}.html', prev_newsletter, next_newsletter),
                 seo=seo,
                 current_page='newsletter_detail'
             )
@@ -568,84 +710,159 @@ def build_donation_complete(app):
         print("  ✓ donation-complete.html")
 
 
-def build_sitemap(app):
-    """사이트맵 생성 (sitemap.xml)"""
-    with app.app_context():
-        from datetime import datetime
-
-        urls = []
-        base_url = Config.STATIC_DOMAIN
-        today = datetime.now().strftime('%Y-%m-%d')
-
-        # 정적 페이지
-        static_pages = [
-            ('', '1.0', 'daily'),  # 메인
-            ('/intro.html', '0.9', 'weekly'),  # 소개
-            ('/notice/', '0.8', 'daily'),  # 공지사항
-            ('/activity/', '0.8', 'daily'),  # 활동후기
-            ('/newsletter/', '0.8', 'weekly'),  # 소식지
-            ('/donation.html', '0.9', 'monthly'),  # 후원
-        ]
-
-        for path, priority, changefreq in static_pages:
-            urls.append({
-                'loc': base_url + path,
-                'lastmod': today,
-                'changefreq': changefreq,
-                'priority': priority
-            })
+# 섹션별 사이트맵: (이름, 모델, lastmod 후보 컬럼(앞에서부터 값이 있는 것), URL 형식, changefreq, priority)
+SITEMAP_SECTIONS = [
+    ('notices', Notice, (Notice.updated_at, Notice.created_at), '/notice/{id}.html', 'monthly', '0.6'),
+    ('activities', ActivityPost, (ActivityPost.updated_at, ActivityPost.created_at), '/activity/{id}.html', 'monthly', '0.7'),
+    ('newsletters', Newsletter, (Newsletter.published_at, Newsletter.created_at), '/newsletter/{id}.html', 'yearly', '0.6'),
+]
 
-        # 공지사항
-        notices = Notice.query.order_by(Notice.created_at.desc()).all()
-        for notice in notices:
-            urls.append({
-                'loc': f"{base_url}/notice/{notice.id}.html",
-                'lastmod': notice.updated_at.strftime('%Y-%m-%d') if notice.updated_at else notice.created_at.strftime('%Y-%m-%d'),
-                'changefreq': 'monthly',
-                'priority': '0.6'
-            })
+# 섹션 파일 첫 줄 뒤에 기록하는 지문 (바뀌지 않은 섹션은 다시 만들지 않음)
+SITEMAP_FINGERPRINT = re.compile(r'<!-- fingerprint: (\S+) lastmod: (\S*) -->')
 
-        # 활동후기
-        activities = ActivityPost.query.order_by(ActivityPost.created_at.desc()).all()
-        for post in activities:
-            urls.append({
-                'loc': f"{base_url}/activity/{post.id}.html",
-                'lastmod': post.updated_at.strftime('%Y-%m-%d') if post.updated_at else post.created_at.strftime('%Y-%m-%d'),
-                'changefreq': 'monthly',
-                'priority': '0.7'
-            })
 
-        # 소식지
-        newsletters = Newsletter.query.order_by(Newsletter.published_at.desc()).all()
-        for newsletter in newsletters:
-            urls.append({
-                'loc': f"{base_url}/newsletter/{newsletter.id}.html",
-                'lastmod': newsletter.published_at.strftime('%Y-%m-%d'),
-                'changefreq': 'yearly',
-                'priority': '0.6'
-            })
+def _format_lastmod(*values):
+    """값이 있는 날짜 중 가장 늦은 날짜 (YYYY-MM-DD), 없으면 빈 문자열"""
+    values = [v for v in values if v]
+    if not values:
+        return ''
+    return max(v.strftime('%Y-%m-%d') for v in values)
+
+
+def _sitemap_config_key(*values):
+    """사이트 주소/URL 형식/changefreq/priority 설정 지문 - 설정이 바뀌면 DB 가 그대로여도 다시 생성"""
+    import hashlib
+    return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()[:10]
+
 
-        # XML 생성
-        xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
-        xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+def _read_sitemap_fingerprint(path):
+    """기존 섹션 사이트맵의 (지문, lastmod), 없으면 (None, None)"""
+    import gzip
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            match = SITEMAP_FINGERPRINT.search(f.read(512))
+    except (OSError, EOFError):
+        return None, None
+    return match.groups() if match else (None, None)
 
-        for url in urls:
-            xml_lines.append('  <url>')
-            xml_lines.append(f'    <loc>{url["loc"]}</loc>')
+
+def _write_sitemap_section(name, fingerprint, collect_urls):
+    """
+    섹션 사이트맵(sitemap-<name>.xml.gz) 생성 - 지문이 같으면 건너뜀
+
+    Args:
+        fingerprint: 섹션 내용 지문 (공백 없는 문자열)
+        collect_urls: 지문이 바뀌었을 때만 호출, [{'loc', 'lastmod', 'changefreq', 'priority'}] 반환
+
+    Returns:
+        (파일명, 섹션 lastmod, 새로 만들었는지 여부)
+    """
+    import gzip
+    filename = f'sitemap-{name}.xml.gz'
+    path = os.path.join(Config.DIST_DIR, filename)
+
+    old_fingerprint, old_lastmod = _read_sitemap_fingerprint(path)
+    if old_fingerprint == fingerprint:
+        return filename, old_lastmod, False
+
+    urls = collect_urls()
+    lastmod = max((url['lastmod'] for url in urls), default='')
+
+    xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
+    xml_lines.append(f'<!-- fingerprint: {fingerprint} lastmod: {lastmod} -->')
+    xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    for url in urls:
+        xml_lines.append('  <url>')
+        xml_lines.append(f'    <loc>{url["loc"]}</loc>')
+        if url['lastmod']:
             xml_lines.append(f'    <lastmod>{url["lastmod"]}</lastmod>')
-            xml_lines.append(f'    <changefreq>{url["changefreq"]}</changefreq>')
-            xml_lines.append(f'    <priority>{url["priority"]}</priority>')
-            xml_lines.append('  </url>')
+        xml_lines.append(f'    <changefreq>{url["changefreq"]}</changefreq>')
+        xml_lines.append(f'    <priority>{url["priority"]}</priority>')
+        xml_lines.append('  </url>')
+    xml_lines.append('</urlset>')
 
-        xml_lines.append('</urlset>')
+    # mtime=0: 내용이 같으면 압축 결과도 같음 (배포 시 변경 없음)
+    with open(path, 'wb') as f:
+        f.write(gzip.compress('\n'.join(xml_lines).encode('utf-8'), compresslevel=9, mtime=0))
+    return filename, lastmod, True
 
-        sitemap_content = '\n'.join(xml_lines)
-        sitemap_path = os.path.join(Config.DIST_DIR, 'sitemap.xml')
 
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write(sitemap_content)
+def build_sitemap(app):
+    """
+    사이트맵 인덱스(sitemap.xml) + 섹션별 사이트맵(sitemap-*.xml.gz) 생성
 
-        print(f"  ✓ sitemap.xml ({len(urls)}개 URL)")
+    - lastmod는 빌드 날짜가 아닌 실제 콘텐츠 수정일 (목록/정적 페이지는 해당 콘텐츠의 최신 수정일)
+    - 섹션마다 집계 쿼리 한 번으로 지문을 만들고, 바뀐 섹션만 URL을 조회해 다시 생성
+      (지문에는 사이트 주소와 섹션 설정도 포함 - 도메인/설정 변경 시 모든 섹션 다시 생성)
+    """
+    from sqlalchemy import func
+
+    base_url = Config.STATIC_DOMAIN
+    entries = []
+    section_lastmods = {}
+
+    with app.app_context():
+        for name, model, lastmod_columns, url_format, changefreq, priority in SITEMAP_SECTIONS:
+            # 행 추가/삭제/수정 시 바뀌는 값들 (본문 등 큰 컬럼은 읽지 않음)
+            stats = db.session.query(
+                func.count(model.id), func.sum(model.id),
+                *[func.max(column) for column in lastmod_columns],
+                *[func.min(column) for column in lastmod_columns],
+            ).one()
+            fingerprint = '|'.join(
+                [_sitemap_config_key(base_url, url_format, changefreq, priority)] +
+                [str(value).replace(' ', 'T') for value in stats])
+
+            def collect_urls(model=model, lastmod_columns=lastmod_columns,
+                             url_format=url_format, changefreq=changefreq, priority=priority):
+                rows = db.session.query(model.id, *lastmod_columns).order_by(model.id.desc())
+                return [{
+                    'loc': base_url + url_format.format(id=row[0]),
+                    'lastmod': next((v.strftime('%Y-%m-%d') for v in row[1:] if v), ''),
+                    'changefreq': changefreq,
+                    'priority': priority,
+                } for row in rows]
+
+            entries.append(_write_sitemap_section(name, fingerprint, collect_urls))
+            section_lastmods[name] = entries[-1][1]
+
+        # 정적/목록 페이지: 페이지에 보이는 콘텐츠의 최신 수정일
+        site_updated = db.session.query(func.max(SiteInfo.updated_at)).scalar()
+        sponsorship_updated = db.session.query(func.max(SponsorshipInfo.updated_at)).scalar()
+
+    content_lastmod = max(section_lastmods.values(), default='')
+    site_lastmod = _format_lastmod(site_updated)
+    static_pages = [
+        ('', max(content_lastmod, site_lastmod), 'daily', '1.0'),  # 메인
+        ('/intro.html', site_lastmod, 'weekly', '0.9'),  # 소개
+        ('/notice/', section_lastmods['notices'], 'daily', '0.8'),  # 공지사항
+        ('/activity/', section_lastmods['activities'], 'daily', '0.8'),  # 활동후기
+        ('/newsletter/', section_lastmods['newsletters'], 'weekly', '0.8'),  # 소식지
+        ('/donation.html', _format_lastmod(site_updated, sponsorship_updated), 'monthly', '0.9'),  # 후원
+    ]
+    pages_fingerprint = '|'.join(
+        [_sitemap_config_key(base_url, [(path, changefreq, priority) for path, _, changefreq, priority in static_pages])] +
+        [lastmod or '-' for _, lastmod, _, _ in static_pages])
+    entries.insert(0, _write_sitemap_section('pages', pages_fingerprint, lambda: [{
+        'loc': base_url + path, 'lastmod': lastmod, 'changefreq': changefreq, 'priority': priority,
+    } for path, lastmod, changefreq, priority in static_pages]))
+
+    # 사이트맵 인덱스 (작아서 매번 생성)
+    xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
+    xml_lines.append('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    for filename, lastmod, _ in entries:
+        xml_lines.append('  <sitemap>')
+        xml_lines.append(f'    <loc>{base_url}/{filename}</loc>')
+        if lastmod:
+            xml_lines.append(f'    <lastmod>{lastmod}</lastmod>')
+        xml_lines.append('  </sitemap>')
+    xml_lines.append('</sitemapindex>')
+
+    with open(os.path.join(Config.DIST_DIR, 'sitemap.xml'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(xml_lines))
+
+    updated = [filename for filename, _, changed in entries if changed]
+    print(f"  ✓ sitemap.xml (섹션 {len(entries)}개, 갱신: {', '.join(updated) if updated else '없음'})")
 
 
 def build_robots_txt():
@@ -663,67 +880,223 @@ Sitemap: {Config.STATIC_DOMAIN}/sitemap.xml
     print("  ✓ robots.txt")
 
 
+# _headers 고정 규칙 (경로, 헤더 줄) - 페이지가 아닌 응답에서는 /* 규칙의 Link 헤더를 뗀다
+CF_HEADER_RULES = [
+    ('/static/*', ['Cache-Control: public, max-age=31536000, immutable', '! Link']),
+    ('/*.html', ['Cache-Control: public, max-age=3600, must-revalidate']),
+    ('/sitemap.xml', ['Cache-Control: public, max-age=3600', '! Link']),
+    ('/sitemap-*', ['Cache-Control: public, max-age=3600', '! Link']),
+    ('/robots.txt', ['Cache-Control: public, max-age=86400', '! Link']),
+    ('/search/manifest.json', ['Cache-Control: public, max-age=300', '! Link']),
+    ('/search/shards/*', ['Cache-Control: public, max-age=31536000, immutable', '! Link']),
+    ('/sw.js', ['Cache-Control: no-cache', '! Link']),
+]
+
+
 def build_cf_headers():
-    """Cloudflare Pages _headers 파일 생성"""
-    headers_content = """/static/*
-  Cache-Control: public, max-age=31536000, immutable
+    """
+    Cloudflare Pages _headers 파일 생성
 
-/*.html
-  Cache-Control: public, max-age=3600, must-revalidate
+    고정 캐시 규칙 + 페이지별 리소스 힌트 Link 규칙 (Early Hints, resource_hints.py)
+    - 모든 페이지 공통 힌트(스타일시트, 웹폰트)는 /* 규칙, 페이지 전용 힌트(히어로/첫 카드 이미지)는 경로 규칙
+    """
+    from resource_hints import header_rules
+    common, pages, dropped = header_rules(Config.DIST_DIR, reserved_rules=len(CF_HEADER_RULES))
 
-/sitemap.xml
-  Cache-Control: public, max-age=3600
+    rules = []
+    if common:
+        rules.append(('/*', [f'Link: {hint}' for hint in common]))
+    rules.extend(CF_HEADER_RULES)
+    rules.extend((url, [f'Link: {hint}' for hint in hints]) for url, hints in pages)
 
-/robots.txt
-  Cache-Control: public, max-age=86400
-"""
+    headers_content = '\n'.join(
+        path + '\n' + ''.join(f'  {line}\n' for line in lines) for path, lines in rules)
     headers_path = os.path.join(Config.DIST_DIR, '_headers')
     with open(headers_path, 'w', encoding='utf-8') as f:
         f.write(headers_content)
-    print("  ✓ _headers (Cloudflare Pages)")
+    print(f"  ✓ _headers (Cloudflare Pages, 규칙 {len(rules)}개 - 공통 힌트 {len(common)}개, "
+          f"페이지 힌트 {len(pages)}개)")
+    if dropped:
+        print(f"  ⚠ 규칙 수 한도로 페이지 힌트 {dropped}개 생략")
+
+
+def write_build_manifest(incremental=False):
+    """
+    빌드 완료 표시 파일 (빌드 시각/버전) - 정적 서버가 바뀐 dist/ 를 다시 읽는 기준
+
+    같은 버전으로 서비스 워커(sw.js)를 먼저 다시 만든다 (service_worker.py 참고).
+    배포마다 sw.js 가 바뀌어 브라우저가 새 미리 받기 목록을 설치한다.
+    """
+    from service_worker import build_service_worker
+    now = datetime.now()
+    manifest = {'build_time': now.isoformat(), 'version': now.strftime('%Y%m%d%H%M%S'),
+                'incremental': incremental}
+    stats = build_service_worker(Config.DIST_DIR, manifest['version'])
+    print(f"  ✓ {stats['file']} (버전 {manifest['version']}, 미리 받기 {stats['precache']}개)")
+    with open(os.path.join(Config.DIST_DIR, Config.BUILD_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def build_utility_css():
+    """렌더링된 페이지에서 쓰는 유틸리티 클래스만 모아 CSS 생성 (utility_css.py 참고)"""
+    from utility_css import build_stylesheet, STYLESHEET_PATTERN
+    stats = build_stylesheet(Config.DIST_DIR)
+    print(f"  ✓ {stats['url']} (클래스 {stats['classes']}개, {stats['bytes'] / 1024:.1f}KB)")
+    return {STYLESHEET_PATTERN: stats['url']}
+
+
+def build_fonts():
+    """사이트에서 쓰는 글자로 웹폰트 서브셋 생성 (webfonts.py 참고)"""
+    from webfonts import build_webfonts, FONT_SOURCE_DIR, WEBFONT_BLOCK, WEBFONT_PATTERN
+    stats = build_webfonts(Config.DIST_DIR, os.path.join(Config.BASE_DIR, FONT_SOURCE_DIR))
+    if not stats['fonttools']:
+        print("  ⚠ fontTools/brotli 미설치 - CDN 폰트 사용")
+    elif stats['fallback']:
+        print(f"  ⚠ {FONT_SOURCE_DIR}/ 에 원본 없음 - CDN 폰트 사용: {', '.join(stats['fallback'])}")
+    if stats['faces']:
+        print(f"  ✓ static/fonts/ (폰트 {stats['faces']}개, 조각 {stats['slices']}개 "
+              f"- 새로 생성 {stats['created']}개, 기본 조각 {stats['bytes'] / 1024:.1f}KB "
+              f"/ 전체 {stats['total_bytes'] / 1024:.1f}KB)")
+    return {WEBFONT_PATTERN: WEBFONT_BLOCK.format(stats['markup'])}
+
+
+def replace_placeholders(replacements):
+    """
+    렌더링된 HTML의 자리 표시(스타일시트 경로, 웹폰트 태그)를 생성된 파일로 한 번에 교체
+
+    패턴은 이전 빌드에서 연결한 값도 찾으므로, 증분 빌드에서 다시 그리지 않은 페이지도 새 파일로 연결된다.
+
+    Args:
+        replacements: {정규식: 바꿀 문자열}
+    """
+    pages = 0
+    for path in glob.glob(os.path.join(Config.DIST_DIR, '**', '*.html'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        replaced = html
+        for pattern, value in replacements.items():
+            replaced = pattern.sub(lambda match: value, replaced)
+        if replaced == html:
+            continue
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(replaced)
+        pages += 1
+    print(f"  ✓ 페이지 {pages}개 연결")
 
 
 def build_search_index(app):
-    """검색 인덱스 JSON 생성"""
-    import json
+    """검색 인덱스 생성 (manifest + 접두어 샤드, site_search.py 참고)"""
+    from site_search import collect_documents, write_search_index
     with app.app_context():
-        items = []
-
-        for n in Notice.query.order_by(Notice.created_at.desc()).all():
-            items.append({
-                't': n.title,
-                'u': f'/notice/{n.id}.html',
-                'd': n.created_at.strftime('%Y.%m.%d') if n.created_at else '',
-                'c': '공지',
-            })
+        docs = collect_documents()
+
+    stats = write_search_index(Config.DIST_DIR, docs)
+    print(f"  ✓ search/ ({stats['docs']}건, 문서 청크 {stats['chunks']}개, "
+          f"용어 샤드 {stats['shards']}개, {stats['bytes'] / 1024:.1f}KB)")
+
+
+# 페이지 템플릿 → 빌드 함수 (전체 빌드 순서)
+# 증분 빌드는 template_graph 로 변경된 템플릿을 (extends/include/fragment 로) 쓰는 페이지만 다시 빌드한다
+PAGE_BUILDERS = {
+    'ssg/index.html': [build_index],
+    'ssg/intro.html': [build_intro],
+    'ssg/notice.html': [build_notice_list],
+    'ssg/notice_detail.html': [build_notice_detail],
+    'ssg/activity.html': [build_activity_list],
+    'ssg/activity_detail.html': [build_activity_detail],
+    'ssg/newsletter.html': [build_newsletter_list],
+    'ssg/newsletter_detail.html': [build_newsletter_detail],
+    'ssg/donation.html': [build_donation],
+    'donation_complete.html': [build_donation_complete],
+}
+
+
+def plan_incremental(app, changed_paths):
+    """
+    변경 파일 → 다시 빌드할 페이지 템플릿과 정적 파일 복사 여부
 
-        for p in ActivityPost.query.order_by(ActivityPost.created_at.desc()).all():
-            items.append({
-                't': p.title,
-                'u': f'/activity/{p.id}.html',
-                'd': p.created_at.strftime('%Y.%m.%d') if p.created_at else '',
-                'c': p.category or '활동',
-            })
+    Returns:
+        tuple: (페이지 템플릿 이름 목록, static/ 변경 여부)
+    """
+    static_root = os.path.join(Config.BASE_DIR, 'static') + os.sep
+    changed_templates = set()
+    static_changed = False
+    for path in changed_paths:
+        name = template_name(path, Config.BASE_DIR)
+        if name:
+            changed_templates.add(name)
+        elif os.path.abspath(path).startswith(static_root):
+            static_changed = True
+
+    graph = build_graph(app.jinja_env, PAGE_BUILDERS)
+    return affected_roots(graph, PAGE_BUILDERS, changed_templates), static_changed
+
+
+def apply_logo_color(app):
+    """DB에서 로고 텍스트 색상 읽어 템플릿 전역 변수로 설정"""
+    with app.app_context():
+        site_info = SiteInfo.query.first()
+        logo_color = (site_info.logo_text_color if site_info and site_info.logo_text_color
+                      else Config.LOGO_TEXT_COLOR)
+        app.jinja_env.globals['LOGO_TEXT_COLOR'] = logo_color
 
-        for nl in Newsletter.query.order_by(Newsletter.published_at.desc()).all():
-            items.append({
-                't': nl.title,
-                'u': f'/newsletter/{nl.id}.html',
-                'd': nl.published_at.strftime('%Y.%m.%d') if nl.published_at else '',
-                'c': '소식지',
-            })
 
-        index_path = os.path.join(Config.DIST_DIR, 'search-index.json')
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(items, f, ensure_ascii=False)
+def build_site(app, pages=None, static_changed=True, incremental=False):
+    """
+    빌드 단계 [1/4]~[4/4] 실행
 
-        print(f"  ✓ search-index.json ({len(items)}건)")
+    Args:
+        pages: 다시 빌드할 페이지 템플릿 (None 이면 PAGE_BUILDERS 전체)
+        static_changed: static/ 복사 여부
+        incremental: 증분 빌드 여부 (DB 기준 SEO 파일 생략)
+
+    Returns:
+        dict: 페이지에 적용한 자리 표시 교체 {정규식: 값} (dev_server 가 새로 그린 페이지에 재사용)
+    """
+    # 정적 파일 복사
+    print("\n[1/4] 정적 파일 복사")
+    if static_changed:
+        copy_static_files()
+    else:
+        print("  - 변경 없음 (생략)")
+
+    # 페이지 빌드
+    print("\n[2/4] 페이지 빌드")
+    for page in (list(PAGE_BUILDERS) if pages is None else pages):
+        for builder in PAGE_BUILDERS[page]:
+            builder(app)
+    report_minify()
+
+    # 유틸리티 CSS + 웹폰트 서브셋 생성 (페이지 렌더링 후 사용 클래스/글자 기준)
+    print("\n[3/4] 스타일시트 및 웹폰트 생성")
+    replacements = build_utility_css()
+    replacements.update(build_fonts())
+    replace_placeholders(replacements)
+
+    # SEO 파일 생성 (DB 내용 기준이므로 템플릿/정적 파일 증분 빌드에서는 생략)
+    print("\n[4/4] SEO 및 배포 파일 생성")
+    if incremental:
+        print("  - 증분 빌드 (검색 색인/사이트맵 생략)")
+    else:
+        build_search_index(app)
+        build_sitemap(app)
+        build_robots_txt()
+    # 스타일시트/웹폰트 파일명이 바뀌었을 수 있으므로 증분 빌드에서도 다시 생성
+    build_cf_headers()
+    write_build_manifest(incremental)
+
+    return replacements
 
 
 def main():
     parser = argparse.ArgumentParser(description='SSG 빌드 스크립트')
     parser.add_argument('--clean', action='store_true', help='dist 폴더 초기화 후 빌드')
+    parser.add_argument('--changed', nargs='+', metavar='PATH',
+                        help='변경된 파일 (templates/, static/) - 영향받는 페이지만 다시 빌드')
+    parser.add_argument('--no-minify', action='store_true', help='페이지 HTML 최소화 생략')
     args = parser.parse_args()
+    if args.no_minify:
+        Config.MINIFY_HTML = False
 
     print("=" * 50)
     print("SSG 빌드 시작")
@@ -731,43 +1104,23 @@ def main():
 
     start_time = datetime.now()
 
+    # 증분 빌드는 이전 빌드 결과가 있을 때만 (없거나 --clean 이면 전체 빌드)
+    incremental = bool(args.changed) and not args.clean and os.path.exists(Config.DIST_DIR)
+
     # dist 폴더 초기화
     if args.clean or not os.path.exists(Config.DIST_DIR):
         clean_dist()
 
     # Flask 앱 생성
     app = create_app()
+    apply_logo_color(app)
 
-    # DB에서 로고 텍스트 색상 읽기
-    with app.app_context():
-        site_info = SiteInfo.query.first()
-        logo_color = (site_info.logo_text_color if site_info and site_info.logo_text_color
-                      else Config.LOGO_TEXT_COLOR)
-        app.jinja_env.globals['LOGO_TEXT_COLOR'] = logo_color
-
-    # 정적 파일 복사
-    print("\n[1/3] 정적 파일 복사")
-    copy_static_files()
+    pages, static_changed = None, True
+    if incremental:
+        pages, static_changed = plan_incremental(app, args.changed)
+        print(f"증분 빌드: 페이지 템플릿 {len(pages)}개 ({', '.join(pages) or '없음'})")
 
-    # 페이지 빌드
-    print("\n[2/3] 페이지 빌드")
-    build_index(app)
-    build_intro(app)
-    build_notice_list(app)
-    build_notice_detail(app)
-    build_activity_list(app)
-    build_activity_detail(app)
-    build_newsletter_list(app)
-    build_newsletter_detail(app)
-    build_donation(app)
-    build_donation_complete(app)
-
-    # SEO 파일 생성
-    print("\n[3/3] SEO 및 배포 파일 생성")
-    build_search_index(app)
-    build_sitemap(app)
-    build_robots_txt()
-    build_cf_headers()
+    build_site(app, pages, static_changed, incremental)
 
     # 완료
     elapsed = datetime.now() - start_time
@@ -109,6 +109,12 @@ def on_after_commit(session):
     build_manager.execute_if_pending(session)
 
 
+def get_trigger_model_classes():
+    """빌드 트리거 대상 모델 클래스 매핑 {모델명: 클래스}"""
+    import models
+    return {name: getattr(models, name) for name in BUILD_TRIGGER_MODELS}
+
+
 def setup_build_triggers(app):
     """
     빌드 트리거 이벤트 리스너 설정
@@ -120,33 +126,8 @@ def setup_build_triggers(app):
         from build_triggers import setup_build_triggers
         setup_build_triggers(app)
     """
-    # 모델 클래스 import
-    from models import (
-        Notice, ActivityPost, Newsletter, SiteInfo,
-        BusinessArea, VolunteerArea, DonationArea, DonationUsage,
-        HistorySection, HistoryItem, ActivityPhoto, ActivityCategory,
-        BusStop, BusRoute, OperatingHours, OfficeInfo
-    )
-
     # 모델 클래스 매핑
-    model_classes = {
-        'Notice': Notice,
-        'ActivityPost': ActivityPost,
-        'Newsletter': Newsletter,
-        'SiteInfo': SiteInfo,
-        'BusinessArea': BusinessArea,
-        'VolunteerArea': VolunteerArea,
-        'DonationArea': DonationArea,
-        'DonationUsage': DonationUsage,
-        'HistorySection': HistorySection,
-        'HistoryItem': HistoryItem,
-        'ActivityPhoto': ActivityPhoto,
-        'ActivityCategory': ActivityCategory,
-        'BusStop': BusStop,
-        'BusRoute': BusRoute,
-        'OperatingHours': OperatingHours,
-        'OfficeInfo': OfficeInfo,
-    }
+    model_classes = get_trigger_model_classes()
 
     # 모든 모델에 대해 이벤트 리스너 등록
     for model_name, model_class in model_classes.items():
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
@@ -46,6 +47,14 @@ class Config:
     R2_SECRET_ACCESS_KEY = os.environ.get('R2_SECRET_ACCESS_KEY', '')
     R2_BUCKET_NAME = os.environ.get('R2_BUCKET_NAME', 'withmigrant-uploads')
     R2_PUBLIC_URL = os.environ.get('R2_PUBLIC_URL', 'https://uploads.withmigrant.or.kr')
+    R2_PRESIGNED_EXPIRES = 300  # 브라우저 직접 업로드용 presigned URL 유효시간 (초)
+
+    # ============================================
+    # 프로세스 내 캐시 설정
+    # ============================================
+    # gunicorn 워커끼리 캐시 무효화를 알리는 버전 파일 위치 (같은 호스트 내 공유)
+    CACHE_VERSION_DIR = os.environ.get('CACHE_VERSION_DIR') or \
+        os.path.join(tempfile.gettempdir(), 'withmigrant-cache')
 
     # ============================================
     # 이메일 설정
@@ -63,6 +72,13 @@ class Config:
     # ============================================
     BASE_DIR = basedir
     DIST_DIR = os.path.join(basedir, 'dist')
+    # 빌드가 끝날 때마다 다시 쓰는 파일 (ssg_serve.py 가 수정 시각으로 라우트 테이블 갱신)
+    BUILD_MANIFEST = 'build-manifest.json'
+    # 저장 전 페이지 HTML 최소화 (공백/주석/인라인 스타일·스크립트 - html_minify.py)
+    MINIFY_HTML = os.environ.get('MINIFY_HTML', 'True') == 'True'
+    # 컴파일된 Jinja 템플릿(바이트코드) 캐시 - 빌드 프로세스끼리 공유, 원본이 바뀌면 자동 무효화
+    # 지정하지 않으면 Jinja 기본값 (사용자별 0700 임시 폴더, 소유자 확인 - 다른 사용자가 심은 바이트코드 방지)
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR') or None
 
     # SEO 기본 설정
     SEO_DEFAULTS = {
@@ -107,6 +123,7 @@ class Config:
         'activity': 12,
         'newsletter': 12,
     }
+    API_MAX_PAGE_SIZE = 100  # /api 목록 limit 상한 (기본값은 PAGINATION)
 
     # 빌드 제외 파일 패턴
     EXCLUDE_PATTERNS = [
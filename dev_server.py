@@ -2,26 +2,41 @@
 """
 개발용 라이브 서버
 - templates/, static/ 파일 변경 감지 → 자동 SSG 빌드 → dist/ 서빙
+- 빌드 엔진(Flask 앱, 컴파일된 템플릿, 유틸리티 클래스 후보)을 프로세스 안에 유지
+  - 시작 시 전체 빌드 1회
+  - static/ 변경 → 해당 파일만 dist/static/ 으로 복사
+  - 템플릿 변경 → 그 템플릿을 쓰는 페이지만 다시 빌드 (template_graph.py)
+- SSE 로 다시 빌드된 페이지 목록을 보내 해당 페이지를 연 탭만 새로고침
 - 사용법: python dev_server.py
 """
 
 import os
-import sys
+import json
 import time
+import shutil
 import threading
-import subprocess
+import traceback
 from flask import Flask, send_from_directory, abort, Response
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+import build
+from config import Config
+from utility_css import (
+    STYLESHEET_PATTERN, compile_css, collect_candidates, candidates_in_html, candidates_in_script
+)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DIST_DIR = os.path.join(BASE_DIR, 'dist')
+DIST_DIR = Config.DIST_DIR
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
 
 WATCH_DIRS = [
     os.path.join(BASE_DIR, 'templates'),
-    os.path.join(BASE_DIR, 'static'),
+    STATIC_DIR,
 ]
 
+DEBOUNCE_SECONDS = 0.05     # 에디터가 저장 시 여러 이벤트를 보내는 간격만큼만 모음
+
 # SSE 클라이언트 목록 (브라우저 자동 리로드용)
 sse_clients = []
 
@@ -29,43 +44,157 @@ sse_clients = []
 # 빌드
 # ==========================================
 
+
+class BuildEngine:
+    """
+    프로세스 안에 유지하는 빌드 엔진
+
+    전체 빌드 때 정한 유틸리티 CSS 경로/웹폰트 태그(replacements)를 기억해 두고,
+    증분 빌드로 새로 그린 페이지에만 적용한다. 새 클래스가 나오면 같은 CSS 파일을 다시 쓴다
+    (파일명이 그대로라 다른 페이지를 고칠 필요가 없다).
+    """
+
+    def __init__(self):
+        self.app = build.create_app()
+        self.app.jinja_env.auto_reload = True   # 바뀐 템플릿만 다시 컴파일
+        self.lock = threading.Lock()
+        self.replacements = {}
+        self.candidates = set()
+
+    def full_build(self):
+        """전체 빌드 → 모든 페이지 새로고침"""
+        with self.lock:
+            build.apply_logo_color(self.app)
+            self.app.extensions['fragment_cache'].clear()
+            self.replacements = build.build_site(self.app)
+            self.candidates = collect_candidates(DIST_DIR)
+        return ['*']
+
+    def rebuild(self, paths):
+        """
+        변경 파일 반영
+
+        Returns:
+            list: 다시 만든 페이지 URL 경로 ('*' 는 모든 페이지)
+        """
+        with self.lock:
+            static_paths = [path for path in paths if path.startswith(STATIC_DIR + os.sep)]
+            reload_all = bool(static_paths) and self._copy_static(static_paths)
+
+            pages, _ = build.plan_incremental(self.app, paths)
+            if not pages:
+                if reload_all:
+                    build.write_build_manifest(incremental=True)
+                return ['*'] if reload_all else []
+
+            # 조각 캐시는 빌드 단위 → 템플릿/DB가 바뀌었을 수 있으므로 비움
+            build.apply_logo_color(self.app)
+            self.app.extensions['fragment_cache'].clear()
+            with build.track_written_pages() as written:
+                for page in pages:
+                    for builder in build.PAGE_BUILDERS[page]:
+                        builder(self.app)
+            build.report_minify()
+            self._finish_pages(written)
+            build.write_build_manifest(incremental=True)
+        return ['*'] if reload_all else [page_url(path) for path in written]
+
+    def _copy_static(self, paths):
+        """바뀐 static 파일만 복사/삭제 (build.STATIC_FOLDERS 안의 파일만) → 모든 페이지 새로고침 여부"""
+        copied = False
+        for src in paths:
+            relpath = os.path.relpath(src, BASE_DIR)
+            if relpath.split(os.sep)[1] not in build.STATIC_FOLDERS:
+                continue
+            dst = os.path.join(DIST_DIR, relpath)
+            if os.path.exists(src):
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copy2(src, dst)
+            elif os.path.exists(dst):
+                os.remove(dst)
+            else:
+                continue
+            print(f"  ✓ {relpath.replace(os.sep, '/')}")
+            copied = True
+            if src.endswith('.js') and os.path.exists(src):
+                with open(src, encoding='utf-8') as f:
+                    self._add_candidates(candidates_in_script(f.read()))
+        return copied
+
+    def _finish_pages(self, written):
+        """새로 그린 페이지: 클래스 후보 추가 + 스타일시트/웹폰트 자리 표시 교체"""
+        for path in written:
+            full_path = os.path.join(DIST_DIR, path)
+            with open(full_path, encoding='utf-8') as f:
+                html = f.read()
+            self._add_candidates(candidates_in_html(html))
+            for pattern, value in self.replacements.items():
+                html = pattern.sub(lambda match: value, html)
+            with open(full_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+
+    def _add_candidates(self, candidates):
+        """처음 보는 클래스가 있으면 유틸리티 CSS 를 같은 파일명으로 다시 생성"""
+        if candidates <= self.candidates:
+            return
+        self.candidates |= candidates
+        url = self.replacements[STYLESHEET_PATTERN]
+        css, generated = compile_css(self.candidates)
+        with open(os.path.join(DIST_DIR, url.lstrip('/')), 'w', encoding='utf-8') as f:
+            f.write(css)
+        print(f"  ✓ {url} 갱신 (클래스 {generated}개)")
+
+
+def page_url(path):
+    """dist 기준 페이지 경로 → 브라우저 경로 ('notice/index.html' → '/notice/index.html')"""
+    return '/' + path.replace(os.sep, '/')
+
+
+engine = None
 _build_lock = threading.Lock()
 _build_scheduled = False
+_changed_paths = set()
 
 
-def run_build():
-    """SSG 빌드 실행"""
-    global _build_scheduled
-    with _build_lock:
-        _build_scheduled = False
-    print("\n🔨 빌드 시작...")
-    start = time.time()
-    result = subprocess.run(
-        [sys.executable, 'build.py'],
-        capture_output=True, text=True, cwd=BASE_DIR
-    )
-    elapsed = time.time() - start
-    if result.returncode == 0:
-        print(f"✅ 빌드 완료 ({elapsed:.1f}s)")
-    else:
-        print(f"❌ 빌드 실패 ({elapsed:.1f}s)")
-        if result.stderr:
-            print(result.stderr[:500])
+def run_build(changed=None):
+    """
+    SSG 빌드 실행 (프로세스 안 빌드 엔진)
+
+    Args:
+        changed: 변경된 파일 경로 목록 (없으면 전체 빌드)
+    """
+    start = time.perf_counter()
+    try:
+        pages = engine.rebuild(sorted(changed)) if changed else engine.full_build()
+    except Exception:
+        print(f"❌ 빌드 실패 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        traceback.print_exc(limit=5)
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    label = '전체' if pages == ['*'] else f'페이지 {len(pages)}개'
+    print(f"✅ 빌드 완료 ({elapsed:.0f}ms, {label})")
     # 브라우저 리로드 알림
-    notify_reload()
+    if pages:
+        notify_reload(pages)
 
 
-def schedule_build():
-    """디바운스: 0.5초 내 중복 변경 무시"""
+def schedule_build(path):
+    """디바운스: DEBOUNCE_SECONDS 동안의 변경 파일을 모아 한 번에 증분 빌드"""
     global _build_scheduled
     with _build_lock:
+        _changed_paths.add(path)
         if _build_scheduled:
             return
         _build_scheduled = True
 
     def _delayed():
-        time.sleep(0.5)
-        run_build()
+        global _build_scheduled
+        time.sleep(DEBOUNCE_SECONDS)
+        with _build_lock:
+            _build_scheduled = False
+            changed = set(_changed_paths)
+            _changed_paths.clear()
+        run_build(changed)
 
     threading.Thread(target=_delayed, daemon=True).start()
 
@@ -84,19 +213,25 @@ class RebuildHandler(FileSystemEventHandler):
         if ext in self.EXTENSIONS:
             relpath = os.path.relpath(event.src_path, BASE_DIR)
             print(f"📝 변경 감지: {relpath}")
-            schedule_build()
+            schedule_build(os.path.abspath(event.src_path))
 
 
 # ==========================================
 # SSE (브라우저 자동 리로드)
 # ==========================================
 
-def notify_reload():
-    """모든 연결된 브라우저에 리로드 신호 전송"""
+def notify_reload(pages):
+    """
+    연결된 브라우저에 다시 빌드된 페이지 목록 전송
+
+    Args:
+        pages: 페이지 URL 경로 목록 ('*' 는 모든 페이지 - static 변경, 전체 빌드)
+    """
+    message = json.dumps({'pages': pages})
     dead = []
     for client in sse_clients:
         try:
-            client.put('reload')
+            client.put(message)
         except Exception:
             dead.append(client)
     for c in dead:
@@ -113,13 +248,25 @@ app = Flask(__name__)
 RELOAD_SCRIPT = """
 <script>
 (function() {
-  var es = new EventSource('/__dev_reload');
-  es.onmessage = function(e) {
-    if (e.data === 'reload') location.reload();
-  };
-  es.onerror = function() {
-    setTimeout(function() { location.reload(); }, 2000);
-  };
+  // 현재 페이지의 dist 파일 경로 ('/notice/' → '/notice/index.html', '/intro' → '/intro.html')
+  var path = location.pathname;
+  if (path.slice(-1) === '/') path += 'index.html';
+  else if (path.split('/').pop().indexOf('.') === -1) path += '.html';
+
+  function connect() {
+    var es = new EventSource('/__dev_reload');
+    es.onmessage = function(e) {
+      if (e.data === 'ping') return;
+      var pages = JSON.parse(e.data).pages;
+      if (pages.indexOf('*') !== -1 || pages.indexOf(path) !== -1) location.reload();
+    };
+    // 연결이 끊기면 다시 연결만 한다 (새로고침하지 않음 - 바뀐 페이지는 다음 알림으로)
+    // EventSource 가 스스로 재연결하지 않고 닫힌 경우(서버 재시작 중 오류 응답 등)만 직접 다시 연결
+    es.onerror = function() {
+      if (es.readyState === EventSource.CLOSED) setTimeout(connect, 2000);
+    };
+  }
+  connect();
 })();
 </script>
 """
@@ -135,10 +282,13 @@ def dev_reload_sse():
     def stream():
         try:
             while True:
-                msg = q.get(timeout=30)
+                try:
+                    msg = q.get(timeout=30)
+                except queue.Empty:
+                    # 연결 유지용 - 끊지 않고 계속 대기 (끊기면 클라이언트가 다시 연결)
+                    yield "data: ping\n\n"
+                    continue
                 yield f"data: {msg}\n\n"
-        except queue.Empty:
-            yield "data: ping\n\n"
         except GeneratorExit:
             pass
         finally:
@@ -199,7 +349,8 @@ if __name__ == '__main__':
     print("🚀 개발 서버 (라이브 리로드)")
     print("=" * 60)
 
-    # 초기 빌드
+    # 빌드 엔진 준비 + 초기 전체 빌드
+    engine = BuildEngine()
     run_build()
 
     # 파일 감시 시작
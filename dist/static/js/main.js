@@ -14,6 +14,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Navigation Scroll Effect
     initNavScroll();
+
+    // Prefetch Likely Next Pages
+    initPrefetch();
+
+    // Offline / Repeat Visit Cache
+    initServiceWorker();
 });
 
 /**
@@ -239,3 +245,104 @@ function initLazyLoading() {
         });
     }
 }
+
+/**
+ * 다음 페이지 미리 받기
+ * - build.py 가 페이지마다 정한 목록(#prefetch-pages: 목록 다음 쪽, 상세 이전/다음 글)을 바로 받고
+ * - 그 밖의 사이트 내부 링크는 마우스를 올리거나 터치를 시작할 때 받는다
+ * - Speculation Rules 를 지원하면 브라우저에 맡기고, 아니면 <link rel="prefetch"> 로 대신한다
+ * - 데이터 절약 모드, 2G 이하 연결에서는 받지 않고, 3G 에서는 목록의 첫 페이지만 받는다
+ */
+const PREFETCH_EXCLUDE = /^\/(static|uploads|search)\//;
+
+function prefetchLevel() {
+    const connection = navigator.connection;
+    if (!connection) return 'full';
+    if (connection.saveData || /(^|-)2g$/.test(connection.effectiveType || '')) return 'none';
+    return connection.effectiveType === '3g' ? 'light' : 'full';
+}
+
+function isPrefetchable(link) {
+    if (!link || link.origin !== location.origin || link.hasAttribute('download') || link.target === '_blank') {
+        return false;
+    }
+    return link.pathname !== location.pathname && !PREFETCH_EXCLUDE.test(link.pathname);
+}
+
+function initPrefetch() {
+    const level = prefetchLevel();
+    if (level === 'none') return;
+
+    const data = document.getElementById('prefetch-pages');
+    let urls = data ? JSON.parse(data.textContent) : [];
+    if (level === 'light') urls = urls.slice(0, 1);
+
+    if (window.HTMLScriptElement && HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules')) {
+        const rules = { prefetch: [] };
+        if (urls.length) rules.prefetch.push({ source: 'list', urls: urls });
+        if (level === 'full') {
+            rules.prefetch.push({
+                source: 'document',
+                where: { and: [
+                    { href_matches: '/*' },
+                    { not: { href_matches: '/(static|uploads|search)/*' } },
+                    { not: { selector_matches: '[download], [target=_blank]' } }
+                ] },
+                eagerness: 'moderate'
+            });
+        }
+        if (!rules.prefetch.length) return;
+        const script = document.createElement('script');
+        script.type = 'speculationrules';
+        script.textContent = JSON.stringify(rules);
+        document.head.appendChild(script);
+        return;
+    }
+
+    const done = new Set([location.pathname]);
+    function prefetch(url) {
+        if (done.has(url)) return;
+        done.add(url);
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = url;
+        document.head.appendChild(link);
+    }
+
+    // 목록: 첫 화면을 다 그린 뒤 한가할 때
+    const idle = window.requestIdleCallback || function(callback) { setTimeout(callback, 200); };
+    window.addEventListener('load', function() {
+        idle(function() { urls.forEach(prefetch); });
+    });
+
+    // 나머지 링크: 마우스 올림(잠깐 머물 때)/터치 시작
+    if (level !== 'full') return;
+    let hoverTimer = null;
+    document.addEventListener('mouseover', function(e) {
+        const link = e.target.closest('a[href]');
+        if (!isPrefetchable(link)) return;
+        clearTimeout(hoverTimer);
+        hoverTimer = setTimeout(function() { prefetch(link.pathname); }, 65);
+    });
+    document.addEventListener('mouseout', function() {
+        clearTimeout(hoverTimer);
+    });
+    document.addEventListener('touchstart', function(e) {
+        const link = e.target.closest('a[href]');
+        if (isPrefetchable(link)) prefetch(link.pathname);
+    }, { passive: true });
+}
+
+/**
+ * 서비스 워커 등록 (build.py 가 생성하는 /sw.js - service_worker.py 참고)
+ * - 다시 방문하거나 연결이 불안정할 때 캐시로 바로 열고, 오프라인이면 메인 페이지를 보여 준다
+ * - 로컬 개발/미리보기 서버(localhost)에서는 등록하지 않는다 (라이브 리로드가 캐시에 가려지지 않도록)
+ */
+const SERVICE_WORKER_LOCAL_HOSTS = /^(localhost|127\.0\.0\.1|\[::1\])$/;
+
+function initServiceWorker() {
+    if (!('serviceWorker' in navigator) || SERVICE_WORKER_LOCAL_HOSTS.test(location.hostname)) return;
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(function() {});
+    });
+}
@@ -0,0 +1,319 @@
+/**
+ * 사이트 검색 (빌드 시 생성한 /search/ 인덱스 사용, site_search.py 참고)
+ *
+ * manifest.json 을 먼저 받고, 검색어 단어마다 필요한 용어 샤드와
+ * 결과 문서가 들어 있는 문서 청크만 내려받는다. 받은 파일은 페이지 안에서 재사용한다.
+ *
+ * 검색어 처리 (site_search.py 의 색인 규칙과 짝):
+ * - 한글 단어: 음절 bigram이 모두 있는 문서 ("동자" → 노동자의)
+ * - 한 글자 한글 / 영문·숫자: 해당 글자로 시작하는 용어 전부 (접두어)
+ * - 초성만 입력 ("ㄴㄷㅈ"): 제목 초성 bigram
+ * 순위는 역색인의 필드 비트(제목/발췌)와 문서 번호(최신순)로 계산한다.
+ */
+(function() {
+    const SEARCH_ROOT = '/search/';
+    const SHARD_ROOT = SEARCH_ROOT + 'shards/';
+    const HANGUL_BASE = 0xAC00;
+    const HANGUL_END = 0xD7A3;
+    const CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+    const CHOSEONG_GROUP = { 'ㄲ': 'ㄱ', 'ㄸ': 'ㄷ', 'ㅃ': 'ㅂ', 'ㅆ': 'ㅅ', 'ㅉ': 'ㅈ' };
+    const TOKEN_PATTERN = /[0-9a-z]+|[가-힣]+|[ㄱ-ㅎ]+/g;
+    const FIELD_TITLE = 1;
+    const FIELD_EXCERPT = 2;
+
+    let manifestPromise = null;
+    const filePromises = {};
+
+    function fetchJson(url) {
+        return fetch(url).then(function(res) {
+            if (!res.ok) throw new Error('검색 인덱스를 불러오지 못했습니다: ' + url);
+            return res.json();
+        });
+    }
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetchJson(SEARCH_ROOT + 'manifest.json').catch(function(err) {
+                manifestPromise = null;
+                throw err;
+            });
+        }
+        return manifestPromise;
+    }
+
+    function loadShard(name) {
+        if (!filePromises[name]) {
+            filePromises[name] = fetchJson(SHARD_ROOT + name).catch(function(err) {
+                delete filePromises[name];
+                throw err;
+            });
+        }
+        return filePromises[name];
+    }
+
+    function tokenize(text) {
+        return (text || '').toLowerCase().match(TOKEN_PATTERN) || [];
+    }
+
+    function choseongOf(char) {
+        const code = char.charCodeAt(0);
+        if (code < HANGUL_BASE || code > HANGUL_END) return null;
+        const initial = CHOSEONG[Math.floor((code - HANGUL_BASE) / 588)];
+        return CHOSEONG_GROUP[initial] || initial;
+    }
+
+    function bigrams(word) {
+        if (word.length === 1) return [word];
+        const grams = [];
+        for (let i = 0; i < word.length - 1; i++) grams.push(word.slice(i, i + 2));
+        return grams;
+    }
+
+    /**
+     * 검색어 단어 → 찾을 용어 목록과 접두어 일치 여부
+     */
+    function queryTerms(word) {
+        if (/^[ㄱ-ㅎ]+$/.test(word)) {
+            const normalized = word.split('').map(function(c) { return CHOSEONG_GROUP[c] || c; }).join('');
+            return { terms: bigrams(normalized), prefix: normalized.length === 1 };
+        }
+        if (/^[가-힣]+$/.test(word)) {
+            return { terms: bigrams(word), prefix: word.length === 1 };
+        }
+        return { terms: [word], prefix: true };
+    }
+
+    /**
+     * 용어가 들어 있을 수 있는 용어 샤드 키 목록 (site_search.shard_key 와 같은 규칙)
+     */
+    function shardKeysFor(term, terms) {
+        const first = term[0];
+        const hangul = choseongOf(first);
+        const key = hangul || first;
+        if (terms[key]) return [key];
+
+        // 큰 샤드는 두 번째 단계로 분할되어 있음
+        if (hangul || term.length >= 2) {
+            const key2 = key + '/' + (hangul ? first : term.slice(0, 2));
+            return terms[key2] ? [key2] : [];
+        }
+        // 한 글자 (영문/초성) → 그 글자로 시작하는 분할 샤드 전부
+        return Object.keys(terms).filter(function(k) {
+            return k.indexOf(key + '/') === 0 && k.slice(key.length + 1).indexOf(term) === 0;
+        });
+    }
+
+    function lowerBound(keys, term) {
+        let lo = 0, hi = keys.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (keys[mid] < term) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    /**
+     * 용어 하나의 역색인 → 문서 번호별 필드 비트 배열 (0 = 없음)
+     */
+    function lookupTerm(shards, term, prefix, n) {
+        const masks = new Uint8Array(n);
+        shards.forEach(function(shard) {
+            const keys = shard.k;
+            for (let i = lowerBound(keys, term); i < keys.length; i++) {
+                if (prefix ? keys[i].indexOf(term) !== 0 : keys[i] !== term) break;
+                const list = shard.p[i];
+                for (let j = 0; j < list.length; j++) masks[list[j] >> 2] |= list[j] & 3;
+            }
+        });
+        return masks;
+    }
+
+    /**
+     * 내려받은 샤드로 순위 계산 (동기, 네트워크 없음)
+     * @param {Array<{terms: string[], prefix: boolean, shards: Object[]}>} words
+     * @returns {number[]} 점수 내림차순 문서 번호
+     */
+    function rank(manifest, words) {
+        const n = manifest.n;
+        const weights = manifest.w;
+        const scores = new Float64Array(n);
+        const alive = new Uint8Array(n).fill(1);
+
+        for (let w = 0; w < words.length; w++) {
+            const word = words[w];
+            // 단어의 bigram이 모두 있는 문서만 (필드 비트는 교집합 → 제목에 단어 전체가 있어야 제목 가중치)
+            let masks = null;
+            for (let t = 0; t < word.terms.length; t++) {
+                const found = lookupTerm(word.shards[t], word.terms[t], word.prefix, n);
+                if (masks === null) {
+                    masks = found;
+                    continue;
+                }
+                for (let id = 0; id < n; id++) {
+                    if (masks[id]) masks[id] = found[id] ? ((masks[id] & found[id]) || FIELD_EXCERPT) : 0;
+                }
+            }
+
+            // 단어 간 AND, 점수 누적
+            for (let id = 0; id < n; id++) {
+                if (!alive[id]) continue;
+                if (!masks[id]) alive[id] = 0;
+                else scores[id] += (masks[id] & FIELD_TITLE) ? weights.title : weights.excerpt;
+            }
+        }
+
+        // 필드 점수가 같은 문서끼리는 문서 번호 순(= 최신순)이 곧 순위
+        const groups = new Map();
+        for (let id = 0; id < n; id++) {
+            if (!alive[id]) continue;
+            const group = groups.get(scores[id]);
+            if (group) group.push(id); else groups.set(scores[id], [id]);
+        }
+        const levels = Array.from(groups.keys()).sort(function(a, b) { return b - a; });
+
+        // 최신순 가산점이 점수 단계 차이보다 작으면 단계별로 이어 붙이기만 하면 됨 (정렬 생략)
+        const separated = levels.every(function(level, i) {
+            return i === 0 || levels[i - 1] - level > weights.recency;
+        });
+        const ids = [].concat.apply([], levels.map(function(level) { return groups.get(level); }));
+        if (separated) return ids;
+
+        const final = function(id) { return scores[id] + weights.recency * (1 - id / n); };
+        return ids.sort(function(a, b) { return final(b) - final(a) || a - b; });
+    }
+
+    function loadWords(manifest, query) {
+        const words = Array.from(new Set(tokenize(query))).map(queryTerms);
+        return Promise.all(words.map(function(word) {
+            return Promise.all(word.terms.map(function(term) {
+                const names = shardKeysFor(term, manifest.terms).map(function(k) { return manifest.terms[k]; });
+                return Promise.all(names.map(loadShard));
+            })).then(function(shards) {
+                word.shards = shards;
+                return word;
+            });
+        }));
+    }
+
+    /**
+     * 검색
+     * @param {string} query
+     * @param {{limit?: number, filter?: function(Object): boolean}} options
+     * @returns {Promise<Array<{t: string, u: string, d: string, c: string, e: string}>>}
+     */
+    function search(query, options) {
+        options = options || {};
+        const limit = options.limit || 30;
+        if (!tokenize(query).length) return Promise.resolve([]);
+
+        return loadManifest().then(function(manifest) {
+            return loadWords(manifest, query).then(function(words) {
+                const ids = rank(manifest, words);
+                const results = [];
+                // 순위대로 필요한 문서 청크만 받아 limit 건이 찰 때까지 채움
+                function next(pos) {
+                    if (pos >= ids.length || results.length >= limit) return results;
+                    const chunkIndex = Math.floor(ids[pos] / manifest.chunk);
+                    return loadShard(manifest.docs[chunkIndex]).then(function(chunk) {
+                        const doc = chunk[ids[pos] % manifest.chunk];
+                        if (!options.filter || options.filter(doc)) results.push(doc);
+                        return next(pos + 1);
+                    });
+                }
+                return next(0);
+            });
+        });
+    }
+
+    function renderResult(doc) {
+        const link = document.createElement('a');
+        link.href = doc.u;
+        link.className = 'group block bg-white border border-light-300 hover:border-primary/30 rounded-xl p-4 sm:p-5 mb-3 transition-smooth';
+
+        const meta = document.createElement('p');
+        meta.className = 'text-[10px] sm:text-xs text-dark-500 font-medium mb-1';
+        meta.textContent = '#' + doc.c + (doc.d ? ' · ' + doc.d : '');
+
+        const title = document.createElement('h3');
+        title.className = 'text-xs sm:text-sm font-bold text-dark-900 group-hover:text-primary transition-smooth';
+        title.style.wordBreak = 'keep-all';
+        title.textContent = doc.t;
+
+        link.appendChild(meta);
+        link.appendChild(title);
+        if (doc.e) {
+            const excerpt = document.createElement('p');
+            excerpt.className = 'text-[11px] sm:text-xs text-dark-500 font-medium mt-1 line-clamp-2 leading-relaxed';
+            excerpt.textContent = doc.e;
+            link.appendChild(excerpt);
+        }
+        return link;
+    }
+
+    /**
+     * 게시판 목록 검색창 연결
+     *
+     * 입력 즉시 현재 페이지 카드를 제목으로 거르고, 인덱스 결과가 오면
+     * 전체 게시물 검색 결과 목록으로 바꿔 보여준다 (인덱스를 못 받으면 현재 페이지 결과 유지).
+     * @param {{prefix: string, category?: string}} options - prefix: 결과 URL 접두어 (예: '/notice/')
+     */
+    function bindBoard(options) {
+        const input = document.getElementById('board-search');
+        if (!input) return;
+        const grid = document.getElementById('board-grid');
+        const cards = document.querySelectorAll('#board-grid > a, #board-pinned > a');
+        const hideOnSearch = ['board-grid', 'board-pinned', 'board-pagination']
+            .map(function(id) { return document.getElementById(id); })
+            .filter(Boolean);
+        const emptyMsg = document.getElementById('board-empty');
+
+        const results = document.createElement('div');
+        results.id = 'board-search-results';
+        results.className = 'hidden';
+        if (grid) grid.parentNode.insertBefore(results, grid);
+        else if (emptyMsg) emptyMsg.parentNode.insertBefore(results, emptyMsg);
+
+        function filter(doc) {
+            return doc.u.indexOf(options.prefix) === 0 && (!options.category || doc.c === options.category);
+        }
+
+        let timer = null;
+        let seq = 0;
+
+        input.addEventListener('input', function() {
+            const q = this.value.trim().toLowerCase();
+            const current = ++seq;
+
+            // 1) 현재 페이지 즉시 필터
+            let visible = 0;
+            cards.forEach(function(card) {
+                const show = !q || (card.dataset.title || '').toLowerCase().indexOf(q) !== -1;
+                card.style.display = show ? '' : 'none';
+                if (show) visible++;
+            });
+            hideOnSearch.forEach(function(el) {
+                if (el.id === 'board-pagination') el.style.display = q ? 'none' : '';
+                else el.classList.remove('hidden');
+            });
+            results.classList.add('hidden');
+            if (emptyMsg) emptyMsg.classList.toggle('hidden', visible > 0 || !q);
+
+            // 2) 전체 게시물 인덱스 검색
+            clearTimeout(timer);
+            if (!q) return;
+            timer = setTimeout(function() {
+                search(q, { filter: filter }).then(function(docs) {
+                    if (current !== seq) return;
+                    results.replaceChildren.apply(results, docs.map(renderResult));
+                    results.classList.remove('hidden');
+                    hideOnSearch.forEach(function(el) {
+                        if (el.id !== 'board-pagination') el.classList.add('hidden');
+                    });
+                    if (emptyMsg) emptyMsg.classList.toggle('hidden', docs.length > 0);
+                }).catch(function() { /* 인덱스 없음 → 현재 페이지 필터 결과 유지 */ });
+            }, 150);
+        });
+    }
+
+    window.SiteSearch = { search: search, rank: rank, bindBoard: bindBoard };
+})();
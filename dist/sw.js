@@ -0,0 +1,137 @@
+// build.py 가 생성 (service_worker.py) - 직접 고치지 말 것
+const VERSION = "20261019042416";
+const PRECACHE = 'precache-' + VERSION;
+const PAGES = 'pages';
+const ASSETS = 'assets';
+const PRECACHE_URLS = ["/", "/static/css/utilities.3fa212019b.css", "/static/js/main.js"];
+const OFFLINE_URL = "/";
+const MAX_PAGES = 50;
+const MAX_ASSETS = 100;
+const FINGERPRINTED = /\.[0-9a-f]{10}\.[a-z0-9]+$|^\/static\/fonts\//;
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        caches.open(PRECACHE)
+            .then(function(cache) { return cache.addAll(PRECACHE_URLS); })
+            .then(function() { return self.skipWaiting(); })
+    );
+});
+
+// 이전 버전의 미리 받기 캐시: 지문 파일은 런타임 캐시(ASSETS)로 옮긴 뒤 지움
+// 페이지 캐시의 이전 HTML 이 아직 예전 지문 파일(utilities.<이전 hash>.css 등)을 가리키는데,
+// 새 배포에는 그 파일이 없으므로 캐시에 남겨 두어야 다시 받은 페이지로 바뀔 때까지 제대로 그려진다
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys()
+            .then(function(keys) {
+                return Promise.all(keys.filter(function(key) {
+                    return key.indexOf('precache-') === 0 && key !== PRECACHE;
+                }).map(retirePrecache));
+            })
+            .then(function() { return caches.open(ASSETS); })
+            .then(function(cache) { return trim(cache, MAX_ASSETS); })
+            .then(function() { return self.clients.claim(); })
+    );
+});
+
+function retirePrecache(key) {
+    return Promise.all([caches.open(key), caches.open(ASSETS)]).then(function(opened) {
+        const previous = opened[0];
+        const assets = opened[1];
+        return previous.keys().then(function(requests) {
+            return Promise.all(requests.filter(function(request) {
+                return FINGERPRINTED.test(new URL(request.url).pathname);
+            }).map(function(request) {
+                return assets.match(request).then(function(existing) {
+                    if (existing) return null;
+                    return previous.match(request).then(function(response) {
+                        return response && assets.put(request, response);
+                    });
+                });
+            }));
+        });
+    }).then(function() { return caches.delete(key); });
+}
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== location.origin || url.pathname.indexOf('/search/') === 0) return;
+
+    if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(event, PAGES, MAX_PAGES, fetchPage));
+    } else if (url.pathname.indexOf('/static/') === 0) {
+        event.respondWith(FINGERPRINTED.test(url.pathname)
+            ? cacheFirst(event)
+            : staleWhileRevalidate(event, ASSETS, MAX_ASSETS, fetch));
+    }
+});
+
+// 페이지 요청: Cloudflare Pages 는 .html 주소를 .html 없는 주소로 리디렉션하므로
+// 리디렉션을 따라간 응답을 새 응답으로 감싸 요청 주소 그대로 캐시한다 (내비게이션에 리디렉션 응답은 못 씀)
+function fetchPage(request) {
+    return fetch(request.url, { credentials: 'same-origin' }).then(function(response) {
+        if (!response.redirected) return response;
+        return response.blob().then(function(body) {
+            return new Response(body, {
+                status: response.status,
+                statusText: response.statusText,
+                headers: response.headers
+            });
+        });
+    });
+}
+
+function store(event, cacheName, limit, request, response) {
+    if (!response.ok || response.type !== 'basic') return;
+    const copy = response.clone();
+    event.waitUntil(caches.open(cacheName).then(function(cache) {
+        return cache.put(request, copy).then(function() { return trim(cache, limit); });
+    }));
+}
+
+// 오래 안 쓴 항목부터 지우기 (cache.put 은 같은 키를 맨 뒤로 옮김)
+function trim(cache, limit) {
+    return cache.keys().then(function(keys) {
+        return Promise.all(keys.slice(0, Math.max(keys.length - limit, 0)).map(function(key) {
+            return cache.delete(key);
+        }));
+    });
+}
+
+// 자기 캐시(새로 받은 것)를 먼저 보고, 없으면 설치 때 미리 받은 것
+function lookup(cacheName, request) {
+    return caches.open(cacheName).then(function(cache) {
+        return cache.match(request);
+    }).then(function(cached) {
+        return cached || caches.match(request);
+    });
+}
+
+function staleWhileRevalidate(event, cacheName, limit, fetcher) {
+    const request = event.request;
+    const network = fetcher(request).then(function(response) {
+        store(event, cacheName, limit, request, response);
+        return response;
+    });
+    return lookup(cacheName, request).then(function(cached) {
+        if (cached) {
+            event.waitUntil(network.catch(function() {}));
+            return cached;
+        }
+        return network.catch(function() {
+            return cacheName === PAGES ? caches.match(OFFLINE_URL) : Response.error();
+        });
+    });
+}
+
+function cacheFirst(event) {
+    const request = event.request;
+    return caches.match(request).then(function(cached) {
+        return cached || fetch(request).then(function(response) {
+            store(event, ASSETS, MAX_ASSETS, request, response);
+            return response;
+        });
+    });
+}
@@ -3,6 +3,16 @@ set -e
 
 echo "=== Starting Admin Server ==="
 
+# 신규 테이블/컬럼 반영 (기존 데이터 유지)
+echo "Upgrading database schema..."
+flask --app app upgrade-db
+
+# 파일 역참조 인덱스 재생성 (사용 중 파일 확인용)
+flask --app app rebuild-file-refs
+
+# 관리자 검색 인덱스 재생성 (FTS5)
+flask --app app rebuild-search-index
+
 # dist 폴더가 비어있으면 초기 빌드 실행
 if [ ! -f "/app/dist/index.html" ]; then
     echo "Building static site..."
@@ -4,9 +4,11 @@
 - DB 동기화: 누락된 파일을 files 테이블에 등록
 - 고아 파일 확인: 어디서도 사용되지 않는 파일 확인
 - 고아 파일 제거: 어디서도 사용되지 않는 파일 삭제
+- R2 대조: 버킷 객체와 files 테이블 비교 (선택적으로 DB 보정)
 """
 
 import os
+import re
 import sys
 import sqlite3
 import mimetypes
@@ -16,6 +18,8 @@ from pathlib import Path
 # 설정
 DB_PATH = 'data.db'
 UPLOADS_DIR = 'dist/uploads'
+RECONCILE_BATCH_SIZE = 500   # R2 대조 보정 시 한 번에 반영할 행 수
+RECONCILE_PAGE_SIZE = 1000   # files 테이블 페이지 크기
 
 
 def get_file_info(filepath):
@@ -33,50 +37,93 @@ def get_file_info(filepath):
     }
 
 
-def check_file_usage(cursor, file_id, filename):
-    """파일이 사용되는지 확인"""
-
-    # notice_attachments 확인
-    cursor.execute("SELECT COUNT(*) FROM notice_attachments WHERE file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
-
-    # activity_attachments 확인
-    cursor.execute("SELECT COUNT(*) FROM activity_attachments WHERE file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
-
-    # activity_photos 확인
-    cursor.execute("SELECT COUNT(*) FROM activity_photos WHERE file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
-
-    # activity_posts 썸네일 확인
-    cursor.execute("SELECT COUNT(*) FROM activity_posts WHERE thumbnail_file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
-
-    # business_areas 사진 확인
-    cursor.execute("SELECT COUNT(*) FROM business_areas WHERE photo_file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
-
-    # newsletters PDF 확인
-    cursor.execute("SELECT COUNT(*) FROM newsletters WHERE pdf_file_id = ?", (file_id,))
-    if cursor.fetchone()[0] > 0:
-        return True
+def sync_storage_usage(cursor):
+    """
+    files 테이블을 직접 수정한 뒤 저장 용량 집계값(storage_usage) 재계산
+    (앱의 File 이벤트를 거치지 않으므로 같은 트랜잭션에서 맞춰 둠)
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'storage_usage'")
+    if not cursor.fetchone():
+        return
 
-    # 콘텐츠 내 이미지 참조 확인 (notices)
-    cursor.execute("SELECT COUNT(*) FROM notices WHERE content LIKE ?", (f'%/uploads/{filename}%',))
-    if cursor.fetchone()[0] > 0:
-        return True
+    cursor.execute("SELECT COALESCE(SUM(size), 0) FROM files")
+    total = cursor.fetchone()[0]
+    cursor.execute("UPDATE storage_usage SET total_bytes = ?, updated_at = ? WHERE id = 1",
+                   (total, str(datetime.utcnow())))
+    if cursor.rowcount == 0:
+        cursor.execute("INSERT INTO storage_usage (id, total_bytes, updated_at) VALUES (1, ?, ?)",
+                       (total, str(datetime.utcnow())))
+
+
+# 파일 ID로 참조하는 곳 (연결 테이블 / FK 컬럼)
+FILE_ID_REFERENCES = [
+    ('notice_attachments', 'file_id'),
+    ('activity_attachments', 'file_id'),
+    ('activity_photos', 'file_id'),
+    ('activity_posts', 'thumbnail_file_id'),
+    ('business_areas', 'photo_file_id'),
+    ('newsletters', 'pdf_file_id'),
+    ('file_references', 'file_id'),  # 앱이 관리하는 역참조 (있을 때만)
+]
+
+# 본문 HTML에 /uploads/ URL로 들어가는 곳
+CONTENT_REFERENCES = [
+    ('notices', 'content'),
+    ('activity_posts', 'content'),
+    ('newsletters', 'html_content'),
+]
+
+UPLOAD_URL_PATTERN = re.compile(r'/uploads/([\w.-]+)')
+
+
+def get_referenced_file_ids(cursor):
+    """연결 테이블/FK 컬럼에서 참조 중인 파일 ID 전체 (UNION 한 번)"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+
+    selects = [
+        f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL"
+        for table, column in FILE_ID_REFERENCES if table in tables
+    ]
+    cursor.execute(" UNION ".join(selects))
+    return {row[0] for row in cursor}
+
+
+def get_referenced_filenames(cursor):
+    """본문 HTML의 /uploads/ 파일명 전체 (행 단위로 스트리밍하며 추출)"""
+    selects = [f"SELECT {column} FROM {table}" for table, column in CONTENT_REFERENCES]
+    cursor.execute(" UNION ALL ".join(selects))
+
+    filenames = set()
+    for (content,) in cursor:
+        if content:
+            filenames.update(UPLOAD_URL_PATTERN.findall(content))
+    return filenames
+
+
+def find_orphan_files(cursor):
+    """
+    고아 파일 찾기 (참조 목록을 한 번에 모은 뒤 메모리에서 비교)
+    Returns: (전체 파일 수, 고아 파일 목록)
+    """
+    used_ids = get_referenced_file_ids(cursor)
+    used_filenames = get_referenced_filenames(cursor)
 
-    # 콘텐츠 내 이미지 참조 확인 (activity_posts)
-    cursor.execute("SELECT COUNT(*) FROM activity_posts WHERE content LIKE ?", (f'%/uploads/{filename}%',))
-    if cursor.fetchone()[0] > 0:
-        return True
+    cursor.execute("SELECT id, filename, original_filename, size FROM files ORDER BY id")
+    total = 0
+    orphan_files = []
+    for file_id, filename, original_filename, size in cursor:
+        total += 1
+        if file_id in used_ids or filename in used_filenames:
+            continue
+        orphan_files.append({
+            'id': file_id,
+            'filename': filename,
+            'original_filename': original_filename,
+            'size': size if size else 0
+        })
 
-    return False
+    return total, orphan_files
 
 
 def sync_missing_files():
@@ -145,7 +192,8 @@ def sync_missing_files():
             print(f"  오류 - {filepath.name}: {e}")
             skipped += 1
 
-    # 커밋
+    # 저장 용량 집계값 갱신 후 커밋
+    sync_storage_usage(cursor)
     conn.commit()
 
     print(f"\n완료!")
@@ -165,27 +213,12 @@ def check_orphan_files():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # 모든 파일 가져오기
-    cursor.execute("SELECT id, filename, original_filename, size FROM files ORDER BY id")
-    all_files = cursor.fetchall()
-
-    print(f"총 파일 수: {len(all_files)}개\n")
     print("고아 파일 (어디서도 사용되지 않는 파일) 확인 중...\n")
 
-    orphan_files = []
-    total_orphan_size = 0
-
-    for file_id, filename, original_filename, size in all_files:
-        is_used = check_file_usage(cursor, file_id, filename)
+    total_files, orphan_files = find_orphan_files(cursor)
+    total_orphan_size = sum(f['size'] for f in orphan_files)
 
-        if not is_used:
-            orphan_files.append({
-                'id': file_id,
-                'filename': filename,
-                'original_filename': original_filename,
-                'size': size if size else 0
-            })
-            total_orphan_size += size if size else 0
+    print(f"총 파일 수: {total_files}개\n")
 
     if orphan_files:
         print(f"발견된 고아 파일: {len(orphan_files)}개")
@@ -205,8 +238,8 @@ def check_orphan_files():
 
     print("\n" + "-" * 80)
     print("\n📊 요약:")
-    print(f"  - 전체 파일: {len(all_files)}개")
-    print(f"  - 사용 중인 파일: {len(all_files) - len(orphan_files)}개")
+    print(f"  - 전체 파일: {total_files}개")
+    print(f"  - 사용 중인 파일: {total_files - len(orphan_files)}개")
     print(f"  - 고아 파일: {len(orphan_files)}개")
 
     if orphan_files:
@@ -225,27 +258,13 @@ def remove_orphan_files():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # 모든 파일 가져오기
-    cursor.execute("SELECT id, filename, original_filename, size FROM files ORDER BY id")
-    all_files = cursor.fetchall()
-
-    print(f"총 파일 수: {len(all_files)}개\n")
     print("고아 파일 찾는 중...\n")
 
-    orphan_files = []
-    total_orphan_size = 0
-
-    for file_id, filename, original_filename, size in all_files:
-        is_used = check_file_usage(cursor, file_id, filename)
+    # 확인(check)과 같은 기준으로 찾음
+    total_files, orphan_files = find_orphan_files(cursor)
+    total_orphan_size = sum(f['size'] for f in orphan_files)
 
-        if not is_used:
-            orphan_files.append({
-                'id': file_id,
-                'filename': filename,
-                'original_filename': original_filename,
-                'size': size if size else 0
-            })
-            total_orphan_size += size if size else 0
+    print(f"총 파일 수: {total_files}개\n")
 
     if not orphan_files:
         print("✅ 고아 파일 없음! 모든 파일이 사용 중입니다.")
@@ -293,7 +312,8 @@ def remove_orphan_files():
             print(f"✗ 실패: {filename} - {e}")
             failed_count += 1
 
-    # 커밋
+    # 저장 용량 집계값 갱신 후 커밋
+    sync_storage_usage(cursor)
     conn.commit()
 
     print("\n" + "=" * 80)
@@ -301,9 +321,178 @@ def remove_orphan_files():
     print(f"  - 삭제된 파일: {deleted_count}개")
     print(f"  - 절약된 공간: {deleted_size / (1024*1024):.2f} MB")
     print(f"  - 실패한 파일: {failed_count}개")
-    print(f"  - 남은 파일: {len(all_files) - deleted_count}개")
+    print(f"  - 남은 파일: {total_files - deleted_count}개")
+
+    conn.close()
+
+
+def iter_db_files(conn, page_size=RECONCILE_PAGE_SIZE):
+    """
+    files 테이블을 파일명 순으로 페이지 단위 조회 (키셋 페이지네이션)
+    페이지 사이에 INSERT/DELETE 해도 안전하도록 커서를 열어두지 않음
+    Yields: (id, filename, size)
+    """
+    last_filename, last_id = '', 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, filename, size FROM files
+            WHERE filename > ? OR (filename = ? AND id > ?)
+            ORDER BY filename, id
+            LIMIT ?
+        """, (last_filename, last_filename, last_id, page_size)).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last_id, last_filename = rows[-1][0], rows[-1][1]
+
+
+class ReconcileFixer:
+    """R2 대조 결과를 배치로 DB에 반영"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        cursor = conn.cursor()
+        # 참조 중인 파일은 객체가 없어도 행을 지우지 않음 (콘텐츠 쪽 확인 필요)
+        self.used_ids = get_referenced_file_ids(cursor)
+        self.used_filenames = get_referenced_filenames(cursor)
+        self.inserts = []
+        self.deletes = []
+        self.updates = []
+        self.skipped = []
+        self.applied = {'insert': 0, 'delete': 0, 'update': 0}
+
+    def insert(self, obj):
+        filename = obj['Key']
+        created_at = obj['LastModified'].replace(tzinfo=None)
+        self.inserts.append((
+            filename,
+            filename,
+            mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            obj['Size'],
+            str(created_at)
+        ))
+        self._maybe_flush()
+
+    def delete(self, file_id, filename):
+        if file_id in self.used_ids or filename in self.used_filenames:
+            self.skipped.append(filename)
+            return
+        self.deletes.append((file_id,))
+        self._maybe_flush()
+
+    def update_size(self, file_id, size):
+        self.updates.append((size, file_id))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if max(len(self.inserts), len(self.deletes), len(self.updates)) >= RECONCILE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        cursor = self.conn.cursor()
+        if self.inserts:
+            cursor.executemany("""
+                INSERT INTO files (filename, original_filename, mimetype, size, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, self.inserts)
+            self.applied['insert'] += len(self.inserts)
+            self.inserts = []
+        if self.deletes:
+            cursor.executemany("DELETE FROM files WHERE id = ?", self.deletes)
+            self.applied['delete'] += len(self.deletes)
+            self.deletes = []
+        if self.updates:
+            cursor.executemany("UPDATE files SET size = ? WHERE id = ?", self.updates)
+            self.applied['update'] += len(self.updates)
+            self.updates = []
+
+
+def reconcile_r2(fix=False):
+    """
+    R2 버킷과 files 테이블 대조
+    - 버킷 목록(키 순)과 DB(파일명 순)를 정렬 병합 → 메모리는 페이지 크기만큼만 사용
+    - 객체만 있는 파일 / 행만 있는 파일 / 크기 불일치 보고
+    - fix=True 이면 배치 INSERT/DELETE/UPDATE로 DB 보정 (참조 중인 행은 삭제하지 않음)
+    """
+    from r2_storage import iter_r2_objects
+
+    print("\n" + "=" * 80)
+    print("5. R2 ↔ DB 대조" + (" (보정)" if fix else ""))
+    print("=" * 80)
+
+    conn = sqlite3.connect(DB_PATH)
+    fixer = ReconcileFixer(conn) if fix else None
+
+    samples = {'missing_row': [], 'missing_object': [], 'size_mismatch': []}
+    counts = {'missing_row': 0, 'missing_object': 0, 'size_mismatch': 0, 'ok': 0}
+
+    def report(kind, text):
+        counts[kind] += 1
+        if len(samples[kind]) < 20:
+            samples[kind].append(text)
+
+    objects = iter_r2_objects()
+    rows = iter_db_files(conn)
+    obj = next(objects, None)
+    row = next(rows, None)
+    obj_matched = False  # 같은 파일명 행이 여러 개일 때 객체 중복 보고 방지
+
+    while obj is not None or row is not None:
+        if row is None or (obj is not None and obj['Key'] < row[1]):
+            # 버킷에만 있는 객체
+            if not obj_matched:
+                report('missing_row', f"{obj['Key']} ({obj['Size']} bytes)")
+                if fixer:
+                    fixer.insert(obj)
+            obj = next(objects, None)
+            obj_matched = False
+        elif obj is None or row[1] < obj['Key']:
+            # DB에만 있는 행
+            file_id, filename, _ = row
+            report('missing_object', f"ID {file_id}: {filename}")
+            if fixer:
+                fixer.delete(file_id, filename)
+            row = next(rows, None)
+        else:
+            file_id, filename, size = row
+            if size != obj['Size']:
+                report('size_mismatch', f"ID {file_id}: {filename} (DB {size} / R2 {obj['Size']})")
+                if fixer:
+                    fixer.update_size(file_id, obj['Size'])
+            else:
+                counts['ok'] += 1
+            obj_matched = True
+            row = next(rows, None)
+
+    titles = {
+        'missing_row': 'DB에 없는 R2 객체',
+        'missing_object': 'R2에 없는 DB 행',
+        'size_mismatch': '크기 불일치',
+    }
+    for kind, title in titles.items():
+        print(f"\n{title}: {counts[kind]}개")
+        for text in samples[kind]:
+            print(f"  - {text}")
+        if counts[kind] > len(samples[kind]):
+            print(f"  ... 외 {counts[kind] - len(samples[kind])}개 더 있음")
+
+    print(f"\n일치: {counts['ok']}개")
+
+    if fixer:
+        fixer.flush()
+        sync_storage_usage(conn.cursor())
+        conn.commit()
+        print("\n📊 보정 완료:")
+        print(f"  - 등록: {fixer.applied['insert']}개")
+        print(f"  - 삭제: {fixer.applied['delete']}개")
+        print(f"  - 크기 수정: {fixer.applied['update']}개")
+        if fixer.skipped:
+            print(f"  - 사용 중이라 삭제하지 않음: {len(fixer.skipped)}개")
+    elif counts['missing_row'] or counts['missing_object'] or counts['size_mismatch']:
+        print("\n💡 DB를 보정하려면: python3 file_manager.py reconcile --fix")
 
     conn.close()
+    return counts
 
 
 def show_menu():
@@ -315,6 +504,7 @@ def show_menu():
     print("2. 고아 파일 확인")
     print("3. 고아 파일 제거")
     print("4. 전체 실행 (1 → 2)")
+    print("5. R2 ↔ DB 대조")
     print("0. 종료")
     print("=" * 80)
 
@@ -327,7 +517,9 @@ def main():
         print(f"   현재 디렉토리: {os.getcwd()}")
         sys.exit(1)
 
-    if not os.path.exists(UPLOADS_DIR):
+    # R2 대조는 로컬 업로드 폴더 없이도 실행
+    reconcile_only = len(sys.argv) > 1 and sys.argv[1] in ('5', 'reconcile')
+    if not reconcile_only and not os.path.exists(UPLOADS_DIR):
         print(f"❌ 오류: {UPLOADS_DIR} 디렉토리를 찾을 수 없습니다.")
         sys.exit(1)
 
@@ -344,6 +536,8 @@ def main():
         elif option == '4' or option == 'all':
             sync_missing_files()
             check_orphan_files()
+        elif option == '5' or option == 'reconcile':
+            reconcile_r2(fix='--fix' in sys.argv[2:])
         else:
             print(f"❌ 알 수 없는 옵션: {option}")
             print("\n사용법:")
@@ -353,6 +547,7 @@ def main():
             print("  2 또는 check  - 고아 파일 확인")
             print("  3 또는 remove - 고아 파일 제거")
             print("  4 또는 all    - 전체 실행 (1 → 2)")
+            print("  5 또는 reconcile [--fix] - R2 ↔ DB 대조 (--fix: DB 보정)")
         return
 
     # 대화형 모드
@@ -371,6 +566,12 @@ def main():
             orphan_count = check_orphan_files()
             if orphan_count > 0:
                 print("\n고아 파일을 제거하려면 옵션 3을 선택하세요.")
+        elif choice == '5':
+            counts = reconcile_r2()
+            if counts['missing_row'] or counts['missing_object'] or counts['size_mismatch']:
+                response = input("\nDB를 보정하시겠습니까? (yes/no): ").strip().lower()
+                if response in ['yes', 'y']:
+                    reconcile_r2(fix=True)
         elif choice == '0':
             print("\n종료합니다.")
             break
@@ -0,0 +1,173 @@
+"""
+SSG 페이지 HTML 최소화 (build.py save_html 에서 사용)
+
+템플릿 들여쓰기/줄바꿈과 주석을 걷어내 페이지 크기를 줄인다. 화면 결과가 바뀌지 않는 범위만 손댄다.
+
+- 공백: 줄마다 들여쓰기/끝 공백과 빈 줄을 지우고, 블록 태그(div, p, li, section …) 앞 줄바꿈과
+  여러 줄 태그의 '>' 앞 줄바꿈을 지운다 (남은 줄바꿈은 공백 한 칸과 같아 인라인 요소 사이 띄어쓰기 유지)
+- 그대로 두는 영역: <pre>, <textarea>, whitespace-pre* 클래스/white-space:pre* 스타일 요소
+- 주석: 보호 영역 밖의 주석만 제거 (빌드가 나중에 교체하는 자리 표시 주석 KEEP_COMMENTS, 조건부 주석은 유지)
+- 인라인 <style>: 주석/공백 제거
+- 인라인 <script>: 주석/들여쓰기/빈 줄 제거 (줄바꿈은 남겨 세미콜론 자동 삽입에 영향 없음)
+  JSON-LD 등 다른 type 의 스크립트는 그대로
+
+모든 페이지에 같은 헤더/푸터 스크립트·스타일이 들어가므로 블록 단위로 결과를 캐시한다.
+"""
+import re
+from functools import lru_cache
+
+# 남겨야 하는 주석 (webfonts.py 가 빌드 후 교체 - 증분 빌드에서 다시 그리지 않은 페이지도 교체)
+KEEP_COMMENTS = ('<!-- webfonts -->', '<!-- /webfonts -->')
+
+# 앞뒤 공백이 화면에 영향을 주지 않는 태그
+# (svg, iframe, use 처럼 글자 사이에 놓이는 인라인 요소는 제외 - 'Download\n<svg>' 의 띄어쓰기 유지,
+#  svg 안에서만 쓰는 도형 요소 사이 공백은 그려지지 않으므로 포함)
+BLOCK_TAGS = (
+    'html|head|body|meta|link|title|base|script|style|noscript|template|'
+    'div|p|ul|ol|li|dl|dt|dd|nav|header|footer|main|section|article|aside|'
+    'h[1-6]|hr|br|table|thead|tbody|tfoot|tr|th|td|caption|colgroup|col|'
+    'form|fieldset|legend|figure|figcaption|blockquote|details|summary|'
+    'option|optgroup|dialog|path|circle|rect|line|polyline|polygon|g|defs'
+)
+# 공백을 그대로 두거나 따로 최소화하는 영역 + 주석 (나머지는 줄 단위 문자열 처리 + 정규식 치환만 해서 빠름)
+# 주석도 같은 패턴으로 찾아야 <script> 안 문자열의 '<!--' 는 그대로 두고, 주석 안의 '<script>' 는 무시한다
+# 패턴이 '<' 로 시작해야 정규식 엔진이 '<' 위치만 훑는다 (그룹으로 감싸면 전체 문자를 훑어 10배 느림)
+_PROTECTED = r'''<(?:
+    (?P<comment>!--.*?-->)[ \t]*
+  | (?P<rawtag>pre|textarea)\b.*?</(?P=rawtag)\s*>{pre_styled}
+  | (?P<scriptopen>script\b[^>]*>)(?P<scriptbody>.*?)</script\s*>
+  | (?P<styleopen>style\b[^>]*>)(?P<stylebody>.*?)</style\s*>
+)'''
+# whitespace-pre* 클래스/white-space:pre* 스타일 요소 - 태그마다 속성을 훑어야 해서 느리므로 표시가 있는 페이지만
+_PRE_STYLED = r'''
+  | (?P<pretag>[a-zA-Z][a-zA-Z0-9]*)\b[^>]*(?:whitespace-pre|white-space:\s*pre)[^>]*>.*?</(?P=pretag)\s*>'''
+PROTECTED = re.compile(_PROTECTED.format(pre_styled=''), re.S | re.X)
+PROTECTED_PRE_STYLED = re.compile(_PROTECTED.format(pre_styled=_PRE_STYLED), re.S | re.X)
+PRE_STYLE_MARK = re.compile(r'whitespace-pre|white-space:\s*pre')
+
+# 블록 태그(DOCTYPE, 남겨 둔 주석 포함) 앞 줄바꿈
+BEFORE_BLOCK = re.compile(rf'\n(?=<(?:!|/?(?:{BLOCK_TAGS})[\s/>]))')
+# 여러 줄에 걸친 태그의 '>' 앞 줄바꿈
+TAG_END = re.compile(r'\n(?=/?>)')
+WHITESPACE = re.compile(r'[ \t\r\n\f]+')
+
+# 실행되는 스크립트 type (그 밖의 type 은 데이터로 보고 그대로 둔다)
+SCRIPT_TYPE = re.compile(r'''\btype\s*=\s*["']?([^"'\s>]+)''', re.I)
+JS_TYPES = {'text/javascript', 'application/javascript', 'module'}
+
+CSS_STRING = r'''(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')'''
+CSS_COMMENT = re.compile(CSS_STRING + r'|/\*.*?\*/', re.S)
+CSS_TOKEN = re.compile(CSS_STRING + r'''
+  | (?P<last>\s*;\s*(?=}))                  # 블록 끝 세미콜론
+  | \s*(?P<symbol>[{};,>])\s*               # 앞뒤 공백이 필요 없는 기호
+  | (?P<colon>:)\s+                          # 선언의 ':' 뒤 공백 (':' 앞 공백은 선택자 의미가 있어 유지)
+  | (?P<space>\s+)
+''', re.S | re.X)
+
+JS_TOKEN = re.compile(r'''
+    (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`)
+  | (?P<regex>(?<=[(,=:\[!&|?{};])[ \t]*/(?![*/])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>[ \t]*/\*.*?\*/[ \t]*)
+  | (?P<newline>[ \t]*\n[ \t\n]*)
+  | (?P<space>[ \t]+)
+''', re.S | re.X)
+
+
+@lru_cache(maxsize=256)
+def minify_css(css):
+    """CSS 주석/공백 제거"""
+    def replace(match):
+        kind = match.lastgroup
+        if kind == 'string':
+            return match.group(0)
+        if kind == 'last':
+            return ''
+        if kind in ('symbol', 'colon'):
+            return match.group(kind)
+        return ' '
+    css = CSS_COMMENT.sub(lambda match: match.group('string') or '', css)
+    return CSS_TOKEN.sub(replace, css).strip()
+
+
+@lru_cache(maxsize=256)
+def minify_js(source):
+    """JS 주석/들여쓰기/빈 줄 제거 (문자열·정규식 리터럴은 그대로)"""
+    def replace(match):
+        kind = match.lastgroup
+        if kind in ('string', 'regex'):
+            return match.group(0)
+        if kind == 'line_comment':
+            return ''
+        if kind == 'block_comment':
+            return '\n' if '\n' in match.group(0) else ' '
+        if kind == 'newline':
+            return '\n'
+        return ' '
+    lines = JS_TOKEN.sub(replace, source).split('\n')
+    return '\n'.join(line.strip() for line in lines if line.strip())
+
+
+def _keep_comment(comment):
+    return comment in KEEP_COMMENTS or comment.startswith('<!--[if')
+
+
+def _minify_text(html):
+    """
+    보호 영역 밖: 줄마다 앞뒤 공백(들여쓰기) 제거, 빈 줄 제거 → 블록 태그 앞/태그 끝 줄바꿈 제거
+
+    줄바꿈은 공백 한 칸과 같으므로 남겨 두고, 인라인 요소 사이 띄어쓰기도 그대로 유지된다.
+    """
+    text = '\n'.join(filter(None, [line.strip(' \t\r\f') for line in html.split('\n')]))
+    # 앞뒤 공백은 이웃한 보호 영역(<textarea> 등)과의 띄어쓰기일 수 있으므로 한 칸 남김
+    if not text:
+        return '\n' if html else ''
+    if html[0] in ' \t\r\n\f':
+        text = '\n' + text
+    if html[-1] in ' \t\r\n\f':
+        text += '\n'
+    text = BEFORE_BLOCK.sub('', text)
+    return TAG_END.sub('', text)
+
+
+def _minify_protected(match):
+    if match.group('scriptopen'):
+        opening, body = '<' + WHITESPACE.sub(' ', match.group('scriptopen')), match.group('scriptbody')
+        script_type = SCRIPT_TYPE.search(opening)
+        if body.strip() and (not script_type or script_type.group(1).lower() in JS_TYPES):
+            body = minify_js(body)
+        return opening + body + '</script>'
+    if match.group('styleopen'):
+        return '<' + WHITESPACE.sub(' ', match.group('styleopen')) + minify_css(match.group('stylebody')) + '</style>'
+    return match.group(0)
+
+
+def minify_html(html):
+    """
+    HTML 최소화
+
+    Args:
+        html: 렌더링된 페이지 HTML
+
+    Returns:
+        str: 최소화된 HTML
+    """
+    protected = PROTECTED_PRE_STYLED if PRE_STYLE_MARK.search(html) else PROTECTED
+    parts = []
+    text = []       # 보호 영역 사이 텍스트 (지운 주석 앞뒤는 이어 붙여 한 번에 처리)
+    position = 0
+    for match in protected.finditer(html):
+        text.append(html[position:match.start()])
+        position = match.end()
+        comment = match.group('comment')
+        if comment and not _keep_comment('<' + comment):
+            continue
+        segment = _minify_text(''.join(text))
+        text = []
+        if match.group('rawtag') != 'textarea' and not match.groupdict().get('pretag'):
+            segment = segment.rstrip('\n')   # <script>/<style>/<pre>/남기는 주석 앞 줄바꿈
+        parts.append(segment)
+        parts.append('<' + comment if comment else _minify_protected(match))
+    text.append(html[position:])
+    parts.append(_minify_text(''.join(text)))
+    return ''.join(parts).strip()
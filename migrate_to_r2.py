@@ -1,66 +1,219 @@
 """
 기존 dist/uploads/ 파일을 Cloudflare R2로 마이그레이션
-사용법: python3 migrate_to_r2.py
+사용법:
+    python3 migrate_to_r2.py                # 병렬 마이그레이션 (기본 8 스레드)
+    python3 migrate_to_r2.py --workers 16   # 스레드 수 지정
+    python3 migrate_to_r2.py --dry-run      # 업로드 없이 계획만 출력
+    python3 migrate_to_r2.py --reset        # 체크포인트 무시하고 처음부터 비교
+
+- 버킷에 같은 키가 있으면 크기/ETag(MD5)를 비교해 같을 때만 건너뜀
+- 완료한 파일은 체크포인트 파일에 기록 → 중단 후 다시 실행하면 이어서 진행
 """
 import os
+import sys
+import json
+import hashlib
+import argparse
 import mimetypes
-from r2_storage import upload_to_r2, get_r2_client
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from boto3.s3.transfer import TransferConfig
+from r2_storage import get_r2_client, iter_r2_objects
 from config import Config
 
+CHECKPOINT_FILE = os.path.join(Config.BASE_DIR, 'logs', 'migrate_to_r2.checkpoint.json')
+CHECKPOINT_EVERY = 50  # N개 완료마다 체크포인트 저장
+
+# 멀티파트 업로드 기준 (이보다 작은 파일은 단일 PUT → ETag가 MD5와 같아 재실행 시 비교 가능)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    use_threads=False  # 파일 단위로 이미 병렬 처리
+)
+
+
+def file_md5(filepath, chunk_size=1024 * 1024):
+    """파일 MD5 (스트리밍 계산)"""
+    digest = hashlib.md5()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_same_object(filepath, size, remote):
+    """로컬 파일과 R2 객체가 같은지 확인 (크기 → ETag 순으로 비교)"""
+    if remote['Size'] != size:
+        return False
+    etag = remote['ETag'].strip('"')
+    # 멀티파트 업로드 객체의 ETag는 MD5가 아님 ("<hash>-<파트 수>") → 크기만 비교
+    if '-' in etag:
+        return True
+    return file_md5(filepath) == etag
+
+
+class Checkpoint:
+    """완료한 파일 기록 (파일명 → [크기, 수정시각])"""
+
+    def __init__(self, path, reset=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = {}
+        self.pending = 0
+        if not reset and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.done = json.load(f)
+
+    def is_done(self, filename, stat):
+        return self.done.get(filename) == [stat.st_size, int(stat.st_mtime)]
 
-def migrate():
+    def mark(self, filename, stat):
+        with self.lock:
+            self.done[filename] = [stat.st_size, int(stat.st_mtime)]
+            self.pending += 1
+            if self.pending >= CHECKPOINT_EVERY:
+                self._save()
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.done, f)
+        os.replace(tmp_path, self.path)
+        self.pending = 0
+
+
+def plan_migration(uploads_dir, files, existing, checkpoint):
+    """
+    파일별 처리 방식 결정 (체크포인트는 읽기만 함 - dry-run 에서도 파일을 쓰지 않도록)
+    Returns: (업로드 대상 [(파일명, 사유)], R2와 동일 [(파일명, stat)], 체크포인트로 건너뜀 수)
+    """
+    to_upload = []
+    identical = []
+    resumed = 0
+
+    for filename in files:
+        filepath = os.path.join(uploads_dir, filename)
+        stat = os.stat(filepath)
+
+        if checkpoint.is_done(filename, stat):
+            resumed += 1
+            continue
+
+        remote = existing.get(filename)
+        if remote is None:
+            to_upload.append((filename, 'new'))
+        elif is_same_object(filepath, stat.st_size, remote):
+            identical.append((filename, stat))
+        else:
+            to_upload.append((filename, 'changed'))
+
+    return to_upload, identical, resumed
+
+
+def upload_one(r2, uploads_dir, filename):
+    """단일 파일 업로드 (디스크에서 스트리밍)"""
+    filepath = os.path.join(uploads_dir, filename)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    r2.upload_file(
+        filepath,
+        Config.R2_BUCKET_NAME,
+        filename,
+        ExtraArgs={'ContentType': content_type},
+        Config=TRANSFER_CONFIG
+    )
+    return os.stat(filepath)
+
+
+def migrate(workers=8, dry_run=False, reset=False):
     uploads_dir = os.path.join(Config.BASE_DIR, 'dist', 'uploads')
 
     if not os.path.exists(uploads_dir):
         print("dist/uploads/ 폴더가 없습니다.")
         return
 
-    files = [f for f in os.listdir(uploads_dir) if os.path.isfile(os.path.join(uploads_dir, f))]
+    files = [f for f in os.listdir(uploads_dir)
+             if not f.startswith('.') and os.path.isfile(os.path.join(uploads_dir, f))]
 
     if not files:
         print("마이그레이션할 파일이 없습니다.")
         return
 
-    print(f"총 {len(files)}개 파일 마이그레이션 시작...")
+    print(f"총 {len(files)}개 파일 확인 중...")
 
-    # R2에 이미 있는 파일 확인
+    # R2에 이미 있는 파일 (크기/ETag 비교용)
     r2 = get_r2_client()
-    existing = set()
+    existing = {}
     try:
-        paginator = r2.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=Config.R2_BUCKET_NAME):
-            for obj in page.get('Contents', []):
-                existing.add(obj['Key'])
-    except Exception:
-        pass
+        for obj in iter_r2_objects(r2):
+            existing[obj['Key']] = {'Size': obj['Size'], 'ETag': obj['ETag']}
+    except Exception as e:
+        print(f"R2 목록 조회 실패 (전체 업로드로 진행): {e}")
+
+    checkpoint = Checkpoint(CHECKPOINT_FILE, reset=reset)
+    to_upload, identical, resumed = plan_migration(uploads_dir, files, existing, checkpoint)
+    skipped = len(identical)
+
+    total_bytes = sum(os.path.getsize(os.path.join(uploads_dir, f)) for f, _ in to_upload)
+    new_count = sum(1 for _, reason in to_upload if reason == 'new')
+
+    print(f"\n계획: 신규 {new_count}, 변경 {len(to_upload) - new_count}, "
+          f"동일(건너뜀) {skipped}, 체크포인트(건너뜀) {resumed}")
+    print(f"전송 예정 용량: {total_bytes / (1024 * 1024):.1f} MB")
+
+    if dry_run:
+        for filename, reason in to_upload[:50]:
+            print(f"  - [{reason}] {filename}")
+        if len(to_upload) > 50:
+            print(f"  ... 외 {len(to_upload) - 50}개")
+        print("\n(dry-run: 업로드하지 않았습니다)")
+        return
+
+    # R2와 동일한 파일은 다음 실행에서 비교하지 않도록 체크포인트에 기록
+    for filename, stat in identical:
+        checkpoint.mark(filename, stat)
+    checkpoint.save()
 
     success = 0
-    skipped = 0
     failed = 0
 
-    for filename in files:
-        if filename.startswith('.'):
-            continue
+    print(f"\n{workers}개 스레드로 업로드 시작...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(upload_one, r2, uploads_dir, filename): filename
+            for filename, _ in to_upload
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                stat = future.result()
+                checkpoint.mark(filename, stat)
+                success += 1
+                print(f"  ✓ {filename} ({stat.st_size} bytes)")
+            except Exception as e:
+                failed += 1
+                print(f"  ✗ {filename}: {e}")
 
-        if filename in existing:
-            skipped += 1
-            continue
+    checkpoint.save()
 
-        filepath = os.path.join(uploads_dir, filename)
-        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    print(f"\n완료: 성공 {success}, 건너뜀 {skipped + resumed}, 실패 {failed}")
+    if failed:
+        print("실패한 파일은 다시 실행하면 이어서 업로드합니다.")
 
-        try:
-            with open(filepath, 'rb') as f:
-                file_data = f.read()
-            upload_to_r2(file_data, filename, content_type)
-            success += 1
-            print(f"  ✓ {filename} ({len(file_data)} bytes)")
-        except Exception as e:
-            failed += 1
-            print(f"  ✗ {filename}: {e}")
 
-    print(f"\n완료: 성공 {success}, 건너뜀 {skipped}, 실패 {failed}")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='dist/uploads → R2 마이그레이션')
+    parser.add_argument('--workers', type=int, default=8, help='동시 업로드 스레드 수 (기본 8)')
+    parser.add_argument('--dry-run', action='store_true', help='업로드 없이 계획만 출력')
+    parser.add_argument('--reset', action='store_true', help='체크포인트 무시하고 처음부터 비교')
+    args = parser.parse_args()
 
+    if args.workers < 1:
+        print("--workers는 1 이상이어야 합니다.")
+        sys.exit(1)
 
-if __name__ == '__main__':
-    migrate()
+    migrate(workers=args.workers, dry_run=args.dry_run, reset=args.reset)
@@ -5,6 +5,8 @@ from datetime import datetime
 import re
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
@@ -26,6 +28,46 @@ class DisplayOrderMixin:
     is_active = db.Column(db.Boolean, default=True)
 
 
+# ============================================================================
+# 스키마 업그레이드 (마이그레이션 도구 없이 신규 테이블/컬럼 반영)
+# ============================================================================
+
+def upgrade_schema():
+    """
+    기존 DB에 모델의 신규 테이블/컬럼/인덱스 추가
+    - 신규 테이블: create_all()로 생성
+    - 신규 컬럼: ALTER TABLE ... ADD COLUMN (기존 행은 NULL 또는 server_default)
+    - 신규 인덱스: 모든 테이블에 checkfirst 로 생성 (컬럼이 이미 있던 테이블 포함)
+    - 저장 용량 집계 행(storage_usage)이 없으면 files 합계로 생성
+    Returns: 추가된 컬럼 목록 ['table.column', ...]
+    """
+    db.create_all()
+
+    added = []
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {col['name'] for col in inspector.get_columns(table.name)}
+        missing = [col for col in table.columns if col.name not in existing]
+        if missing:
+            with db.engine.begin() as conn:
+                for col in missing:
+                    col_type = col.type.compile(dialect=db.engine.dialect)
+                    ddl = f'ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}'
+                    if col.server_default is not None:
+                        ddl += f' DEFAULT {col.server_default.arg}'
+                    conn.execute(db.text(ddl))
+                    added.append(f'{table.name}.{col.name}')
+
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    if db.session.get(StorageUsage, 1) is None:
+        StorageUsage.reconcile()
+        db.session.commit()
+
+    return added
+
+
 # ============================================================================
 # 0. 관리자 계정
 # ============================================================================
@@ -83,6 +125,8 @@ class File(db.Model):
     original_filename = db.Column(db.String(255), nullable=False)  # 원본 파일명
     mimetype = db.Column(db.String(100))
     size = db.Column(db.Integer)  # bytes
+    sha256 = db.Column(db.String(64), index=True)  # 내용 해시 (중복 업로드 재사용)
+    ref_count = db.Column(db.Integer, default=0)   # 이 파일을 쓰는 역참조 수 (file_references, flush 때 갱신)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
@@ -99,56 +143,10 @@ class File(db.Model):
         return self.mimetype and self.mimetype.startswith('image/')
 
     def is_used(self):
-        """파일이 게시물이나 다른 곳에서 사용 중인지 확인"""
-        # notice_attachments 연결 테이블 확인
-        notice_attachment = db.session.execute(
-            db.text("SELECT 1 FROM notice_attachments WHERE file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if notice_attachment:
-            return True
-
-        # activity_attachments 연결 테이블 확인
-        activity_attachment = db.session.execute(
-            db.text("SELECT 1 FROM activity_attachments WHERE file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if activity_attachment:
-            return True
-
-        # ActivityPhoto에서 사용 확인
-        activity_photo = db.session.execute(
-            db.text("SELECT 1 FROM activity_photos WHERE file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if activity_photo:
-            return True
-
-        # ActivityPost 썸네일 확인
-        activity_post = db.session.execute(
-            db.text("SELECT 1 FROM activity_posts WHERE thumbnail_file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if activity_post:
-            return True
-
-        # BusinessArea 사진 확인
-        business_area = db.session.execute(
-            db.text("SELECT 1 FROM business_areas WHERE photo_file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if business_area:
-            return True
-
-        # Newsletter PDF 확인
-        newsletter = db.session.execute(
-            db.text("SELECT 1 FROM newsletters WHERE pdf_file_id = :file_id LIMIT 1"),
-            {'file_id': self.id}
-        ).first()
-        if newsletter:
-            return True
-
-        return False
+        """파일이 게시물이나 다른 곳에서 사용 중인지 확인 (file_references 인덱스 조회)"""
+        return db.session.query(
+            FileReference.query.filter_by(file_id=self.id).exists()
+        ).scalar()
 
     def to_dict(self):
         return {
@@ -161,6 +159,123 @@ class File(db.Model):
         }
 
 
+class StorageUsage(db.Model):
+    """
+    업로드 파일 전체 용량 집계 (단일 레코드, id=1)
+    File 추가/삭제 시 같은 트랜잭션에서 증감 → 용량 확인 시 SUM 대신 1행 조회
+    """
+    __tablename__ = 'storage_usage'
+
+    id = db.Column(db.Integer, primary_key=True)
+    total_bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def get_total(cls):
+        """현재 사용 용량 (bytes), 집계 행이 아직 없으면 files 합계 (조회만 하고 쓰지 않음)"""
+        total = db.session.query(cls.total_bytes).filter_by(id=1).scalar()
+        if total is None:
+            total = db.session.query(db.func.coalesce(db.func.sum(File.size), 0)).scalar()
+        return total
+
+    @classmethod
+    def reconcile(cls):
+        """
+        files 테이블 실제 합계로 집계값 재설정 (커밋은 호출자가 처리)
+        Returns: (이전 값, 재계산 값) - 이전 값은 집계 행이 없으면 None
+        """
+        before = db.session.query(cls.total_bytes).filter_by(id=1).scalar()
+        actual = db.session.query(db.func.coalesce(db.func.sum(File.size), 0)).scalar()
+
+        usage = db.session.get(cls, 1)
+        if usage is None:
+            usage = cls(id=1)
+            db.session.add(usage)
+        usage.total_bytes = actual
+        usage.updated_at = datetime.utcnow()
+        db.session.flush()
+        return before, actual
+
+
+class FileReference(db.Model):
+    """
+    파일 역참조 (어떤 콘텐츠가 어떤 파일을 쓰는지)
+    콘텐츠 저장(flush) 시 자동 갱신 → 사용 여부/고아 파일 확인을 인덱스 조회로 처리
+    """
+    __tablename__ = 'file_references'
+    __table_args__ = (
+        db.Index('ix_file_references_owner', 'owner_type', 'owner_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    file_id = db.Column(db.Integer, db.ForeignKey('files.id'), nullable=False, index=True)
+    owner_type = db.Column(db.String(30), nullable=False)  # notice, activity, newsletter, ...
+    owner_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)        # attachment, content, thumbnail, photo, pdf
+
+    OWNER_LABELS = {
+        'notice': '공지사항',
+        'activity': '활동후기',
+        'newsletter': '소식지',
+        'business_area': '사업분야',
+        'activity_photo': '활동사진',
+    }
+    KIND_LABELS = {
+        'attachment': '첨부',
+        'content': '본문',
+        'thumbnail': '썸네일',
+        'photo': '사진',
+        'pdf': 'PDF',
+    }
+
+    def __repr__(self):
+        return f'<FileReference file={self.file_id} {self.owner_type}#{self.owner_id} {self.kind}>'
+
+    @property
+    def label(self):
+        """표시용 이름 (예: 공지사항 #12 · 첨부)"""
+        owner = self.OWNER_LABELS.get(self.owner_type, self.owner_type)
+        kind = self.KIND_LABELS.get(self.kind, self.kind)
+        return f'{owner} #{self.owner_id} · {kind}'
+
+
+def _adjust_storage_usage(connection, delta):
+    """File 변경과 같은 커넥션(트랜잭션)에서 집계값 증감"""
+    if not delta:
+        return
+
+    # 집계 행이 없으면 0행 갱신으로 끝남 - upgrade_schema()/reconcile 이 files 합계로 만든다
+    # (여기서 합계로 만들면 같은 flush 의 다른 행이 after_insert 에서 한 번 더 더해짐)
+    table = StorageUsage.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == 1)
+        .values(total_bytes=table.c.total_bytes + delta, updated_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(File, 'after_insert')
+def _file_inserted(mapper, connection, target):
+    _adjust_storage_usage(connection, target.size or 0)
+
+
+@event.listens_for(File, 'after_delete')
+def _file_deleted(mapper, connection, target):
+    _adjust_storage_usage(connection, -(target.size or 0))
+
+
+@event.listens_for(File, 'before_update')
+def _file_updated(mapper, connection, target):
+    if not db.inspect(target).attrs.size.history.has_changes():
+        return
+    # 이전 값이 만료(expire)됐을 수 있으므로 UPDATE 전에 DB에서 직접 조회
+    table = File.__table__
+    old_size = connection.execute(
+        db.select(table.c.size).where(table.c.id == target.id)
+    ).scalar()
+    _adjust_storage_usage(connection, (target.size or 0) - (old_size or 0))
+
+
 # ============================================================================
 # 2. 사이트 기본 정보
 # ============================================================================
@@ -412,10 +527,11 @@ class HistorySection(db.Model):
     summary_title = db.Column(db.String(100))  # 요약 제목
     display_order = db.Column(db.Integer, default=0)
 
+    # selectin: 섹션 목록 조회 시 전체 항목을 IN 쿼리 한 번으로 함께 로딩 (섹션별 쿼리 방지)
     items = db.relationship(
         'HistoryItem',
         backref='section',
-        lazy='dynamic',
+        lazy='selectin',
         order_by='HistoryItem.display_order'
     )
 
@@ -631,6 +747,150 @@ class Newsletter(db.Model):
         }
 
 
+# ============================================================================
+# 파일 역참조 자동 갱신
+# ============================================================================
+
+UPLOAD_URL_PATTERN = re.compile(r'/uploads/([\w.-]+)')
+
+# 역참조 대상 모델 → owner_type
+REFERENCE_OWNER_TYPES = {
+    Notice: 'notice',
+    ActivityPost: 'activity',
+    Newsletter: 'newsletter',
+    BusinessArea: 'business_area',
+    ActivityPhoto: 'activity_photo',
+}
+
+
+def collect_file_references(obj):
+    """
+    콘텐츠 객체가 참조하는 파일 목록
+    Returns: (owner_type, {(file_id, kind)}, {(본문 내 파일명, kind)}) 또는 None (대상 모델 아님)
+    """
+    owner_type = REFERENCE_OWNER_TYPES.get(type(obj))
+    if owner_type is None:
+        return None
+
+    file_ids = set()
+    contents = []
+
+    if isinstance(obj, Notice):
+        file_ids.update((f.id, 'attachment') for f in obj.attachments)
+        contents.append(obj.content)
+    elif isinstance(obj, ActivityPost):
+        file_ids.update((f.id, 'attachment') for f in obj.attachments)
+        if obj.thumbnail_file_id:
+            file_ids.add((obj.thumbnail_file_id, 'thumbnail'))
+        contents.append(obj.content)
+    elif isinstance(obj, Newsletter):
+        if obj.pdf_file_id:
+            file_ids.add((obj.pdf_file_id, 'pdf'))
+        contents.append(obj.html_content)
+    elif isinstance(obj, BusinessArea):
+        if obj.photo_file_id:
+            file_ids.add((obj.photo_file_id, 'photo'))
+    elif isinstance(obj, ActivityPhoto):
+        if obj.file_id:
+            file_ids.add((obj.file_id, 'photo'))
+
+    filenames = set()
+    for content in contents:
+        if content:
+            filenames.update((name, 'content') for name in UPLOAD_URL_PATTERN.findall(content))
+
+    return owner_type, file_ids, filenames
+
+
+def _refresh_ref_counts(connection, file_ids=None):
+    """files.ref_count = 역참조 행 수 (file_ids 가 None 이면 전체)"""
+    files, refs = File.__table__, FileReference.__table__
+    count = db.select(db.func.count(refs.c.id)).where(refs.c.file_id == files.c.id).scalar_subquery()
+    update = files.update().values(ref_count=count)
+    if file_ids is not None:
+        if not file_ids:
+            return
+        update = update.where(files.c.id.in_(file_ids))
+    connection.execute(update)
+
+
+def _delete_owner_references(connection, owner_type, owner_id):
+    """소유 객체의 역참조 행 삭제 → 참조하던 파일 ID 집합"""
+    table = FileReference.__table__
+    owner = (table.c.owner_type == owner_type, table.c.owner_id == owner_id)
+    file_ids = {row[0] for row in connection.execute(db.select(table.c.file_id).where(*owner))}
+    connection.execute(table.delete().where(*owner))
+    return file_ids
+
+
+def _replace_file_references(connection, owner_type, owner_id, file_ids, filenames):
+    """
+    소유 객체의 역참조 행을 현재 상태로 교체
+    Returns: 참조가 바뀌었을 수 있는 파일 ID 집합 (이전 + 현재)
+    """
+    table = FileReference.__table__
+    affected = _delete_owner_references(connection, owner_type, owner_id)
+
+    refs = set(file_ids)
+    if filenames:
+        files = File.__table__
+        rows = connection.execute(
+            db.select(files.c.id, files.c.filename)
+            .where(files.c.filename.in_({name for name, _ in filenames}))
+        )
+        ids_by_name = {filename: file_id for file_id, filename in rows}
+        refs.update((ids_by_name[name], kind) for name, kind in filenames if name in ids_by_name)
+
+    if refs:
+        connection.execute(table.insert(), [
+            {'file_id': file_id, 'owner_type': owner_type, 'owner_id': owner_id, 'kind': kind}
+            for file_id, kind in refs
+        ])
+    return affected | {file_id for file_id, _ in refs}
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_file_references(session, flush_context):
+    """flush된 콘텐츠 변경을 같은 트랜잭션에서 file_references / files.ref_count 에 반영"""
+    table = FileReference.__table__
+    connection = session.connection()
+    affected = set()
+
+    for obj in session.deleted:
+        if isinstance(obj, File):
+            connection.execute(table.delete().where(table.c.file_id == obj.id))
+            continue
+        owner_type = REFERENCE_OWNER_TYPES.get(type(obj))
+        if owner_type:
+            affected |= _delete_owner_references(connection, owner_type, obj.id)
+
+    changed = list(session.new) + [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in changed:
+        collected = collect_file_references(obj)
+        if collected:
+            owner_type, file_ids, filenames = collected
+            affected |= _replace_file_references(connection, owner_type, obj.id, file_ids, filenames)
+
+    _refresh_ref_counts(connection, affected)
+
+
+def rebuild_file_references():
+    """
+    전체 file_references 재생성 (최초 도입 시 / 불일치 복구용, 커밋은 호출자가 처리)
+    Returns: 생성된 역참조 수
+    """
+    connection = db.session.connection()
+    connection.execute(FileReference.__table__.delete())
+
+    for model in REFERENCE_OWNER_TYPES:
+        for obj in model.query.all():
+            owner_type, file_ids, filenames = collect_file_references(obj)
+            _replace_file_references(connection, owner_type, obj.id, file_ids, filenames)
+    _refresh_ref_counts(connection)
+
+    return db.session.query(db.func.count(FileReference.id)).scalar()
+
+
 # ============================================================================
 # 5. 후원 신청
 # ============================================================================
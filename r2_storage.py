@@ -1,6 +1,7 @@
 """Cloudflare R2 스토리지 헬퍼"""
 import boto3
 from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from config import Config
 
 
@@ -27,6 +28,54 @@ def upload_to_r2(file_data, filename, content_type):
     )
 
 
+def generate_presigned_put(filename, content_type, content_length, checksum_sha256=None):
+    """
+    브라우저 직접 업로드용 presigned PUT URL 생성
+    Content-Type, Content-Length가 서명에 포함되므로 다른 형식/크기로는 업로드 불가
+    checksum_sha256(base64)을 주면 R2가 업로드 내용의 해시 일치 여부도 검증
+    """
+    params = {
+        'Bucket': Config.R2_BUCKET_NAME,
+        'Key': filename,
+        'ContentType': content_type,
+        'ContentLength': content_length
+    }
+    if checksum_sha256:
+        params['ChecksumSHA256'] = checksum_sha256
+
+    r2 = get_r2_client()
+    return r2.generate_presigned_url(
+        'put_object',
+        Params=params,
+        ExpiresIn=Config.R2_PRESIGNED_EXPIRES
+    )
+
+
+def head_r2_object(filename):
+    """R2 객체 메타데이터 조회 (없으면 None)"""
+    try:
+        r2 = get_r2_client()
+        return r2.head_object(
+            Bucket=Config.R2_BUCKET_NAME,
+            Key=filename
+        )
+    except ClientError:
+        return None
+
+
+def iter_r2_objects(r2=None):
+    """
+    버킷 객체를 list_objects_v2 페이지 단위로 순회 (키 오름차순)
+    전체 목록을 메모리에 올리지 않음
+    Yields: {'Key', 'Size', 'ETag', 'LastModified', ...}
+    """
+    r2 = r2 or get_r2_client()
+    paginator = r2.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=Config.R2_BUCKET_NAME):
+        for obj in page.get('Contents', []):
+            yield obj
+
+
 def delete_from_r2(filename):
     """R2에서 파일 삭제"""
     try:
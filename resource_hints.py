@@ -0,0 +1,118 @@
+"""
+페이지별 리소스 힌트 → Cloudflare Pages _headers 의 Link 규칙 (Early Hints)
+
+렌더링된 dist/ 페이지에서 빌드가 이미 정해 둔 핵심 리소스를 모은다.
+- <head> 의 <link rel="preload">(웹폰트 0번 조각), <link rel="preconnect">
+- 같은 사이트 스타일시트 (utilities.<hash>.css, fonts.<hash>.css) → rel=preload; as=style
+- 템플릿이 fetchpriority="high" 로 표시한 이미지 (메인 히어로 첫 사진, 목록 첫 카드들) → as=image
+
+모든 페이지에 공통인 힌트는 /* 규칙 하나로, 나머지는 페이지 경로 규칙으로 쓴다
+(Cloudflare 는 경로에 맞는 규칙의 헤더를 모두 합친다). 규칙 수/줄 길이는 Cloudflare 한도 안으로 자른다.
+페이지 파일을 다시 읽어 만들므로 증분 빌드에서 다시 그리지 않은 페이지의 힌트도 그대로 유지된다.
+"""
+import os
+import re
+import glob
+import html
+from urllib.parse import quote
+
+# Cloudflare Pages _headers 한도
+MAX_HEADER_RULES = 100
+MAX_LINE_LENGTH = 2000
+MAX_PAGE_HINTS = 4          # 페이지 규칙 하나에 넣을 Link 수 (Early Hints 는 앞쪽 몇 개만 의미 있음)
+
+URL_SAFE = ":/?#[]@!$&'()*+,;=%~"
+LINK_TAG = re.compile(r'<link\b[^>]*>', re.I)
+PRIORITY_IMAGE = re.compile(r'<img\b[^>]*\bfetchpriority=["\']?high\b[^>]*>', re.I)
+TAG_NAME = re.compile(r'^<[a-zA-Z]+')
+ATTRIBUTE = re.compile(r'''([a-zA-Z][\w-]*)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?''')
+
+
+def tag_attributes(tag):
+    """태그 속성 {이름: 값} (값 없는 속성은 '')"""
+    attrs = {}
+    for name, value in ATTRIBUTE.findall(TAG_NAME.sub('', tag[:-1])):
+        attrs[name.lower()] = html.unescape(value.strip('"\'')) if value else ''
+    return attrs
+
+
+def _link(url, rel, **params):
+    """Link 헤더 값 하나 (<url>; rel=...; as=...)"""
+    # 헤더 값에 못 쓰는 글자(공백, 한글 파일명 등)는 퍼센트 인코딩
+    parts = [f"<{quote(url, safe=URL_SAFE)}>", f'rel={rel}']
+    for name, value in params.items():
+        if value is True:
+            parts.append(name)
+        elif value:
+            parts.append(f'{name}={value}')
+    return '; '.join(parts)
+
+
+def page_hints(page):
+    """
+    페이지 HTML → Link 헤더 값 목록 (문서 순서, 중복 제거)
+
+    Args:
+        page: 렌더링된 페이지 HTML
+    """
+    head, _, body = page.partition('</head>')
+    hints = []
+    for tag in LINK_TAG.findall(head):
+        attrs = tag_attributes(tag)
+        rel, href = attrs.get('rel', '').lower(), attrs.get('href')
+        if not href:
+            continue
+        if rel == 'preload':
+            hints.append(_link(href, 'preload', **{
+                'as': attrs.get('as'),
+                'type': f'"{attrs["type"]}"' if attrs.get('type') else None,
+                'crossorigin': 'crossorigin' in attrs,
+            }))
+        elif rel == 'preconnect':
+            hints.append(_link(href, 'preconnect', crossorigin='crossorigin' in attrs))
+        elif rel == 'stylesheet' and href.startswith('/'):
+            hints.append(_link(href, 'preload', **{'as': 'style'}))
+    for tag in PRIORITY_IMAGE.findall(body):
+        src = tag_attributes(tag).get('src')
+        if src and not src.startswith('data:'):
+            hints.append(_link(src, 'preload', **{'as': 'image'}))
+    return [hint for i, hint in enumerate(hints)
+            if hint not in hints[:i] and len('  Link: ' + hint) <= MAX_LINE_LENGTH]
+
+
+def page_url(path):
+    """
+    dist 기준 경로 → 사이트 URL ('index.html' → '/', 'notice/index.html' → '/notice/',
+    'notice/page/2.html' → '/notice/page/2')
+
+    Cloudflare Pages 는 .html 주소를 .html 없는 주소로 리디렉션하므로 _headers 규칙도 그 주소로 쓴다.
+    """
+    url = '/' + path.replace(os.sep, '/')
+    if url.endswith('/index.html'):
+        return url[:-len('index.html')]
+    return url[:-len('.html')] if url.endswith('.html') else url
+
+
+def header_rules(dist_dir, reserved_rules=0):
+    """
+    dist/ 의 모든 페이지 → (공통 Link 목록, [(URL, 페이지 전용 Link 목록)], 한도로 뺀 페이지 수)
+
+    페이지 규칙은 메인 → 섹션 첫 목록 → 나머지 순(같은 순위는 URL 순)으로 정렬해
+    MAX_HEADER_RULES - reserved_rules - 1(공통 규칙) 개까지만 쓴다.
+    """
+    pages = {}
+    for path in glob.glob(os.path.join(dist_dir, '**', '*.html'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            pages[page_url(os.path.relpath(path, dist_dir))] = page_hints(f.read())
+    if not pages:
+        return [], [], 0
+
+    first = pages[min(pages)]
+    common = [hint for hint in first if all(hint in hints for hints in pages.values())]
+    specific = [(url, [hint for hint in hints if hint not in common][:MAX_PAGE_HINTS])
+                for url, hints in pages.items()]
+    specific = [(url, hints) for url, hints in specific if hints]
+    specific.sort(key=lambda item: (item[0] != '/', not item[0].endswith('/'), item[0]))
+
+    limit = max(MAX_HEADER_RULES - reserved_rules - 1, 0)
+    return common, specific[:limit], max(len(specific) - limit, 0)
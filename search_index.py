@@ -0,0 +1,300 @@
+"""
+SQLite FTS5 전문 검색 인덱스 (관리자 목록 검색용)
+
+- 대상: Notice / ActivityPost / Newsletter 의 제목 + 본문(태그 제거 텍스트)
+- 콘텐츠가 flush될 때 같은 트랜잭션에서 자동 갱신 (Session after_flush)
+- trigram 토크나이저: 조사/어미가 붙은 한국어도 부분 일치로 검색
+  (3글자 미만 검색어는 trigram으로 찾을 수 없어 LIKE로 대체)
+- 인덱스 테이블이 아직 없는 DB 는 원본 테이블 LIKE 검색으로 대체 (flask rebuild-search-index 로 생성)
+"""
+import re
+import logging
+from bs4 import BeautifulSoup
+from markupsafe import Markup, escape
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, Notice, ActivityPost, Newsletter
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'search_index'
+MIN_MATCH_LENGTH = 3        # trigram 검색 최소 글자 수
+TITLE_WEIGHT = 10.0         # bm25 가중치 (제목 > 본문)
+BODY_WEIGHT = 1.0
+SNIPPET_LENGTH = 60         # LIKE 검색 시 본문 발췌 길이
+
+# highlight()/snippet() 표시 문자 (HTML 이스케이프 후 <mark>로 치환)
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# 검색 대상 모델 → (owner_type, 본문 추출 함수)
+SEARCH_SOURCES = {
+    Notice: ('notice', lambda obj: obj.content),
+    ActivityPost: ('activity', lambda obj: obj.content),
+    Newsletter: ('newsletter', lambda obj: ' '.join(filter(None, [obj.description, obj.html_content]))),
+}
+
+# 인덱스가 아직 없을 때 직접 LIKE 검색할 본문 컬럼 (제목은 공통 title)
+FALLBACK_BODY_COLUMNS = {
+    Notice: ('content',),
+    ActivityPost: ('content',),
+    Newsletter: ('description', 'html_content'),
+}
+
+# 변경 시 재색인이 필요한 속성
+INDEXED_ATTRIBUTES = ('title', 'content', 'description', 'html_content')
+
+
+# 평문 변환 시 단어 경계로 취급할 블록 태그 (인라인 태그는 붙여서 "<b>상담</b>을" → "상담을")
+BLOCK_TAGS = ['p', 'div', 'br', 'li', 'tr', 'td', 'th', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+
+def html_to_text(html):
+    """HTML → 검색용 평문 (스크립트 제거, 공백 정리)"""
+    if not html:
+        return ''
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(['script', 'style']):
+        tag.decompose()
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.insert_after(' ')
+    return re.sub(r'\s+', ' ', soup.get_text()).strip()
+
+
+def ensure_search_index(connection):
+    """FTS5 가상 테이블 생성 (없을 때만)"""
+    connection.execute(db.text(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+            title, body, owner_type UNINDEXED, owner_id UNINDEXED,
+            tokenize = 'trigram'
+        )
+    """))
+
+
+def search_index_exists():
+    """
+    FTS5 테이블 존재 여부
+    (after_flush 자동 갱신이나 rebuild-search-index 가 한 번도 실행되지 않은 DB 에는 아직 없음)
+    """
+    return db.session.execute(
+        db.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': SEARCH_TABLE}
+    ).first() is not None
+
+
+def _source_model(owner_type):
+    return next(model for model, (source_type, _) in SEARCH_SOURCES.items() if source_type == owner_type)
+
+
+def _delete_entry(connection, owner_type, owner_id):
+    connection.execute(
+        db.text(f"DELETE FROM {SEARCH_TABLE} WHERE owner_type = :owner_type AND owner_id = :owner_id"),
+        {'owner_type': owner_type, 'owner_id': owner_id}
+    )
+
+
+def _index_entry(connection, obj):
+    owner_type, get_body = SEARCH_SOURCES[type(obj)]
+    _delete_entry(connection, owner_type, obj.id)
+    connection.execute(
+        db.text(f"""
+            INSERT INTO {SEARCH_TABLE} (title, body, owner_type, owner_id)
+            VALUES (:title, :body, :owner_type, :owner_id)
+        """),
+        {'title': obj.title or '', 'body': html_to_text(get_body(obj)),
+         'owner_type': owner_type, 'owner_id': obj.id}
+    )
+
+
+def _needs_reindex(obj):
+    state = db.inspect(obj)
+    return any(
+        name in state.attrs and state.attrs[name].history.has_changes()
+        for name in INDEXED_ATTRIBUTES
+    )
+
+
+def on_after_flush(session, flush_context):
+    """flush된 검색 대상 변경을 인덱스에 반영"""
+    deleted = [obj for obj in session.deleted if type(obj) in SEARCH_SOURCES]
+    changed = [obj for obj in list(session.new) + list(session.dirty)
+               if type(obj) in SEARCH_SOURCES and _needs_reindex(obj)]
+    if not deleted and not changed:
+        return
+
+    connection = session.connection()
+    ensure_search_index(connection)
+    for obj in deleted:
+        _delete_entry(connection, SEARCH_SOURCES[type(obj)][0], obj.id)
+    for obj in changed:
+        _index_entry(connection, obj)
+
+
+def rebuild_search_index():
+    """
+    검색 인덱스 전체 재생성 (최초 도입 / 불일치 복구용, 커밋은 호출자가 처리)
+    Returns: 색인된 문서 수
+    """
+    connection = db.session.connection()
+    ensure_search_index(connection)
+    connection.execute(db.text(f"DELETE FROM {SEARCH_TABLE}"))
+
+    count = 0
+    for model in SEARCH_SOURCES:
+        for obj in model.query.all():
+            _index_entry(connection, obj)
+            count += 1
+    return count
+
+
+def _terms(q):
+    return [term for term in q.split() if term]
+
+
+def _use_match(terms):
+    return all(len(term) >= MIN_MATCH_LENGTH for term in terms)
+
+
+def _match_expression(terms):
+    """검색어 → FTS5 MATCH 식 (각 단어를 문자열로 감싸 AND 검색)"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term):
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def search_subquery(owner_type, q):
+    """
+    검색 결과 (owner_id, rank) 서브쿼리 - 목록 쿼리에 join해서 사용
+    rank가 작을수록 관련도 높음
+
+    Usage:
+        hits = search_subquery('notice', q)
+        query = Notice.query.join(hits, hits.c.owner_id == Notice.id).order_by(hits.c.rank)
+    """
+    terms = _terms(q)
+    params = {'owner_type': owner_type}
+
+    if not search_index_exists():
+        logger.warning("검색 인덱스가 없어 원본 테이블 LIKE 검색으로 대체 (flask rebuild-search-index 로 생성)")
+        return _fallback_subquery(owner_type, terms)
+
+    if _use_match(terms):
+        sql = f"""
+            SELECT owner_id, bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH :match AND owner_type = :owner_type
+        """
+        params['match'] = _match_expression(terms)
+    else:
+        # 짧은 검색어: trigram 인덱스를 쓸 수 없으므로 LIKE (제목 일치를 우선)
+        conditions = []
+        for i, term in enumerate(terms):
+            params[f'term{i}'] = _like_pattern(term)
+            conditions.append(f"(title LIKE :term{i} ESCAPE '\\' OR body LIKE :term{i} ESCAPE '\\')")
+        sql = f"""
+            SELECT owner_id, CASE WHEN title LIKE :term0 ESCAPE '\\' THEN 0 ELSE 1 END AS rank
+            FROM {SEARCH_TABLE}
+            WHERE owner_type = :owner_type AND {' AND '.join(conditions)}
+        """
+
+    return db.text(sql).bindparams(**params).columns(
+        db.column('owner_id', db.Integer), db.column('rank', db.Float)
+    ).subquery('search_hits')
+
+
+def _fallback_subquery(owner_type, terms):
+    """인덱스가 없을 때: 원본 테이블의 제목/본문 LIKE 검색 (제목 일치 우선, 본문은 HTML 그대로)"""
+    model = _source_model(owner_type)
+    columns = [model.title] + [getattr(model, name) for name in FALLBACK_BODY_COLUMNS[model]]
+    patterns = [_like_pattern(term) for term in terms]
+    conditions = [db.or_(*[column.like(pattern, escape='\\') for column in columns]) for pattern in patterns]
+    rank = db.case((model.title.like(patterns[0], escape='\\'), 0), else_=1)
+    return db.session.query(model.id.label('owner_id'), rank.label('rank'))\
+        .filter(*conditions).subquery('search_hits')
+
+
+def _to_markup(text):
+    """표시 문자가 들어간 평문 → 이스케이프된 HTML (<mark> 강조)"""
+    html = str(escape(text or ''))
+    return Markup(html.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def _mark_terms(text, terms):
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: f'{MARK_START}{m.group(0)}{MARK_END}', text)
+
+
+def _like_snippet(body, terms):
+    """본문에서 첫 번째 검색어 주변 발췌"""
+    lowered = body.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [p for p in positions if p >= 0]
+    if not positions:
+        return ''
+    start = max(min(positions) - SNIPPET_LENGTH // 3, 0)
+    snippet = body[start:start + SNIPPET_LENGTH]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + SNIPPET_LENGTH < len(body) else ''
+    return prefix + _mark_terms(snippet, terms) + suffix
+
+
+def search_highlights(owner_type, q, owner_ids):
+    """
+    현재 페이지 결과의 강조 표시 (제목 / 본문 발췌)
+    Returns: {owner_id: {'title': Markup, 'snippet': Markup}}
+    """
+    terms = _terms(q)
+    if not terms or not owner_ids:
+        return {}
+
+    indexed = search_index_exists()
+    id_params = {f'id{i}': owner_id for i, owner_id in enumerate(owner_ids)}
+    id_list = ', '.join(f':{name}' for name in id_params)
+    params = {'owner_type': owner_type, **id_params}
+
+    if indexed and _use_match(terms):
+        params['match'] = _match_expression(terms)
+        rows = db.session.execute(db.text(f"""
+            SELECT owner_id,
+                   highlight({SEARCH_TABLE}, 0, '{MARK_START}', '{MARK_END}'),
+                   snippet({SEARCH_TABLE}, 1, '{MARK_START}', '{MARK_END}', '…', 24)
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH :match AND owner_type = :owner_type AND owner_id IN ({id_list})
+        """), params)
+        return {
+            owner_id: {'title': _to_markup(title), 'snippet': _to_markup(snippet)}
+            for owner_id, title, snippet in rows
+        }
+
+    if indexed:
+        rows = db.session.execute(db.text(f"""
+            SELECT owner_id, title, body FROM {SEARCH_TABLE}
+            WHERE owner_type = :owner_type AND owner_id IN ({id_list})
+        """), params)
+    else:
+        model = _source_model(owner_type)
+        get_body = SEARCH_SOURCES[model][1]
+        rows = [(obj.id, obj.title or '', html_to_text(get_body(obj)))
+                for obj in model.query.filter(model.id.in_(owner_ids))]
+    return {
+        owner_id: {
+            'title': _to_markup(_mark_terms(title, terms)),
+            'snippet': _to_markup(_like_snippet(body, terms))
+        }
+        for owner_id, title, body in rows
+    }
+
+
+def setup_search_index(app):
+    """
+    검색 인덱스 자동 갱신 이벤트 리스너 설정
+
+    Usage:
+        from search_index import setup_search_index
+        setup_search_index(app)
+    """
+    event.listen(Session, 'after_flush', on_after_flush)
+    app.logger.info("검색 인덱스 자동 갱신 활성화됨")
@@ -0,0 +1,216 @@
+"""
+서비스 워커 생성 (dist/sw.js) - 다시 방문/불안정한 모바일 연결에서 캐시로 바로 열기
+
+빌드가 끝날 때(write_build_manifest) 빌드 버전을 넣어 다시 만든다.
+배포마다 sw.js 내용이 바뀌므로 브라우저가 새 워커를 설치하고, 이전 버전의 미리 받기 캐시를 지운다.
+
+- 미리 받기(precache): 메인 페이지가 쓰는 같은 사이트 스타일시트/스크립트/웹폰트 preload 조각
+  (utilities.<hash>.css, fonts.<hash>.css, 0번 폰트 조각 …) + 오프라인 대체 페이지 '/'
+- 페이지(HTML): stale-while-revalidate - 캐시가 있으면 바로 보여 주고 뒤에서 새로 받아 캐시 갱신,
+  네트워크가 안 되고 캐시도 없으면 '/' 로 대체
+- 지문 파일(<이름>.<hash10>.<확장자>, static/fonts/): 캐시 우선 (내용이 바뀌면 파일명이 바뀜)
+- 나머지 static/ 파일: stale-while-revalidate
+- 새 버전 설치 시 이전 미리 받기 캐시의 지문 파일은 ASSETS 로 옮김
+  (캐시된 이전 페이지가 새 배포에 없는 이전 지문 파일을 요청해도 스타일이 깨지지 않음)
+- /search/, 다른 사이트 요청, GET 이 아닌 요청: 관여하지 않음
+"""
+import os
+import re
+import json
+
+from resource_hints import LINK_TAG, tag_attributes
+
+SERVICE_WORKER_FILE = 'sw.js'
+OFFLINE_URL = '/'
+MAX_PAGES = 50          # 페이지 캐시 항목 수 (오래된 것부터 지움)
+MAX_ASSETS = 100        # 런타임 정적 파일 캐시 항목 수
+
+SCRIPT_SRC = re.compile(r'<script\b[^>]*\bsrc=["\']?([^"\'\s>]+)', re.I)
+PRECACHE_RELS = {'stylesheet', 'preload'}
+
+SERVICE_WORKER_JS = """// build.py 가 생성 (service_worker.py) - 직접 고치지 말 것
+const VERSION = __VERSION__;
+const PRECACHE = 'precache-' + VERSION;
+const PAGES = 'pages';
+const ASSETS = 'assets';
+const PRECACHE_URLS = __PRECACHE_URLS__;
+const OFFLINE_URL = __OFFLINE_URL__;
+const MAX_PAGES = __MAX_PAGES__;
+const MAX_ASSETS = __MAX_ASSETS__;
+const FINGERPRINTED = /\\.[0-9a-f]{10}\\.[a-z0-9]+$|^\\/static\\/fonts\\//;
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        caches.open(PRECACHE)
+            .then(function(cache) { return cache.addAll(PRECACHE_URLS); })
+            .then(function() { return self.skipWaiting(); })
+    );
+});
+
+// 이전 버전의 미리 받기 캐시: 지문 파일은 런타임 캐시(ASSETS)로 옮긴 뒤 지움
+// 페이지 캐시의 이전 HTML 이 아직 예전 지문 파일(utilities.<이전 hash>.css 등)을 가리키는데,
+// 새 배포에는 그 파일이 없으므로 캐시에 남겨 두어야 다시 받은 페이지로 바뀔 때까지 제대로 그려진다
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys()
+            .then(function(keys) {
+                return Promise.all(keys.filter(function(key) {
+                    return key.indexOf('precache-') === 0 && key !== PRECACHE;
+                }).map(retirePrecache));
+            })
+            .then(function() { return caches.open(ASSETS); })
+            .then(function(cache) { return trim(cache, MAX_ASSETS); })
+            .then(function() { return self.clients.claim(); })
+    );
+});
+
+function retirePrecache(key) {
+    return Promise.all([caches.open(key), caches.open(ASSETS)]).then(function(opened) {
+        const previous = opened[0];
+        const assets = opened[1];
+        return previous.keys().then(function(requests) {
+            return Promise.all(requests.filter(function(request) {
+                return FINGERPRINTED.test(new URL(request.url).pathname);
+            }).map(function(request) {
+                return assets.match(request).then(function(existing) {
+                    if (existing) return null;
+                    return previous.match(request).then(function(response) {
+                        return response && assets.put(request, response);
+                    });
+                });
+            }));
+        });
+    }).then(function() { return caches.delete(key); });
+}
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== location.origin || url.pathname.indexOf('/search/') === 0) return;
+
+    if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(event, PAGES, MAX_PAGES, fetchPage));
+    } else if (url.pathname.indexOf('/static/') === 0) {
+        event.respondWith(FINGERPRINTED.test(url.pathname)
+            ? cacheFirst(event)
+            : staleWhileRevalidate(event, ASSETS, MAX_ASSETS, fetch));
+    }
+});
+
+// 페이지 요청: Cloudflare Pages 는 .html 주소를 .html 없는 주소로 리디렉션하므로
+// 리디렉션을 따라간 응답을 새 응답으로 감싸 요청 주소 그대로 캐시한다 (내비게이션에 리디렉션 응답은 못 씀)
+function fetchPage(request) {
+    return fetch(request.url, { credentials: 'same-origin' }).then(function(response) {
+        if (!response.redirected) return response;
+        return response.blob().then(function(body) {
+            return new Response(body, {
+                status: response.status,
+                statusText: response.statusText,
+                headers: response.headers
+            });
+        });
+    });
+}
+
+function store(event, cacheName, limit, request, response) {
+    if (!response.ok || response.type !== 'basic') return;
+    const copy = response.clone();
+    event.waitUntil(caches.open(cacheName).then(function(cache) {
+        return cache.put(request, copy).then(function() { return trim(cache, limit); });
+    }));
+}
+
+// 오래 안 쓴 항목부터 지우기 (cache.put 은 같은 키를 맨 뒤로 옮김)
+function trim(cache, limit) {
+    return cache.keys().then(function(keys) {
+        return Promise.all(keys.slice(0, Math.max(keys.length - limit, 0)).map(function(key) {
+            return cache.delete(key);
+        }));
+    });
+}
+
+// 자기 캐시(새로 받은 것)를 먼저 보고, 없으면 설치 때 미리 받은 것
+function lookup(cacheName, request) {
+    return caches.open(cacheName).then(function(cache) {
+        return cache.match(request);
+    }).then(function(cached) {
+        return cached || caches.match(request);
+    });
+}
+
+function staleWhileRevalidate(event, cacheName, limit, fetcher) {
+    const request = event.request;
+    const network = fetcher(request).then(function(response) {
+        store(event, cacheName, limit, request, response);
+        return response;
+    });
+    return lookup(cacheName, request).then(function(cached) {
+        if (cached) {
+            event.waitUntil(network.catch(function() {}));
+            return cached;
+        }
+        return network.catch(function() {
+            return cacheName === PAGES ? caches.match(OFFLINE_URL) : Response.error();
+        });
+    });
+}
+
+function cacheFirst(event) {
+    const request = event.request;
+    return caches.match(request).then(function(cached) {
+        return cached || fetch(request).then(function(response) {
+            store(event, ASSETS, MAX_ASSETS, request, response);
+            return response;
+        });
+    });
+}
+"""
+
+
+def precache_urls(dist_dir):
+    """
+    메인 페이지가 쓰는 같은 사이트 스타일시트/preload/스크립트 + 오프라인 대체 페이지
+
+    웹폰트/유틸리티 CSS 는 빌드 후 교체된 지문 파일명이 들어 있는 렌더링 결과에서 읽는다.
+    """
+    with open(os.path.join(dist_dir, 'index.html'), encoding='utf-8') as f:
+        page = f.read()
+    head = page.partition('</head>')[0]
+
+    urls = [OFFLINE_URL]
+    for tag in LINK_TAG.findall(head):
+        attrs = tag_attributes(tag)
+        if attrs.get('rel', '').lower() in PRECACHE_RELS:
+            urls.append(attrs.get('href') or '')
+    urls.extend(SCRIPT_SRC.findall(page))
+    # 다른 사이트(CDN 대체 폰트 등)는 CORS 가 없으면 addAll 전체가 실패하므로 제외
+    urls = [url for url in urls if url.startswith('/') and not url.startswith('//')]
+    return list(dict.fromkeys(urls))
+
+
+def build_service_worker(dist_dir, version):
+    """
+    dist/sw.js 생성
+
+    Args:
+        dist_dir: 빌드 출력 폴더
+        version: 빌드 버전 (build-manifest.json 의 version)
+
+    Returns:
+        dict: {'file', 'precache'}
+    """
+    urls = precache_urls(dist_dir)
+    values = {
+        '__VERSION__': version,
+        '__PRECACHE_URLS__': urls,
+        '__OFFLINE_URL__': OFFLINE_URL,
+        '__MAX_PAGES__': MAX_PAGES,
+        '__MAX_ASSETS__': MAX_ASSETS,
+    }
+    script = SERVICE_WORKER_JS
+    for marker, value in values.items():
+        script = script.replace(marker, json.dumps(value, ensure_ascii=False))
+    with open(os.path.join(dist_dir, SERVICE_WORKER_FILE), 'w', encoding='utf-8') as f:
+        f.write(script)
+    return {'file': SERVICE_WORKER_FILE, 'precache': len(urls)}
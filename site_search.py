@@ -0,0 +1,236 @@
+"""
+정적 사이트 검색 인덱스 생성 (빌드 시)
+
+dist/search/ 아래에 다음 파일을 만든다.
+- manifest.json        : 문서 청크/용어 샤드 파일 목록 (검색 시 가장 먼저, 작게 유지)
+- shards/d-<hash>.json : 문서 청크 (제목, URL, 날짜, 분류, 짧은 발췌) - 문서 번호 순서대로 DOC_CHUNK_SIZE건씩
+- shards/t-<hash>.json : 용어 샤드 (정렬된 용어 + 역색인 목록) - 용어의 앞글자(한글은 초성)로 분할
+
+용어 (tokenize_terms / choseong_terms):
+- 한글: 음절 bigram ("노동자의" → 노동, 동자, 자의), 한 글자 단어는 그대로
+  → 조사가 붙거나 단어 중간이어도 검색어 bigram이 모두 있으면 일치
+- 영문/숫자: 단어 전체 (브라우저에서 접두어 일치)
+- 초성: 제목 한글 단어의 초성 bigram ("노동자" → ㄴㄷ, ㄷㅈ) → "ㄴㄷㅈ" 초성 검색
+
+역색인 값은 (문서 번호 << 2) | 필드 비트(제목 1, 발췌 2) 정수 목록이다.
+브라우저는 내려받은 샤드만으로 필드 가중치 + 최신순 가산점(RANK_WEIGHTS)을 계산해 정렬한다.
+
+브라우저(static/js/site-search.js)는 검색어 단어마다 필요한 용어 샤드와
+결과 문서가 들어 있는 문서 청크만 내려받는다. 파일명에 내용 해시가 들어가므로
+샤드는 영구 캐시되고, 빌드마다 바뀌는 것은 manifest.json 뿐이다.
+모든 파일은 .gz 사전 압축본을 함께 만든다 (gzip_static 등으로 바로 서빙).
+"""
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+
+from models import Notice, ActivityPost, Newsletter
+from search_index import SEARCH_SOURCES, html_to_text
+
+SEARCH_DIR = 'search'
+MANIFEST_NAME = 'manifest.json'
+SHARD_DIR = 'shards'          # 내용 해시 파일명 → 영구 캐시 (_headers)
+INDEX_VERSION = 2
+
+DOC_CHUNK_SIZE = 200        # 문서 청크당 문서 수
+EXCERPT_LENGTH = 120        # 발췌 길이 (검색 대상이자 결과 표시용)
+SHARD_SPLIT_BYTES = 32 * 1024   # 이보다 큰 용어 샤드는 두 번째 글자 단위로 다시 분할
+
+# 유니코드 한글 음절 → 초성 (이중 자음은 기본 자음으로 묶음)
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+CHOSEONG_GROUP = {'ㄲ': 'ㄱ', 'ㄸ': 'ㄷ', 'ㅃ': 'ㅂ', 'ㅆ': 'ㅅ', 'ㅉ': 'ㅈ'}
+
+# 문자 종류별 연속 구간 ("2024년" → 2024, 년)
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[가-힣]+|[ㄱ-ㅎ]+')
+HANGUL_WORD = re.compile(r'[가-힣]+')
+
+FIELD_TITLE = 1
+FIELD_EXCERPT = 2
+
+# 순위 점수 = 검색어 단어별 필드 가중치 합 + recency × (1 - 문서 번호 / 문서 수)
+RANK_WEIGHTS = {'title': 3.0, 'excerpt': 1.0, 'recency': 1.0}
+
+# 색인 대상: 모델 → (URL 형식, 분류 이름 함수, 날짜 속성)
+SITE_SEARCH_SOURCES = {
+    Notice: ('/notice/{id}.html', lambda obj: '공지', 'created_at'),
+    ActivityPost: ('/activity/{id}.html', lambda obj: obj.category or '활동', 'created_at'),
+    Newsletter: ('/newsletter/{id}.html', lambda obj: '소식지', 'published_at'),
+}
+
+
+def bigrams(word):
+    """글자 bigram 목록 (한 글자 단어는 그대로)"""
+    if len(word) == 1:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def tokenize_terms(text):
+    """색인 용어 집합: 한글은 음절 bigram, 영문/숫자는 단어"""
+    terms = set()
+    for word in TOKEN_PATTERN.findall((text or '').lower()):
+        if HANGUL_WORD.fullmatch(word):
+            terms.update(bigrams(word))
+        elif word.isascii():
+            terms.add(word)
+    return terms
+
+
+def choseong_terms(text):
+    """초성 검색용 용어 집합 (한글 단어의 초성열 bigram)"""
+    terms = set()
+    for word in HANGUL_WORD.findall(text or ''):
+        terms.update(bigrams(''.join(choseong_of(char) for char in word)))
+    return terms
+
+
+def choseong_of(char):
+    """한글 음절의 초성 (이중 자음은 기본 자음), 한글이 아니면 None"""
+    code = ord(char)
+    if HANGUL_BASE <= code <= HANGUL_END:
+        initial = CHOSEONG[(code - HANGUL_BASE) // 588]
+        return CHOSEONG_GROUP.get(initial, initial)
+    return None
+
+
+def shard_key(word, depth=1):
+    """
+    용어 샤드 키
+
+    depth 1: 한글은 첫 음절의 초성, 영문/숫자/초성 용어는 첫 글자
+    depth 2: depth 1 키 + '/' + 첫 두 글자 (한글은 첫 음절)
+    """
+    first = word[0]
+    key = choseong_of(first) or first
+    if depth == 1:
+        return key
+    prefix = first if choseong_of(first) else word[:2]
+    return f'{key}/{prefix}'
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """본문 평문에서 짧은 발췌 생성"""
+    if len(text) <= length:
+        return text
+    return text[:length].rstrip() + '…'
+
+
+def collect_documents():
+    """색인 문서 목록 (최신순) - 앱 컨텍스트 안에서 호출"""
+    docs = []
+    for model, (url_format, get_category, date_attr) in SITE_SEARCH_SOURCES.items():
+        _, get_body = SEARCH_SOURCES[model]
+        for obj in model.query.order_by(model.id).all():
+            date = getattr(obj, date_attr)
+            docs.append({
+                't': obj.title,
+                'u': url_format.format(id=obj.id),
+                'd': date.strftime('%Y.%m.%d') if date else '',
+                'c': get_category(obj),
+                'e': make_excerpt(html_to_text(get_body(obj))),
+            })
+    # 날짜 내림차순 - 문서 번호가 작을수록 최신 (브라우저에서 동점일 때 최신 우선)
+    docs.sort(key=lambda doc: doc['d'], reverse=True)
+    return docs
+
+
+def build_postings(docs):
+    """역색인: 용어 → [(문서 번호 << 2) | 필드 비트] (문서 번호 오름차순)"""
+    postings = {}
+    for doc_id, doc in enumerate(docs):
+        fields = {}
+        for term in tokenize_terms(doc['t']) | choseong_terms(doc['t']):
+            fields[term] = FIELD_TITLE
+        for term in tokenize_terms(doc['e']):
+            fields[term] = fields.get(term, 0) | FIELD_EXCERPT
+        for term, mask in fields.items():
+            postings.setdefault(term, []).append(doc_id << 2 | mask)
+    return postings
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def split_shards(postings):
+    """
+    용어를 샤드 키별로 묶고, 너무 큰 샤드는 depth 2 키로 다시 분할
+
+    Returns:
+        {샤드 키: {용어: 역색인 목록}}
+    """
+    shards = {}
+    for word, doc_ids in postings.items():
+        shards.setdefault(shard_key(word), {})[word] = doc_ids
+
+    for key in list(shards):
+        if len(_encode(shards[key])) <= SHARD_SPLIT_BYTES:
+            continue
+        for word, doc_ids in shards.pop(key).items():
+            shards.setdefault(shard_key(word, depth=2), {})[word] = doc_ids
+    return shards
+
+
+def _write_json(out_dir, name, body):
+    """JSON + .gz 사전 압축본 저장"""
+    with open(os.path.join(out_dir, name), 'wb') as f:
+        f.write(body)
+    with open(os.path.join(out_dir, name + '.gz'), 'wb') as f:
+        f.write(gzip.compress(body, compresslevel=9, mtime=0))
+
+
+def _write_asset(out_dir, prefix, data):
+    """내용 해시 파일명으로 저장하고 파일명 반환"""
+    body = _encode(data)
+    name = f'{prefix}-{hashlib.sha1(body).hexdigest()[:10]}.json'
+    _write_json(out_dir, name, body)
+    return name
+
+
+def write_search_index(dist_dir, docs):
+    """
+    dist/search/ 에 manifest + 문서 청크 + 용어 샤드 생성
+
+    Returns:
+        dict: {'docs': 문서 수, 'chunks': 청크 수, 'shards': 샤드 수, 'bytes': 총 크기(압축 전)}
+    """
+    out_dir = os.path.join(dist_dir, SEARCH_DIR)
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    shard_dir = os.path.join(out_dir, SHARD_DIR)
+    os.makedirs(shard_dir)
+
+    chunks = [
+        _write_asset(shard_dir, 'd', docs[start:start + DOC_CHUNK_SIZE])
+        for start in range(0, len(docs), DOC_CHUNK_SIZE)
+    ]
+
+    terms = {}
+    for key, shard in sorted(split_shards(build_postings(docs)).items()):
+        # 정렬된 용어 배열 → 브라우저에서 접두어 검색을 이진 탐색으로 처리
+        # (JSON 객체는 숫자 키 순서가 바뀌므로 배열 두 개로 저장)
+        words = sorted(shard)
+        terms[key] = _write_asset(shard_dir, 't', {'k': words, 'p': [shard[w] for w in words]})
+
+    manifest = {
+        'v': INDEX_VERSION,
+        'n': len(docs),
+        'chunk': DOC_CHUNK_SIZE,
+        'w': RANK_WEIGHTS,
+        'docs': chunks,
+        'terms': terms,
+    }
+    _write_json(out_dir, MANIFEST_NAME, _encode(manifest))
+
+    total = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(out_dir)
+        for name in names if not name.endswith('.gz')
+    )
+    return {'docs': len(docs), 'chunks': len(chunks), 'shards': len(terms), 'bytes': total}
+
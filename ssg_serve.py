@@ -1,21 +1,205 @@
-from flask import Flask, send_from_directory, abort
+"""
+SSG 정적 파일 서버 (dist/ 미리보기)
+
+- 시작 시 dist/ 를 훑어 URL → 파일 라우트 테이블을 만들고,
+  빌드 완료 파일(Config.BUILD_MANIFEST)의 수정 시각이 바뀌면 다시 만든다
+  (/notice/ → notice/index.html, /intro → intro.html 같은 대체 경로도 테이블에 미리 등록)
+- SMALL_FILE_LIMIT 이하 파일은 메모리에 캐시 (내용 해시 ETag, If-None-Match → 304)
+- Accept-Encoding 에 맞춰 사전 압축본(.br/.gz)을 우선 서빙하고,
+  없으면 텍스트 파일은 처음 요청 때 gzip 으로 압축해 캐시
+- 큰 파일은 send_file 로 보내 WSGI 서버의 sendfile(무복사 전송)을 사용 (gunicorn 등)
+
+사용법:
+    python ssg_serve.py            # 캐시 서빙
+    python ssg_serve.py --legacy   # 요청마다 파일 시스템을 확인하는 기존 방식
+"""
+from flask import Flask, Response, request, send_file, send_from_directory, abort
 import os
+import gzip
+import hashlib
+import argparse
+import mimetypes
+import threading
+import time
 
-app = Flask(__name__)
+from config import Config
 
 # dist 폴더 경로
 DIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dist')
 
+SMALL_FILE_LIMIT = 256 * 1024           # 이하 크기는 메모리 캐시
+MEMORY_CACHE_LIMIT = 64 * 1024 * 1024   # 메모리 캐시 총량 (넘으면 더 캐시하지 않음)
+MANIFEST_CHECK_SECONDS = 1.0            # 빌드 완료 파일 확인 간격
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'image/svg+xml')
+# 사전 압축본 확장자 (Accept-Encoding 선호 순서)
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+NOT_FOUND_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <title>404 Not Found</title>
+        <style>
+            body { font-family: sans-serif; text-align: center; padding: 50px; }
+            h1 { color: #666; }
+        </style>
+    </head>
+    <body>
+        <h1>404 - 페이지를 찾을 수 없습니다</h1>
+        <p><a href="/">홈으로 돌아가기</a></p>
+    </body>
+    </html>
+    """
+
+
+class StaticSite:
+    """dist/ 라우트 테이블 + 작은 파일 메모리 캐시"""
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.cache = {}             # (파일 경로, 인코딩) → (본문, ETag)
+        self.cached_bytes = 0
+        self.manifest_mtime = None
+        self.checked_at = None      # 마지막 확인 시각 (None 이면 아직 읽지 않음)
+
+    def refresh(self):
+        """빌드 완료 파일이 바뀌었으면 라우트 테이블/캐시 다시 만들기 (MANIFEST_CHECK_SECONDS 마다 확인)"""
+        now = time.monotonic()
+        loaded = self.checked_at is not None
+        if loaded and now - self.checked_at < MANIFEST_CHECK_SECONDS:
+            return
+        self.checked_at = now
+        try:
+            mtime = os.stat(os.path.join(self.root, Config.BUILD_MANIFEST)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if loaded and mtime == self.manifest_mtime:
+            return
+        with self.lock:
+            self.routes = self._scan()
+            self.cache = {}
+            self.cached_bytes = 0
+            self.manifest_mtime = mtime
+
+    def _scan(self):
+        """URL 경로 → 파일 정보 (우선순위: 실제 파일 > 디렉터리 index.html > .html 생략)"""
+        files = {}
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                files['/' + os.path.relpath(path, self.root).replace(os.sep, '/')] = path
+
+        routes = {}
+        for url, path in files.items():
+            routes[url] = self._entry(path, files, url)
+        for url, entry in list(routes.items()):
+            if url.endswith('/index.html'):
+                directory = url[:-len('index.html')]
+                routes.setdefault(directory, entry)
+                routes.setdefault(directory.rstrip('/'), entry)
+        for url, entry in list(routes.items()):
+            if url.endswith('.html'):
+                routes.setdefault(url[:-len('.html')], entry)
+        return routes
+
+    @staticmethod
+    def _entry(path, files, url):
+        stat = os.stat(path)
+        mimetype, file_encoding = mimetypes.guess_type(path)
+        if file_encoding or not mimetype:
+            # sitemap-*.xml.gz 처럼 압축 파일 자체를 받는 경우는 압축 형식 그대로
+            mimetype = 'application/gzip' if file_encoding == 'gzip' else 'application/octet-stream'
+        # 같은 이름의 .br/.gz 가 있으면 압축본 (sitemap-*.xml.gz 처럼 압축 파일 자체가 원본인 경우는 제외)
+        variants = {encoding: files[url + suffix] for encoding, suffix in PRECOMPRESSED
+                    if url + suffix in files}
+        return {
+            'path': path,
+            'size': stat.st_size,
+            'mimetype': mimetype,
+            'variants': variants,
+            'compressible': mimetype.startswith(COMPRESSIBLE_TYPES),
+            'etag': f'{stat.st_size:x}-{stat.st_mtime_ns:x}',
+        }
+
+    def lookup(self, url):
+        self.refresh()
+        return self.routes.get(url)
+
+    def cached_body(self, path, encoding, compress=False):
+        """작은 파일 본문 + 내용 해시 ETag (compress 면 gzip 압축본)"""
+        key = (path, encoding)
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        with open(path, 'rb') as f:
+            body = f.read()
+        if compress:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+        etag = hashlib.sha1(body).hexdigest()[:20] + (f'-{encoding}' if encoding else '')
+        with self.lock:
+            if self.cached_bytes + len(body) <= MEMORY_CACHE_LIMIT:
+                self.cache[key] = (body, etag)
+                self.cached_bytes += len(body)
+        return body, etag
+
 
-@app.route('/')
-def index():
-    """메인 페이지"""
-    return send_from_directory(DIST_DIR, 'index.html')
+site = StaticSite(DIST_DIR)
 
 
-@app.route('/<path:filename>')
-def serve_file(filename):
-    """모든 파일 서빙"""
+def accepted_encodings():
+    """Accept-Encoding 에서 q=0 이 아닌 인코딩 집합"""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(name.lower())
+    return accepted
+
+
+def serve_cached(url):
+    """라우트 테이블로 찾은 파일 서빙 (메모리 캐시/사전 압축본/sendfile)"""
+    entry = site.lookup(url)
+    if entry is None:
+        abort(404)
+
+    accepted = accepted_encodings()
+    encoding = next((name for name, _ in PRECOMPRESSED
+                     if name in entry['variants'] and name in accepted), None)
+    path = entry['variants'][encoding] if encoding else entry['path']
+    size = os.path.getsize(path) if encoding else entry['size']
+
+    if size > SMALL_FILE_LIMIT:
+        # 큰 파일: 크기-수정 시각 ETag, 본문은 WSGI file_wrapper(sendfile) 로 전송
+        response = send_file(path, mimetype=entry['mimetype'], conditional=True,
+                             etag=entry['etag'] + (f'-{encoding}' if encoding else ''))
+    else:
+        compress = encoding is None and entry['compressible'] and 'gzip' in accepted
+        if compress:
+            encoding = 'gzip'
+        try:
+            body, etag = site.cached_body(path, encoding, compress)
+        except FileNotFoundError:
+            abort(404)     # 라우트 테이블을 다시 만들기 전에 지워진 파일
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=entry['mimetype'])
+        response.set_etag(etag)
+
+    if encoding and response.status_code != 304:
+        response.headers['Content-Encoding'] = encoding
+    if entry['variants'] or entry['compressible']:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def serve_legacy(filename):
+    """요청마다 파일 시스템을 확인하는 기존 방식 (벤치마크 비교용)"""
     file_path = os.path.join(DIST_DIR, filename)
     print(file_path)
 
@@ -37,35 +221,49 @@ def serve_file(filename):
     abort(404)
 
 
-@app.errorhandler(404)
-def not_found(e):
-    """404 에러 핸들러"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>404 Not Found</title>
-        <style>
-            body {{ font-family: sans-serif; text-align: center; padding: 50px; }}
-            h1 {{ color: #666; }}
-        </style>
-    </head>
-    <body>
-        <h1>404 - 페이지를 찾을 수 없습니다</h1>
-        <p><a href="/">홈으로 돌아가기</a></p>
-    </body>
-    </html>
-    """, 404
+def create_app(legacy=False):
+    """
+    정적 파일 서버 앱 생성
+
+    Args:
+        legacy: True 면 기존 방식 (요청마다 isfile/isdir + send_from_directory)
+    """
+    # Flask 기본 /static 라우트(저장소의 static/)를 끄고 dist/static 을 서빙
+    app = Flask(__name__, static_folder=None)
+
+    @app.route('/')
+    def index():
+        """메인 페이지"""
+        if legacy:
+            return send_from_directory(DIST_DIR, 'index.html')
+        return serve_cached('/')
+
+    @app.route('/<path:filename>')
+    def serve_file(filename):
+        """모든 파일 서빙"""
+        if legacy:
+            return serve_legacy(filename)
+        return serve_cached('/' + filename)
+
+    @app.errorhandler(404)
+    def not_found(e):
+        """404 에러 핸들러"""
+        return NOT_FOUND_HTML, 404
+
+    return app
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SSG 정적 파일 서버')
+    parser.add_argument('--legacy', action='store_true', help='요청마다 파일 시스템을 확인하는 기존 방식')
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("SSG 정적 파일 서버")
+    print("SSG 정적 파일 서버" + (" (기존 방식)" if args.legacy else ""))
     print("=" * 60)
     print(f"서빙 디렉토리: {os.path.abspath(DIST_DIR)}")
     print("서버 주소: http://localhost:3000")
     print("종료: Ctrl+C")
     print("=" * 60)
 
-    app.run(debug=True, port=3000, host='0.0.0.0')
+    create_app(legacy=args.legacy).run(debug=True, port=3000, host='0.0.0.0')
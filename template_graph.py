@@ -0,0 +1,94 @@
+"""
+SSG 템플릿 의존성 그래프 (증분 빌드용)
+
+페이지 템플릿(build.py PAGE_BUILDERS 의 키)에서 시작해 extends / include / import 와
+공통 조각 fragment('<이름>') 참조를 따라가며 각 페이지가 쓰는 템플릿 전체를 구한다.
+
+- notice_detail.html 변경 → 공지 상세 페이지만 다시 빌드
+- base.html / partials 변경 → 이를 쓰는 모든 페이지 다시 빌드
+
+템플릿 파일을 직접 파싱하므로(jinja2.meta) 렌더링하지 않고도 그래프를 만들 수 있고,
+변경 파일 경로는 templates/ 기준 이름(예: 'ssg/notice_detail.html')으로 바꿔 비교한다.
+"""
+import os
+import re
+
+from jinja2 import meta
+
+TEMPLATE_DIR = 'templates'
+
+# base.html 의 공통 조각 호출 ({{ fragment('_header') }}) → 템플릿 이름
+FRAGMENT_TEMPLATE = 'ssg/partials/{}.html'
+FRAGMENT_CALL = re.compile(r"""fragment\(\s*['"]([^'"]+)['"]\s*\)""")
+
+
+# 파일 경로 → (수정 시각, 직접 의존성) - dev_server 처럼 그래프를 반복해서 만들 때 바뀐 파일만 다시 파싱
+_dependency_cache = {}
+
+
+def direct_dependencies(env, name):
+    """템플릿 하나가 직접 참조하는 템플릿 이름 집합 (변수로 된 이름은 알 수 없으므로 제외)"""
+    source, filename, _ = env.loader.get_source(env, name)
+    mtime = os.path.getmtime(filename) if filename else None
+    cached = _dependency_cache.get(filename)
+    if cached and mtime is not None and cached[0] == mtime:
+        return set(cached[1])
+
+    refs = {ref for ref in meta.find_referenced_templates(env.parse(source)) if ref}
+    refs.update(FRAGMENT_TEMPLATE.format(fragment) for fragment in FRAGMENT_CALL.findall(source))
+    if mtime is not None:
+        _dependency_cache[filename] = (mtime, frozenset(refs))
+    return refs
+
+
+def build_graph(env, roots):
+    """
+    루트 템플릿에서 도달할 수 있는 템플릿의 직접 의존성 그래프
+
+    Returns:
+        dict: {템플릿 이름: {직접 참조하는 템플릿 이름}}
+    """
+    graph = {}
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name in graph:
+            continue
+        graph[name] = direct_dependencies(env, name)
+        pending.extend(graph[name] - set(graph))
+    return graph
+
+
+def closure(graph, name):
+    """템플릿이 (간접적으로라도) 쓰는 템플릿 전체 (자기 자신 포함)"""
+    seen = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(graph.get(current, ()))
+    return seen
+
+
+def affected_roots(graph, roots, changed):
+    """
+    변경된 템플릿 이름 목록 → 다시 빌드해야 하는 루트(페이지) 템플릿
+
+    Args:
+        graph: build_graph 결과
+        roots: 페이지 템플릿 이름 목록
+        changed: 변경된 템플릿 이름 집합
+    """
+    changed = set(changed)
+    return [root for root in roots if closure(graph, root) & changed]
+
+
+def template_name(path, base_dir):
+    """파일 경로 → templates/ 기준 템플릿 이름 (templates/ 밖의 파일이면 None)"""
+    template_root = os.path.join(base_dir, TEMPLATE_DIR)
+    relpath = os.path.relpath(os.path.abspath(path), template_root)
+    if relpath.startswith(os.pardir):
+        return None
+    return relpath.replace(os.sep, '/')
@@ -0,0 +1,925 @@
+"""
+공개 페이지용 유틸리티 CSS 빌드 (Tailwind CDN 런타임 대체)
+
+dist/ 에 렌더링된 HTML의 class 속성과 스크립트 문자열에서 유틸리티 클래스 후보를 모으고,
+THEME(기존 base.html 의 tailwind.config 를 옮겨 온 값) 기준으로 CSS 규칙을 만들어
+최소화된 스타일시트 하나(static/css/utilities.<hash>.css)로 저장한다.
+
+- Tailwind v3 문법 중 사이트에서 쓰는 범위와 흔한 기본값을 지원 (모르는 클래스는 무시)
+- 변형: sm/md/lg/xl/2xl, hover/focus/active/disabled/first/last, group-hover, peer-checked
+- 임의 값: w-[400px], pt-[calc(62px+3rem)], text-[10px], z-[100] 등
+- 규칙 순서는 Tailwind 플러그인 순서를 따름 (p-4 px-6 처럼 겹치는 클래스의 우선순위 유지)
+"""
+import os
+import re
+import glob
+import hashlib
+
+STYLESHEET_DIR = os.path.join('static', 'css')
+STYLESHEET_PREFIX = 'utilities'
+# 템플릿에 들어가는 자리 표시 경로 → 빌드 후 지문 파일명으로 교체
+STYLESHEET_PLACEHOLDER = '/static/css/utilities.css'
+# 자리 표시 경로 + 이전 빌드의 지문 경로 (증분 빌드에서 다시 그리지 않은 페이지도 새 파일로 연결)
+STYLESHEET_PATTERN = re.compile(r'/static/css/utilities(?:\.[0-9a-f]{10})?\.css')
+
+
+# ============================================
+# 테마 (base.html 의 tailwind.config extend 값 + Tailwind 기본값)
+# ============================================
+
+def _palette(name, shades):
+    return {f'{name}-{step}': value for step, value in zip(
+        ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950'), shades.split())}
+
+
+COLORS = {
+    'inherit': 'inherit', 'current': 'currentColor', 'transparent': 'transparent',
+    'black': '#000000', 'white': '#ffffff',
+    **_palette('gray', '#f9fafb #f3f4f6 #e5e7eb #d1d5db #9ca3af #6b7280 #4b5563 #374151 #1f2937 #111827 #030712'),
+    **_palette('red', '#fef2f2 #fee2e2 #fecaca #fca5a5 #f87171 #ef4444 #dc2626 #b91c1c #991b1b #7f1d1d #450a0a'),
+    **_palette('yellow', '#fefce8 #fef9c3 #fef08a #fde047 #facc15 #eab308 #ca8a04 #a16207 #854d0e #713f12 #422006'),
+    **_palette('green', '#f0fdf4 #dcfce7 #bbf7d0 #86efac #4ade80 #22c55e #16a34a #15803d #166534 #14532d #052e16'),
+    **_palette('blue', '#eff6ff #dbeafe #bfdbfe #93c5fd #60a5fa #3b82f6 #2563eb #1d4ed8 #1e40af #1e3a8a #172554'),
+    **_palette('purple', '#faf5ff #f3e8ff #e9d5ff #d8b4fe #c084fc #a855f7 #9333ea #7e22ce #6b21a8 #581c87 #3b0764'),
+    # 사이트 테마
+    'light-50': '#ffffff', 'light-100': '#faf8f6', 'light-200': '#f5f3f0',
+    'light-300': '#e5e5e5', 'light-400': '#d4d4d4', 'light-500': '#a3a3a3',
+    'dark-900': '#0a0a0a', 'dark-800': '#1a1a1a', 'dark-700': '#333333',
+    'dark-600': '#444444', 'dark-500': '#555555', 'dark-400': '#888888',
+    'primary': '#7c3aed', 'primary-dark': '#6d28d9', 'primary-light': '#a78bfa',
+    'accent': '#09f', 'success': '#22c55e', 'warning': '#f59e0b',
+}
+
+FONT_SIZE = {
+    'xs': ('0.8rem', '1.5'), 'sm': ('0.9rem', '1.6'), 'base': ('1rem', '1.7'),
+    'lg': ('1.125rem', '1.6'), 'xl': ('1.25rem', '1.5'), '2xl': ('1.5rem', '1.35'),
+    '3xl': ('1.875rem', '1.25'), '4xl': ('2.25rem', '1.15'), '5xl': ('3rem', '1.1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+
+FONT_FAMILY = {
+    'sans': '"Wanted Sans Variable","Wanted Sans",-apple-system,BlinkMacSystemFont,system-ui,'
+            '"Apple SD Gothic Neo","Noto Sans KR",sans-serif',
+    'display': '"Wanted Sans Variable","Wanted Sans",-apple-system,BlinkMacSystemFont,system-ui,sans-serif',
+    'serif': 'ui-serif,Georgia,Cambria,"Times New Roman",Times,serif',
+    'mono': 'ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace',
+}
+
+FONT_WEIGHT = {
+    'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+    'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900',
+}
+
+LETTER_SPACING = {
+    'tighter': '-0.05em', 'tight': '-0.03em', 'snug': '-0.02em', 'normal': '-0.01em',
+    'wide': '0.025em', 'wider': '0.05em', 'widest': '0.1em',
+}
+
+LINE_HEIGHT = {
+    'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2',
+    '3': '.75rem', '4': '1rem', '5': '1.25rem', '6': '1.5rem', '7': '1.75rem', '8': '2rem',
+    '9': '2.25rem', '10': '2.5rem',
+}
+
+BORDER_RADIUS = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+    'xl': '0.75rem', '2xl': '1rem', '3xl': '1.25rem', '4xl': '1.5rem', 'full': '9999px',
+}
+
+MAX_WIDTH = {
+    'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+    '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+    'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content', 'prose': '65ch',
+    'screen-sm': '640px', 'screen-md': '768px', 'screen-lg': '1024px', 'screen-xl': '1280px',
+}
+
+BOX_SHADOW = {
+    'sm': '0 1px 2px 0 rgb(0 0 0/0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0/0.1),0 1px 2px -1px rgb(0 0 0/0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0/0.1),0 2px 4px -2px rgb(0 0 0/0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0/0.1),0 4px 6px -4px rgb(0 0 0/0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0/0.1),0 8px 10px -6px rgb(0 0 0/0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0/0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0/0.05)',
+    'none': '0 0 #0000',
+}
+
+BLUR = {'none': '0', 'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px', '2xl': '40px', '3xl': '64px'}
+
+OPACITY = ['0', '5', '10', '15', '20', '25', '30', '35', '40', '45', '50', '55', '60', '65', '70',
+           '75', '80', '85', '90', '95', '100']
+
+SCALE = ['0', '50', '75', '90', '95', '100', '105', '110', '125', '150']
+
+DURATION = ['0', '75', '100', '150', '200', '300', '500', '700', '1000']
+
+Z_INDEX = ['0', '10', '20', '30', '40', '50', 'auto']
+
+EASING = {
+    'linear': 'linear', 'in': 'cubic-bezier(0.4,0,1,1)',
+    'out': 'cubic-bezier(0,0,0.2,1)', 'in-out': 'cubic-bezier(0.4,0,0.2,1)',
+}
+
+TRANSITION_PROPERTY = {
+    '': 'color,background-color,border-color,text-decoration-color,fill,stroke,opacity,box-shadow,transform,filter,backdrop-filter',
+    'all': 'all',
+    'colors': 'color,background-color,border-color,text-decoration-color,fill,stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+    'none': 'none',
+}
+
+ANIMATION = {
+    'spin': ('spin 1s linear infinite', '@keyframes spin{to{transform:rotate(360deg)}}'),
+    'ping': ('ping 1s cubic-bezier(0,0,0.2,1) infinite',
+             '@keyframes ping{75%,100%{transform:scale(2);opacity:0}}'),
+    'pulse': ('pulse 2s cubic-bezier(0.4,0,0.6,1) infinite', '@keyframes pulse{50%{opacity:.5}}'),
+    'bounce': ('bounce 1s infinite',
+               '@keyframes bounce{0%,100%{transform:translateY(-25%);animation-timing-function:cubic-bezier(0.8,0,1,1)}'
+               '50%{transform:none;animation-timing-function:cubic-bezier(0,0,0.2,1)}}'),
+}
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+
+SPACING_STEPS = ['0', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10',
+                 '11', '12', '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56',
+                 '60', '64', '72', '80', '96']
+SPACING = {step: ('0px' if step == '0' else f'{float(step) / 4:g}rem') for step in SPACING_STEPS}
+SPACING['px'] = '1px'
+
+TRANSFORM = ('translate(var(--tw-translate-x),var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+
+# Tailwind 기본 스타일 초기화(preflight) + 변수 기본값
+PREFLIGHT = (
+    '*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;'
+    '--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-scale-x:1;--tw-scale-y:1;'
+    '--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;'
+    '--tw-ring-color:rgb(59 130 246/0.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;'
+    '--tw-shadow:0 0 #0000}'
+    '::before,::after{--tw-content:""}'
+    'html,:host{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;'
+    f'font-family:{FONT_FAMILY["sans"]};-webkit-tap-highlight-color:transparent}}'
+    'body{margin:0;line-height:inherit}'
+    'hr{height:0;color:inherit;border-top-width:1px}'
+    'abbr:where([title]){text-decoration:underline dotted}'
+    'h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}'
+    'a{color:inherit;text-decoration:inherit}'
+    'b,strong{font-weight:bolder}'
+    'code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace;font-size:1em}'
+    'small{font-size:80%}'
+    'sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}sub{bottom:-.25em}sup{top:-.5em}'
+    'table{text-indent:0;border-color:inherit;border-collapse:collapse}'
+    'button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;'
+    'font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;'
+    'letter-spacing:inherit;color:inherit;margin:0;padding:0}'
+    'button,select{text-transform:none}'
+    'button,input:where([type=button]),input:where([type=reset]),input:where([type=submit])'
+    '{-webkit-appearance:button;background-color:transparent;background-image:none}'
+    ':-moz-focusring{outline:auto}:-moz-ui-invalid{box-shadow:none}progress{vertical-align:baseline}'
+    '::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}'
+    '[type=search]{-webkit-appearance:textfield;outline-offset:-2px}'
+    '::-webkit-search-decoration{-webkit-appearance:none}'
+    '::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}summary{display:list-item}'
+    'blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}fieldset{margin:0;padding:0}legend{padding:0}'
+    'ol,ul,menu{list-style:none;margin:0;padding:0}dialog{padding:0}textarea{resize:vertical}'
+    'input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}'
+    'button,[role=button]{cursor:pointer}:disabled{cursor:default}'
+    'img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}'
+    'img,video{max-width:100%;height:auto}[hidden]{display:none}'
+)
+
+# 규칙 출력 순서 (Tailwind 코어 플러그인 순서)
+PLUGIN_ORDER = [
+    'container', 'accessibility', 'pointerEvents', 'visibility', 'position', 'inset', 'zIndex',
+    'order', 'gridColumn', 'float', 'margin', 'boxSizing', 'lineClamp', 'display', 'aspectRatio',
+    'height', 'maxHeight', 'minHeight', 'width', 'minWidth', 'maxWidth', 'flex', 'flexShrink',
+    'flexGrow', 'flexBasis', 'translate', 'rotate', 'scale', 'transform', 'animation', 'cursor',
+    'touchAction', 'userSelect', 'listStyle', 'appearance', 'gridTemplateColumns', 'flexDirection',
+    'flexWrap', 'alignItems', 'justifyContent', 'gap', 'space', 'divideWidth', 'divideColor',
+    'alignSelf', 'overflow', 'textOverflow', 'whitespace', 'wordBreak', 'borderRadius', 'borderWidth',
+    'borderStyle', 'borderColor', 'backgroundColor', 'backgroundImage', 'gradientColorStops',
+    'objectFit', 'objectPosition', 'padding', 'textAlign', 'verticalAlign', 'fontFamily', 'fontSize',
+    'fontWeight', 'textTransform', 'fontStyle', 'lineHeight', 'letterSpacing', 'textColor',
+    'textDecoration', 'fontSmoothing', 'opacity', 'boxShadow', 'boxShadowColor', 'outlineStyle', 'ringWidth',
+    'ringColor', 'blur', 'backdropBlur', 'transition', 'duration', 'ease',
+]
+PLUGIN_INDEX = {name: i for i, name in enumerate(PLUGIN_ORDER)}
+
+# 변형 → (종류, 선택자 조각, 정렬 순서)
+PSEUDO_VARIANTS = {
+    'first': ':first-child', 'last': ':last-child', 'odd': ':nth-child(odd)', 'even': ':nth-child(even)',
+    'checked': ':checked', 'focus-within': ':focus-within', 'hover': ':hover', 'focus': ':focus',
+    'focus-visible': ':focus-visible', 'active': ':active', 'disabled': ':disabled',
+    'placeholder': '::placeholder',
+}
+PSEUDO_ORDER = list(PSEUDO_VARIANTS)
+
+
+# ============================================
+# 값 해석
+# ============================================
+
+def _arbitrary(value):
+    """[...] 임의 값 → CSS 값 (밑줄은 공백, calc 안의 +,- 앞뒤 공백 보정)"""
+    if not (value.startswith('[') and value.endswith(']')) or len(value) < 3:
+        return None
+    inner = value[1:-1].replace('_', ' ')
+    if re.search(r'(calc|min|max|clamp)\(', inner):
+        inner = re.sub(r'(?<=[\w)%])([+\-])(?=[\w(.])', r' \1 ', inner)
+    return inner
+
+
+def _fraction(value):
+    match = re.fullmatch(r'(\d+)/(\d+)', value)
+    if not match or int(match.group(2)) == 0:
+        return None
+    return f'{int(match.group(1)) / int(match.group(2)) * 100:.6f}'.rstrip('0').rstrip('.') + '%'
+
+
+def _negate(value):
+    if value in ('0', '0px'):
+        return value
+    if value.startswith(('calc(', 'var(', 'min(', 'max(', 'clamp(')):
+        return f'calc({value} * -1)'
+    return value[1:] if value.startswith('-') else '-' + value
+
+
+def _spacing(value, extra=None):
+    """spacing 스케일 / 분수 / 임의 값 / 추가 키워드"""
+    if extra and value in extra:
+        return extra[value]
+    return SPACING.get(value) or _fraction(value) or _arbitrary(value)
+
+
+def _hex_to_rgb(hex_value):
+    digits = hex_value.lstrip('#')
+    if len(digits) == 3:
+        digits = ''.join(c * 2 for c in digits)
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _color(value):
+    """색상 키 (+ /투명도) → CSS 색상, 해석 불가면 None"""
+    alpha = None
+    if '/' in value and not value.startswith('['):
+        value, alpha = value.rsplit('/', 1)
+        alpha = (_arbitrary(alpha) if alpha.startswith('[')
+                 else (f'{int(alpha) / 100:g}' if alpha.isdigit() else None))
+        if alpha is None:
+            return None
+
+    color = COLORS.get(value)
+    if color is None:
+        arbitrary = _arbitrary(value)
+        if arbitrary and re.match(r'(#|rgb|hsl)', arbitrary):
+            color = arbitrary
+    if color is None:
+        return None
+    if alpha is None or not color.startswith('#'):
+        return color
+    r, g, b = _hex_to_rgb(color)
+    return f'rgb({r} {g} {b}/{alpha})'
+
+
+def _transparent(color):
+    """그라데이션 끝점용 - 같은 색의 투명 버전"""
+    if color.startswith('#'):
+        r, g, b = _hex_to_rgb(color)
+        return f'rgb({r} {g} {b}/0)'
+    if color.startswith('rgb('):
+        return re.sub(r'/[^)]*\)$', '/0)', color)
+    return 'transparent'
+
+
+# ============================================
+# 유틸리티 → 선언
+# ============================================
+
+CHILDREN = '>:not([hidden])~:not([hidden])'
+
+
+def _rule(plugin, declarations, sub=0, suffix=''):
+    return (plugin, sub, suffix, declarations)
+
+
+SIDES = {
+    '': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'),
+    't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',),
+}
+SIDE_SUB = {'': 0, 'x': 1, 'y': 1, 't': 2, 'r': 2, 'b': 2, 'l': 2}
+
+STATIC_UTILITIES = {
+    'sr-only': ('accessibility', 'position:absolute;width:1px;height:1px;padding:0;margin:-1px;'
+                'overflow:hidden;clip:rect(0,0,0,0);white-space:nowrap;border-width:0'),
+    'not-sr-only': ('accessibility', 'position:static;width:auto;height:auto;padding:0;margin:0;'
+                    'overflow:visible;clip:auto;white-space:normal'),
+    'pointer-events-none': ('pointerEvents', 'pointer-events:none'),
+    'pointer-events-auto': ('pointerEvents', 'pointer-events:auto'),
+    'visible': ('visibility', 'visibility:visible'),
+    'invisible': ('visibility', 'visibility:hidden'),
+    'static': ('position', 'position:static'), 'fixed': ('position', 'position:fixed'),
+    'absolute': ('position', 'position:absolute'), 'relative': ('position', 'position:relative'),
+    'sticky': ('position', 'position:sticky'),
+    'col-span-full': ('gridColumn', 'grid-column:1/-1'),
+    'float-left': ('float', 'float:left'), 'float-right': ('float', 'float:right'),
+    'float-none': ('float', 'float:none'),
+    'box-border': ('boxSizing', 'box-sizing:border-box'), 'box-content': ('boxSizing', 'box-sizing:content-box'),
+    'line-clamp-none': ('lineClamp', 'overflow:visible;display:block;-webkit-box-orient:horizontal;-webkit-line-clamp:none'),
+    'block': ('display', 'display:block'), 'inline-block': ('display', 'display:inline-block'),
+    'inline': ('display', 'display:inline'), 'flex': ('display', 'display:flex'),
+    'inline-flex': ('display', 'display:inline-flex'), 'table': ('display', 'display:table'),
+    'grid': ('display', 'display:grid'), 'inline-grid': ('display', 'display:inline-grid'),
+    'contents': ('display', 'display:contents'), 'list-item': ('display', 'display:list-item'),
+    'hidden': ('display', 'display:none'),
+    'aspect-auto': ('aspectRatio', 'aspect-ratio:auto'), 'aspect-square': ('aspectRatio', 'aspect-ratio:1/1'),
+    'aspect-video': ('aspectRatio', 'aspect-ratio:16/9'),
+    'flex-1': ('flex', 'flex:1 1 0%'), 'flex-auto': ('flex', 'flex:1 1 auto'),
+    'flex-initial': ('flex', 'flex:0 1 auto'), 'flex-none': ('flex', 'flex:none'),
+    'shrink': ('flexShrink', 'flex-shrink:1'), 'shrink-0': ('flexShrink', 'flex-shrink:0'),
+    'flex-shrink': ('flexShrink', 'flex-shrink:1'), 'flex-shrink-0': ('flexShrink', 'flex-shrink:0'),
+    'grow': ('flexGrow', 'flex-grow:1'), 'grow-0': ('flexGrow', 'flex-grow:0'),
+    'flex-grow': ('flexGrow', 'flex-grow:1'), 'flex-grow-0': ('flexGrow', 'flex-grow:0'),
+    'transform': ('transform', f'transform:{TRANSFORM}'), 'transform-none': ('transform', 'transform:none'),
+    'touch-auto': ('touchAction', 'touch-action:auto'), 'touch-none': ('touchAction', 'touch-action:none'),
+    'touch-manipulation': ('touchAction', 'touch-action:manipulation'),
+    'touch-pan-x': ('touchAction', 'touch-action:pan-x'), 'touch-pan-y': ('touchAction', 'touch-action:pan-y'),
+    'select-none': ('userSelect', 'user-select:none'), 'select-text': ('userSelect', 'user-select:text'),
+    'select-all': ('userSelect', 'user-select:all'), 'select-auto': ('userSelect', 'user-select:auto'),
+    'list-none': ('listStyle', 'list-style-type:none'), 'list-disc': ('listStyle', 'list-style-type:disc'),
+    'list-decimal': ('listStyle', 'list-style-type:decimal'),
+    'appearance-none': ('appearance', 'appearance:none'),
+    'flex-row': ('flexDirection', 'flex-direction:row'), 'flex-row-reverse': ('flexDirection', 'flex-direction:row-reverse'),
+    'flex-col': ('flexDirection', 'flex-direction:column'),
+    'flex-col-reverse': ('flexDirection', 'flex-direction:column-reverse'),
+    'flex-wrap': ('flexWrap', 'flex-wrap:wrap'), 'flex-nowrap': ('flexWrap', 'flex-wrap:nowrap'),
+    'items-start': ('alignItems', 'align-items:flex-start'), 'items-end': ('alignItems', 'align-items:flex-end'),
+    'items-center': ('alignItems', 'align-items:center'), 'items-baseline': ('alignItems', 'align-items:baseline'),
+    'items-stretch': ('alignItems', 'align-items:stretch'),
+    'justify-start': ('justifyContent', 'justify-content:flex-start'),
+    'justify-end': ('justifyContent', 'justify-content:flex-end'),
+    'justify-center': ('justifyContent', 'justify-content:center'),
+    'justify-between': ('justifyContent', 'justify-content:space-between'),
+    'justify-around': ('justifyContent', 'justify-content:space-around'),
+    'justify-evenly': ('justifyContent', 'justify-content:space-evenly'),
+    'self-auto': ('alignSelf', 'align-self:auto'), 'self-start': ('alignSelf', 'align-self:flex-start'),
+    'self-end': ('alignSelf', 'align-self:flex-end'), 'self-center': ('alignSelf', 'align-self:center'),
+    'self-stretch': ('alignSelf', 'align-self:stretch'),
+    'truncate': ('textOverflow', 'overflow:hidden;text-overflow:ellipsis;white-space:nowrap'),
+    'text-ellipsis': ('textOverflow', 'text-overflow:ellipsis'),
+    'whitespace-normal': ('whitespace', 'white-space:normal'), 'whitespace-nowrap': ('whitespace', 'white-space:nowrap'),
+    'whitespace-pre': ('whitespace', 'white-space:pre'), 'whitespace-pre-line': ('whitespace', 'white-space:pre-line'),
+    'whitespace-pre-wrap': ('whitespace', 'white-space:pre-wrap'),
+    'break-normal': ('wordBreak', 'overflow-wrap:normal;word-break:normal'),
+    'break-words': ('wordBreak', 'overflow-wrap:break-word'), 'break-all': ('wordBreak', 'word-break:break-all'),
+    'break-keep': ('wordBreak', 'word-break:keep-all'),
+    'border-solid': ('borderStyle', 'border-style:solid'), 'border-dashed': ('borderStyle', 'border-style:dashed'),
+    'border-dotted': ('borderStyle', 'border-style:dotted'), 'border-none': ('borderStyle', 'border-style:none'),
+    'object-contain': ('objectFit', 'object-fit:contain'), 'object-cover': ('objectFit', 'object-fit:cover'),
+    'object-fill': ('objectFit', 'object-fit:fill'), 'object-none': ('objectFit', 'object-fit:none'),
+    'object-top': ('objectPosition', 'object-position:top'), 'object-center': ('objectPosition', 'object-position:center'),
+    'object-bottom': ('objectPosition', 'object-position:bottom'),
+    'text-left': ('textAlign', 'text-align:left'), 'text-center': ('textAlign', 'text-align:center'),
+    'text-right': ('textAlign', 'text-align:right'), 'text-justify': ('textAlign', 'text-align:justify'),
+    'align-top': ('verticalAlign', 'vertical-align:top'), 'align-middle': ('verticalAlign', 'vertical-align:middle'),
+    'align-bottom': ('verticalAlign', 'vertical-align:bottom'),
+    'uppercase': ('textTransform', 'text-transform:uppercase'), 'lowercase': ('textTransform', 'text-transform:lowercase'),
+    'capitalize': ('textTransform', 'text-transform:capitalize'), 'normal-case': ('textTransform', 'text-transform:none'),
+    'italic': ('fontStyle', 'font-style:italic'), 'not-italic': ('fontStyle', 'font-style:normal'),
+    'underline': ('textDecoration', 'text-decoration-line:underline'),
+    'line-through': ('textDecoration', 'text-decoration-line:line-through'),
+    'no-underline': ('textDecoration', 'text-decoration-line:none'),
+    'antialiased': ('fontSmoothing', '-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale'),
+    'subpixel-antialiased': ('fontSmoothing', '-webkit-font-smoothing:auto;-moz-osx-font-smoothing:auto'),
+    'outline-none': ('outlineStyle', 'outline:2px solid transparent;outline-offset:2px'),
+    'bg-none': ('backgroundImage', 'background-image:none'),
+}
+
+OVERFLOW_VALUES = ('auto', 'hidden', 'clip', 'visible', 'scroll')
+CURSOR_VALUES = ('auto', 'default', 'pointer', 'wait', 'text', 'move', 'help', 'not-allowed', 'none',
+                 'progress', 'cell', 'crosshair', 'zoom-in', 'zoom-out', 'grab', 'grabbing')
+GRADIENT_DIRECTIONS = {'t': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right',
+                       'b': 'bottom', 'bl': 'bottom left', 'l': 'left', 'tl': 'top left'}
+SIZE_KEYWORDS = {'auto': 'auto', 'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+SIZE_PROPERTIES = {
+    'w': ('width', 'width'), 'h': ('height', 'height'),
+    'min-w': ('minWidth', 'min-width'), 'min-h': ('minHeight', 'min-height'),
+    'max-w': ('maxWidth', 'max-width'), 'max-h': ('maxHeight', 'max-height'),
+}
+
+
+def _split_value(utility, prefixes):
+    """가장 긴 접두어로 (접두어, 값) 분리"""
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if utility.startswith(prefix + '-'):
+            return prefix, utility[len(prefix) + 1:]
+    return None, None
+
+
+def resolve_utility(utility, negative=False):
+    """
+    유틸리티 하나 → [(플러그인, 하위 순서, 선택자 접미사, 선언)] / 해석 불가면 []
+    """
+    static = STATIC_UTILITIES.get(utility)
+    if static and not negative:
+        return [_rule(static[0], static[1])]
+
+    # --- 음수 허용: 위치/여백/변형/z-index ---
+    prefix, value = _split_value(utility, ('inset', 'inset-x', 'inset-y', 'top', 'right', 'bottom', 'left'))
+    if prefix:
+        css = _spacing(value, SIZE_KEYWORDS)
+        if css is None:
+            return []
+        css = _negate(css) if negative else css
+        props = {'inset': ('top', 'right', 'bottom', 'left'), 'inset-x': ('left', 'right'),
+                 'inset-y': ('top', 'bottom')}.get(prefix, (prefix,))
+        sub = 0 if prefix == 'inset' else (1 if prefix.startswith('inset') else 2)
+        return [_rule('inset', ';'.join(f'{p}:{css}' for p in props), sub)]
+
+    prefix, value = _split_value(utility, ('m', 'mx', 'my', 'mt', 'mr', 'mb', 'ml'))
+    if prefix:
+        css = _spacing(value, {'auto': 'auto'})
+        if css is None:
+            return []
+        css = _negate(css) if negative else css
+        side = prefix[1:]
+        return [_rule('margin', ';'.join(f'margin{s}:{css}' for s in SIDES[side]), SIDE_SUB[side])]
+
+    prefix, value = _split_value(utility, ('translate-x', 'translate-y'))
+    if prefix:
+        css = _spacing(value, {'full': '100%'})
+        if css is None:
+            return []
+        css = _negate(css) if negative else css
+        axis = prefix[-1]
+        return [_rule('translate', f'--tw-translate-{axis}:{css};transform:{TRANSFORM}')]
+
+    prefix, value = _split_value(utility, ('scale', 'scale-x', 'scale-y'))
+    if prefix:
+        css = f'{int(value) / 100:g}' if value in SCALE else _arbitrary(value)
+        if css is None:
+            return []
+        css = _negate(css) if negative else css
+        axes = ('x', 'y') if prefix == 'scale' else (prefix[-1],)
+        return [_rule('scale', ''.join(f'--tw-scale-{a}:{css};' for a in axes) + f'transform:{TRANSFORM}')]
+
+    prefix, value = _split_value(utility, ('rotate',))
+    if prefix:
+        css = f'{value}deg' if value.isdigit() else _arbitrary(value)
+        if css is None:
+            return []
+        css = _negate(css) if negative else css
+        return [_rule('rotate', f'--tw-rotate:{css};transform:{TRANSFORM}')]
+
+    prefix, value = _split_value(utility, ('z',))
+    if prefix:
+        css = value if value in Z_INDEX else _arbitrary(value)
+        if css is None:
+            return []
+        return [_rule('zIndex', f'z-index:{_negate(css) if negative else css}')]
+
+    if negative:
+        return []
+
+    # --- 배치/크기 ---
+    prefix, value = _split_value(utility, ('order',))
+    if prefix:
+        css = {'first': '-9999', 'last': '9999', 'none': '0'}.get(value) or (value if value.isdigit() else None)
+        return [_rule('order', f'order:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('col-span',))
+    if prefix:
+        return [_rule('gridColumn', f'grid-column:span {value}/span {value}')] if value.isdigit() else []
+
+    prefix, value = _split_value(utility, ('line-clamp',))
+    if prefix:
+        if not value.isdigit():
+            return []
+        return [_rule('lineClamp', 'overflow:hidden;display:-webkit-box;-webkit-box-orient:vertical;'
+                                   f'-webkit-line-clamp:{value}')]
+
+    prefix, value = _split_value(utility, ('aspect',))
+    if prefix:
+        css = _arbitrary(value)
+        return [_rule('aspectRatio', f'aspect-ratio:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('w', 'h', 'size', 'min-w', 'min-h', 'max-w', 'max-h'))
+    if prefix:
+        axis = 'width' if prefix.endswith('w') else 'height'
+        extra = dict(SIZE_KEYWORDS, screen='100vw' if axis == 'width' else '100vh',
+                     svh='100svh', dvh='100dvh')
+        if prefix == 'max-w':
+            css = MAX_WIDTH.get(value) or _arbitrary(value)
+        elif prefix.startswith('min'):
+            css = ({'0': '0px', **SIZE_KEYWORDS, 'screen': extra['screen']}.get(value)
+                   or _arbitrary(value))
+        else:
+            css = _spacing(value, extra)
+        if css is None:
+            return []
+        if prefix == 'size':
+            return [_rule('width', f'width:{css};height:{css}')]
+        plugin, prop = SIZE_PROPERTIES[prefix]
+        return [_rule(plugin, f'{prop}:{css}')]
+
+    prefix, value = _split_value(utility, ('basis',))
+    if prefix:
+        css = _spacing(value, SIZE_KEYWORDS)
+        return [_rule('flexBasis', f'flex-basis:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('animate',))
+    if prefix:
+        if value == 'none':
+            return [_rule('animation', 'animation:none')]
+        if value not in ANIMATION:
+            return []
+        animation, keyframes = ANIMATION[value]
+        return [_rule('animation', f'animation:{animation}', suffix=('@keyframes', keyframes))]
+
+    prefix, value = _split_value(utility, ('cursor',))
+    if prefix:
+        return [_rule('cursor', f'cursor:{value}')] if value in CURSOR_VALUES else []
+
+    prefix, value = _split_value(utility, ('grid-cols',))
+    if prefix:
+        if value.isdigit():
+            return [_rule('gridTemplateColumns', f'grid-template-columns:repeat({value},minmax(0,1fr))')]
+        css = _arbitrary(value) if value != 'none' else 'none'
+        return [_rule('gridTemplateColumns', f'grid-template-columns:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('gap', 'gap-x', 'gap-y'))
+    if prefix:
+        css = _spacing(value)
+        if css is None:
+            return []
+        prop = {'gap': 'gap', 'gap-x': 'column-gap', 'gap-y': 'row-gap'}[prefix]
+        return [_rule('gap', f'{prop}:{css}', 0 if prefix == 'gap' else 1)]
+
+    prefix, value = _split_value(utility, ('space-x', 'space-y'))
+    if prefix:
+        css = _spacing(value)
+        if css is None:
+            return []
+        prop = 'margin-left' if prefix == 'space-x' else 'margin-top'
+        return [_rule('space', f'{prop}:{css}', suffix=CHILDREN)]
+
+    if utility in ('divide-x', 'divide-y') or utility.startswith(('divide-x-', 'divide-y-')):
+        axis = utility[7]
+        width = utility[9:] or '1'
+        if not width.isdigit():
+            return []
+        start, end = ('left', 'right') if axis == 'x' else ('top', 'bottom')
+        return [_rule('divideWidth', f'border-{start}-width:{width}px;border-{end}-width:0', suffix=CHILDREN)]
+
+    prefix, value = _split_value(utility, ('divide',))
+    if prefix:
+        css = _color(value)
+        return [_rule('divideColor', f'border-color:{css}', suffix=CHILDREN)] if css else []
+
+    prefix, value = _split_value(utility, ('overflow', 'overflow-x', 'overflow-y'))
+    if prefix:
+        if value not in OVERFLOW_VALUES:
+            return []
+        return [_rule('overflow', f'{prefix}:{value}', 0 if prefix == 'overflow' else 1)]
+
+    # --- 테두리 ---
+    if utility == 'rounded' or utility.startswith('rounded-'):
+        rest = utility[8:]
+        side, size = '', rest
+        match = re.fullmatch(r'(t|r|b|l|tl|tr|br|bl)(?:-(.*))?', rest)
+        if match:
+            side, size = match.group(1), match.group(2) or ''
+        css = BORDER_RADIUS.get(size) if size in BORDER_RADIUS else _arbitrary(size)
+        if css is None:
+            return []
+        corners = {
+            '': ('border-radius',),
+            't': ('border-top-left-radius', 'border-top-right-radius'),
+            'r': ('border-top-right-radius', 'border-bottom-right-radius'),
+            'b': ('border-bottom-right-radius', 'border-bottom-left-radius'),
+            'l': ('border-top-left-radius', 'border-bottom-left-radius'),
+            'tl': ('border-top-left-radius',), 'tr': ('border-top-right-radius',),
+            'br': ('border-bottom-right-radius',), 'bl': ('border-bottom-left-radius',),
+        }[side]
+        return [_rule('borderRadius', ';'.join(f'{c}:{css}' for c in corners), 0 if not side else len(side))]
+
+    match = re.fullmatch(r'border(?:-([xytrbl]))?(?:-(\d+|\[.+\]))?', utility)
+    if match:
+        side, width = match.group(1) or '', match.group(2)
+        css = '1px' if width is None else (f'{width}px' if width.isdigit() else _arbitrary(width))
+        props = [f'border{s}-width' for s in SIDES[side]]
+        return [_rule('borderWidth', ';'.join(f'{p}:{css}' for p in props), SIDE_SUB[side])]
+
+    prefix, value = _split_value(utility, ('border', 'border-x', 'border-y', 'border-t', 'border-r', 'border-b', 'border-l'))
+    if prefix:
+        css = _color(value)
+        if css is None:
+            return []
+        side = prefix[7:]
+        props = [f'border{s}-color' for s in SIDES[side]]
+        return [_rule('borderColor', ';'.join(f'{p}:{css}' for p in props), SIDE_SUB[side])]
+
+    # --- 배경 ---
+    prefix, value = _split_value(utility, ('bg-gradient-to',))
+    if prefix:
+        direction = GRADIENT_DIRECTIONS.get(value)
+        if direction is None:
+            return []
+        return [_rule('backgroundImage', f'background-image:linear-gradient(to {direction},var(--tw-gradient-stops))')]
+
+    prefix, value = _split_value(utility, ('from', 'via', 'to'))
+    if prefix:
+        css = _color(value)
+        if css is None:
+            return []
+        if prefix == 'from':
+            decl = (f'--tw-gradient-from:{css};--tw-gradient-to:{_transparent(css)};'
+                    '--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)')
+        elif prefix == 'via':
+            decl = (f'--tw-gradient-to:{_transparent(css)};'
+                    f'--tw-gradient-stops:var(--tw-gradient-from),{css},var(--tw-gradient-to)')
+        else:
+            decl = f'--tw-gradient-to:{css}'
+        return [_rule('gradientColorStops', decl, ('from', 'via', 'to').index(prefix))]
+
+    prefix, value = _split_value(utility, ('bg',))
+    if prefix:
+        css = _color(value)
+        return [_rule('backgroundColor', f'background-color:{css}')] if css else []
+
+    # --- 여백 ---
+    prefix, value = _split_value(utility, ('p', 'px', 'py', 'pt', 'pr', 'pb', 'pl'))
+    if prefix:
+        css = _spacing(value)
+        if css is None:
+            return []
+        side = prefix[1:]
+        return [_rule('padding', ';'.join(f'padding{s}:{css}' for s in SIDES[side]), SIDE_SUB[side])]
+
+    # --- 글꼴 ---
+    prefix, value = _split_value(utility, ('font',))
+    if prefix:
+        if value in FONT_WEIGHT:
+            return [_rule('fontWeight', f'font-weight:{FONT_WEIGHT[value]}')]
+        if value in FONT_FAMILY:
+            return [_rule('fontFamily', f'font-family:{FONT_FAMILY[value]}')]
+        return []
+
+    prefix, value = _split_value(utility, ('text',))
+    if prefix:
+        if value in FONT_SIZE:
+            size, line_height = FONT_SIZE[value]
+            return [_rule('fontSize', f'font-size:{size};line-height:{line_height}')]
+        color = _color(value)
+        if color:
+            return [_rule('textColor', f'color:{color}')]
+        css = _arbitrary(value)
+        return [_rule('fontSize', f'font-size:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('leading',))
+    if prefix:
+        css = LINE_HEIGHT.get(value) or _arbitrary(value)
+        return [_rule('lineHeight', f'line-height:{css}')] if css else []
+
+    prefix, value = _split_value(utility, ('tracking',))
+    if prefix:
+        css = LETTER_SPACING.get(value) or _arbitrary(value)
+        return [_rule('letterSpacing', f'letter-spacing:{css}')] if css else []
+
+    # --- 효과 ---
+    prefix, value = _split_value(utility, ('opacity',))
+    if prefix:
+        css = f'{int(value) / 100:g}' if value in OPACITY else _arbitrary(value)
+        return [_rule('opacity', f'opacity:{css}')] if css else []
+
+    if utility == 'shadow' or utility.startswith('shadow-'):
+        shadow = BOX_SHADOW.get(utility[7:])
+        if shadow is None:
+            # 그림자 색상 (shadow-primary/30): 크기 클래스가 만든 --tw-shadow-colored 사용
+            color = _color(utility[7:])
+            if color is None:
+                return []
+            return [_rule('boxShadowColor', f'--tw-shadow-color:{color};--tw-shadow:var(--tw-shadow-colored)')]
+        colored = re.sub(r'rgb\(0 0 0/[\d.]+\)', 'var(--tw-shadow-color)', shadow)
+        return [_rule('boxShadow', f'--tw-shadow:{shadow};--tw-shadow-colored:{colored};'
+                                   'box-shadow:var(--tw-ring-offset-shadow,0 0 #0000),'
+                                   'var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow)')]
+
+    match = re.fullmatch(r'ring(?:-(\d+))?', utility)
+    if match:
+        width = match.group(1) or '3'
+        return [_rule('ringWidth',
+                      '--tw-ring-offset-shadow:var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color);'
+                      f'--tw-ring-shadow:var(--tw-ring-inset) 0 0 0 calc({width}px + var(--tw-ring-offset-width)) var(--tw-ring-color);'
+                      'box-shadow:var(--tw-ring-offset-shadow),var(--tw-ring-shadow),var(--tw-shadow,0 0 #0000)')]
+
+    prefix, value = _split_value(utility, ('ring',))
+    if prefix:
+        css = _color(value)
+        return [_rule('ringColor', f'--tw-ring-color:{css}')] if css else []
+
+    if utility == 'blur' or utility.startswith('blur-'):
+        css = BLUR.get(utility[5:])
+        return [_rule('blur', f'filter:blur({css})')] if css is not None else []
+
+    if utility == 'backdrop-blur' or utility.startswith('backdrop-blur-'):
+        css = BLUR.get(utility[14:])
+        if css is None:
+            return []
+        return [_rule('backdropBlur', f'-webkit-backdrop-filter:blur({css});backdrop-filter:blur({css})')]
+
+    # --- 전환 ---
+    if utility == 'transition' or utility.startswith('transition-'):
+        properties = TRANSITION_PROPERTY.get(utility[11:])
+        if properties is None:
+            return []
+        if properties == 'none':
+            return [_rule('transition', 'transition-property:none')]
+        return [_rule('transition', f'transition-property:{properties};'
+                                    'transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms')]
+
+    prefix, value = _split_value(utility, ('duration',))
+    if prefix:
+        return [_rule('duration', f'transition-duration:{value}ms')] if value in DURATION else []
+
+    prefix, value = _split_value(utility, ('ease',))
+    if prefix:
+        css = EASING.get(value)
+        return [_rule('ease', f'transition-timing-function:{css}')] if css else []
+
+    return []
+
+
+# ============================================
+# 클래스 → 규칙
+# ============================================
+
+def _split_variants(class_name):
+    """'md:hover:w-[calc(100%-1rem)]' → ['md', 'hover', 'w-[...]'] (대괄호 안 ':'는 무시)"""
+    parts, depth, current = [], 0, ''
+    for char in class_name:
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        if char == ':' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def escape_class(class_name):
+    """CSS 선택자용 클래스명 이스케이프"""
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', class_name)
+
+
+def compile_class(class_name):
+    """
+    클래스 하나 → [(정렬 키, 미디어 쿼리, 선택자, 선언 또는 @keyframes)]
+    """
+    *variants, utility = _split_variants(class_name)
+    if not utility:
+        return []
+    negative = utility.startswith('-')
+    rules = resolve_utility(utility[1:] if negative else utility, negative)
+    if not rules:
+        return []
+
+    media_index, media = 0, None
+    pseudo, prefix_selector, pseudo_order = '', '', []
+    for variant in variants:
+        if variant in SCREENS:
+            media_index = list(SCREENS).index(variant) + 1
+            media = f'@media (min-width:{SCREENS[variant]})'
+        elif variant in PSEUDO_VARIANTS:
+            pseudo += PSEUDO_VARIANTS[variant]
+            pseudo_order.append(PSEUDO_ORDER.index(variant))
+        elif variant.startswith('group-') and variant[6:] in PSEUDO_VARIANTS:
+            prefix_selector = f'.group{PSEUDO_VARIANTS[variant[6:]]} '
+            pseudo_order.append(len(PSEUDO_ORDER) + PSEUDO_ORDER.index(variant[6:]))
+        elif variant.startswith('peer-') and variant[5:] in PSEUDO_VARIANTS:
+            prefix_selector = f'.peer{PSEUDO_VARIANTS[variant[5:]]}~'
+            pseudo_order.append(2 * len(PSEUDO_ORDER) + PSEUDO_ORDER.index(variant[5:]))
+        else:
+            return []
+
+    compiled = []
+    for plugin, sub, suffix, declarations in rules:
+        selector = f'{prefix_selector}.{escape_class(class_name)}{pseudo}'
+        key = (media_index, tuple(pseudo_order), PLUGIN_INDEX[plugin], sub, class_name)
+        if isinstance(suffix, tuple):
+            # 애니메이션: 규칙 + @keyframes (중복은 compile_css에서 제거)
+            compiled.append((key, media, selector, declarations))
+            compiled.append(((-1,), None, suffix[0], suffix[1]))
+        else:
+            compiled.append((key, media, selector + suffix, declarations))
+    return compiled
+
+
+def compile_css(class_names):
+    """
+    클래스 목록 → 최소화된 CSS (preflight + 유틸리티)
+
+    Returns:
+        (css 문자열, 생성된 클래스 수)
+    """
+    rules, keyframes, generated = [], [], 0
+    for class_name in sorted(set(class_names)):
+        compiled = compile_class(class_name)
+        if compiled:
+            generated += 1
+        for key, media, selector, declarations in compiled:
+            if selector == '@keyframes':
+                if declarations not in keyframes:
+                    keyframes.append(declarations)
+            else:
+                rules.append((key, media, selector, declarations))
+    rules.sort(key=lambda rule: rule[0])
+
+    parts = [PREFLIGHT, *keyframes]
+    current_media, block = None, []
+    for _, media, selector, declarations in rules:
+        if media != current_media:
+            if block:
+                parts.append(f'{current_media}{{{"".join(block)}}}' if current_media else ''.join(block))
+            current_media, block = media, []
+        block.append(f'{selector}{{{declarations}}}')
+    if block:
+        parts.append(f'{current_media}{{{"".join(block)}}}' if current_media else ''.join(block))
+    return ''.join(parts), generated
+
+
+# ============================================
+# 빌드 단계
+# ============================================
+
+CLASS_ATTRIBUTE = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+STRING_LITERAL = re.compile(r'\'([^\'\n]*)\'|"([^"\n]*)"|`([^`]*)`')
+CANDIDATE = re.compile(r'^[!-]?[a-z0-9\[][a-zA-Z0-9_\-:./\[\]#%()+,!]*$')
+
+
+def _candidates_from_strings(text):
+    for match in STRING_LITERAL.finditer(text):
+        for token in (match.group(1) or match.group(2) or match.group(3) or '').split():
+            yield token
+
+
+def candidates_in_html(html):
+    """HTML 한 페이지의 class 속성 + 인라인 스크립트 문자열에서 클래스 후보"""
+    candidates = set()
+    for match in CLASS_ATTRIBUTE.finditer(html):
+        candidates.update((match.group(1) or match.group(2)).split())
+    for script in SCRIPT_BLOCK.findall(html):
+        candidates.update(_candidates_from_strings(script))
+    return {c for c in candidates if CANDIDATE.match(c)}
+
+
+def candidates_in_script(source):
+    """외부 스크립트 파일 문자열에서 클래스 후보"""
+    return {c for c in _candidates_from_strings(source) if CANDIDATE.match(c)}
+
+
+def collect_candidates(dist_dir):
+    """
+    dist/ 의 HTML class 속성 + 인라인/외부 스크립트 문자열에서 클래스 후보 수집
+    (스크립트에서 classList.add('hidden') 처럼 붙이는 클래스도 포함)
+    """
+    candidates = set()
+    for path in glob.glob(os.path.join(dist_dir, '**', '*.html'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            candidates.update(candidates_in_html(f.read()))
+    for path in glob.glob(os.path.join(dist_dir, 'static', 'js', '*.js')):
+        with open(path, encoding='utf-8') as f:
+            candidates.update(candidates_in_script(f.read()))
+    return candidates
+
+
+def build_stylesheet(dist_dir):
+    """
+    유틸리티 CSS 생성 → static/css/utilities.<hash>.css 저장
+
+    HTML의 스타일시트 경로(STYLESHEET_PATTERN)는 build.py 가 웹폰트 태그와 함께 한 번에 교체한다.
+
+    Returns:
+        dict: {'url', 'classes', 'bytes'}
+    """
+    css, generated = compile_css(collect_candidates(dist_dir))
+    body = css.encode('utf-8')
+    filename = f'{STYLESHEET_PREFIX}.{hashlib.sha1(body).hexdigest()[:10]}.css'
+    css_dir = os.path.join(dist_dir, STYLESHEET_DIR)
+    os.makedirs(css_dir, exist_ok=True)
+
+    # 이전 빌드의 지문 파일 정리
+    for old in glob.glob(os.path.join(css_dir, f'{STYLESHEET_PREFIX}.*.css')):
+        if os.path.basename(old) != filename:
+            os.remove(old)
+    with open(os.path.join(css_dir, filename), 'wb') as f:
+        f.write(body)
+
+    url = f'/{STYLESHEET_DIR.replace(os.sep, "/")}/{filename}'
+    return {'url': url, 'classes': generated, 'bytes': len(body)}
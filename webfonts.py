@@ -0,0 +1,296 @@
+"""
+공개 페이지용 웹폰트 서브셋 생성 (빌드 시, jsdelivr CDN 폰트 대체)
+
+fonts/ 에 둔 원본 폰트(FONT_FACES)를 렌더링된 사이트에서 실제로 쓰는 글자 +
+기본 한글 범위(KS X 1001 완성형 2350자, 한글 자모, ASCII)로 줄여
+dist/static/fonts/ 에 woff2 조각 파일로 저장하고, unicode-range 를 붙인
+@font-face 스타일시트(static/css/fonts.<hash>.css)를 만든다.
+
+조각 나누기 (plan_slices):
+- 0번 조각: 사이트에서 쓰는 한글 중 자주 나오는 PRIMARY_SLICE_HANGUL 자 + 한글 외 글자 전부
+  → 대부분의 페이지는 이 조각 하나로 충분 (<link rel="preload"> 대상)
+- 나머지: 코드 포인트 순으로 고정 경계(기본 범위 SLICE_SIZE 자마다)에서 분할
+  → 새 글이 드문 글자를 추가해도 해당 조각 하나만 바뀐다
+브라우저는 페이지 글자가 속한 unicode-range 조각만 내려받는다.
+
+조각 파일명은 원본 폰트 + 글자 목록의 해시라서 바뀌지 않은 조각은 다시 만들지 않는다.
+fontTools(+ woff2 압축용 brotli)가 없거나 원본 폰트가 없으면 해당 폰트는 기존 CDN 태그를 그대로 쓴다.
+"""
+import os
+import re
+import glob
+import html
+import hashlib
+from collections import Counter
+
+FONT_SOURCE_DIR = 'fonts'
+FONT_OUTPUT_DIR = os.path.join('static', 'fonts')
+STYLESHEET_DIR = os.path.join('static', 'css')
+STYLESHEET_PREFIX = 'fonts'
+SUBSET_VERSION = 1          # 서브셋 옵션을 바꾸면 올려서 캐시된 조각을 다시 생성
+
+# partials/_head.html 의 자리 표시 주석 쌍 → 빌드 후 그 사이를 preload + 스타일시트 링크로 교체
+# (주석은 남겨 두므로 증분 빌드에서 다시 그리지 않은 페이지의 태그도 매번 새로 교체된다)
+WEBFONT_BLOCK = '<!-- webfonts -->{}<!-- /webfonts -->'
+WEBFONT_PATTERN = re.compile(r'<!-- webfonts -->.*?<!-- /webfonts -->', re.S)
+
+PRIMARY_SLICE_HANGUL = 600  # 0번 조각에 넣을 자주 쓰는 한글 수
+SLICE_SIZE = 300            # 나머지 조각의 기본 범위 글자 수
+
+# 원본 폰트 (sources 중 fonts/ 에 있는 첫 파일 사용)
+# - base: 기본 한글 범위 포함 여부 (본문 폰트만, 장식 폰트는 사이트에서 쓰는 글자만)
+# - preload: 0번 조각을 <link rel="preload"> 로 미리 받기
+# - cdn: 원본이 없을 때 쓸 기존 태그
+FONT_FACES = [
+    {
+        'family': 'Wanted Sans Variable',
+        'slug': 'wanted-sans',
+        'sources': ('WantedSansVariable.ttf', 'WantedSansVariable.woff2'),
+        'weight': '100 900',
+        'base': True,
+        'preload': True,
+        'cdn': '<link rel="preconnect" href="https://cdn.jsdelivr.net">\n'
+               '    <link href="https://cdn.jsdelivr.net/gh/wanteddev/wanted-sans@v1.0.3/packages/'
+               'wanted-sans/fonts/webfonts/variable/complete/WantedSansVariable.min.css" rel="stylesheet">',
+    },
+    {
+        'family': 'HsSantoki20',
+        'slug': 'hs-santokki20',
+        'sources': ('HSSanTokki20-Regular.ttf', 'HSSanTokki20-Regular.woff2'),
+        'weight': 'normal',
+        'base': False,
+        'preload': False,
+        'cdn': "<style>@font-face{font-family:'HsSantoki20';"
+               "src:url('https://cdn.jsdelivr.net/gh/projectnoonnu/2405@1.0/HSSanTokki20-Regular.woff2') "
+               "format('woff2');font-weight:normal;font-display:swap}</style>",
+    },
+]
+
+HANGUL_FIRST = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 화면에 보이는 글자 수집용
+SKIP_BLOCKS = re.compile(r'<(style|svg)\b.*?</\1>', re.S | re.I)
+SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script>', re.S | re.I)
+SCRIPT_STRING = re.compile(r"'((?:[^'\\\n]|\\.)*)'|\"((?:[^\"\\\n]|\\.)*)\"|`([^`]*)`")
+VISIBLE_ATTR = re.compile(r'\s(?:placeholder|title|alt|aria-label|value)="([^"]*)"', re.I)
+TAG = re.compile(r'<[^>]+>')
+
+
+def base_codepoints():
+    """기본 범위: ASCII + 한글 호환 자모 + KS X 1001 완성형 한글 2350자"""
+    codepoints = set(range(0x20, 0x7F)) | set(range(0x3131, 0x3164))
+    for lead in range(0xB0, 0xC9):
+        for trail in range(0xA1, 0xFF):
+            char = bytes((lead, trail)).decode('euc-kr', errors='ignore')
+            if char and HANGUL_FIRST <= ord(char) <= HANGUL_LAST:
+                codepoints.add(ord(char))
+    return codepoints
+
+
+def _script_text(source):
+    """스크립트에서 문자열 리터럴만 (동적으로 넣는 안내 문구 등)"""
+    return ' '.join(''.join(groups) for groups in SCRIPT_STRING.findall(source))
+
+
+def collect_characters(dist_dir):
+    """
+    렌더링된 HTML(텍스트, 보이는 속성, 인라인 스크립트 문자열)과 dist/static/js 문자열의 글자 빈도
+
+    Returns:
+        Counter: {코드 포인트: 등장 횟수}
+    """
+    counts = Counter()
+    for path in glob.glob(os.path.join(dist_dir, '**', '*.html'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            page = SKIP_BLOCKS.sub(' ', f.read())
+        scripts = ' '.join(SCRIPT_BLOCK.findall(page))
+        page = SCRIPT_BLOCK.sub(' ', page)
+        attrs = ' '.join(VISIBLE_ATTR.findall(page))
+        counts.update(html.unescape(TAG.sub(' ', page) + ' ' + attrs))
+        counts.update(_script_text(scripts))
+
+    for path in glob.glob(os.path.join(dist_dir, 'static', 'js', '**', '*.js'), recursive=True):
+        with open(path, encoding='utf-8') as f:
+            counts.update(_script_text(f.read()))
+
+    return Counter({ord(char): n for char, n in counts.items() if not char.isspace() or char == ' '})
+
+
+def plan_slices(counts, available, include_base):
+    """
+    조각별 코드 포인트 목록
+
+    Args:
+        counts: collect_characters 결과
+        available: 원본 폰트에 글리프가 있는 코드 포인트
+        include_base: 기본 한글 범위 포함 여부
+
+    Returns:
+        list[list[int]]: 0번은 자주 쓰는 글자 조각, 나머지는 코드 포인트 순 고정 경계 조각
+    """
+    base = base_codepoints()
+    wanted = (set(counts) | base if include_base else set(counts)) & available
+
+    def is_hangul(code):
+        return HANGUL_FIRST <= code <= HANGUL_LAST
+
+    frequent = sorted((code for code in counts if code in wanted and is_hangul(code)),
+                      key=lambda code: (-counts[code], code))[:PRIMARY_SLICE_HANGUL]
+    primary = set(frequent) | {code for code in wanted if not is_hangul(code)}
+
+    # 고정 경계: 기본 범위 한글 SLICE_SIZE 자마다 (내용과 무관하게 항상 같은 위치)
+    base_hangul = sorted(code for code in base if is_hangul(code))
+    bounds = base_hangul[SLICE_SIZE::SLICE_SIZE]
+    slices = [[] for _ in range(len(bounds) + 1)]
+    for code in sorted(wanted - primary):
+        index = 0
+        while index < len(bounds) and code >= bounds[index]:
+            index += 1
+        slices[index].append(code)
+
+    return [sorted(primary)] + [codes for codes in slices if codes]
+
+
+def unicode_range(codepoints):
+    """정렬된 코드 포인트 → 'U+AC00-AC02,U+AC04' (연속 구간 병합)"""
+    ranges = []
+    for code in codepoints:
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ','.join(f'U+{start:X}' if start == end else f'U+{start:X}-{end:X}'
+                    for start, end in ranges)
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _find_source(source_dir, face):
+    for name in face['sources']:
+        path = os.path.join(source_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _subset(source, codepoints, out_path):
+    """원본 폰트를 codepoints 글리프만 남긴 woff2 로 저장 (힌팅 제거, OpenType 기능 유지)"""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.hinting = False
+    options.desubroutinize = True
+    options.name_IDs = [1, 2]
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, out_path, options)
+    font.close()
+
+
+def _available_codepoints(source):
+    from fontTools.ttLib import TTFont
+    with TTFont(source, lazy=True) as font:
+        return set(font.getBestCmap())
+
+
+def build_face(face, source, counts, out_dir):
+    """
+    폰트 하나의 조각 woff2 생성 (이미 있는 조각은 재사용)
+
+    Returns:
+        tuple: (@font-face CSS 목록, 조각 파일명 목록, 새로 만든 조각 수)
+    """
+    source_digest = _file_digest(source)
+    rules, files, created = [], [], 0
+    for codepoints in plan_slices(counts, _available_codepoints(source), face['base']):
+        key = f'{SUBSET_VERSION}:{source_digest}:{unicode_range(codepoints)}'
+        filename = f"{face['slug']}.{hashlib.sha1(key.encode('ascii')).hexdigest()[:10]}.woff2"
+        out_path = os.path.join(out_dir, filename)
+        if not os.path.exists(out_path):
+            _subset(source, codepoints, out_path)
+            created += 1
+        files.append(filename)
+        url = f'/{FONT_OUTPUT_DIR.replace(os.sep, "/")}/{filename}'
+        rules.append(
+            f"@font-face{{font-family:'{face['family']}';font-style:normal;"
+            f"font-weight:{face['weight']};font-display:swap;"
+            f"src:url({url}) format('woff2');unicode-range:{unicode_range(codepoints)}}}"
+        )
+    return rules, files, created
+
+
+def build_webfonts(dist_dir, source_dir):
+    """
+    웹폰트 조각 + @font-face 스타일시트 생성
+
+    Returns:
+        dict: {'markup': 자리 표시 주석을 대신할 태그, 'faces': 자체 제공 폰트 수,
+               'slices', 'created', 'bytes': 0번 조각 합계, 'total_bytes', 'fallback': CDN 폰트 이름 목록}
+    """
+    try:
+        import fontTools.subset  # noqa: F401
+        import brotli  # noqa: F401
+    except ImportError:
+        fonttools_ready = False
+    else:
+        fonttools_ready = True
+
+    out_dir = os.path.join(dist_dir, FONT_OUTPUT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    counts = collect_characters(dist_dir)
+
+    rules, keep, preloads, fallback = [], set(), [], []
+    created = primary_bytes = 0
+    for face in FONT_FACES:
+        source = _find_source(source_dir, face) if fonttools_ready else None
+        if source is None:
+            fallback.append(face)
+            continue
+        face_rules, files, face_created = build_face(face, source, counts, out_dir)
+        rules.extend(face_rules)
+        keep.update(files)
+        created += face_created
+        primary_bytes += os.path.getsize(os.path.join(out_dir, files[0]))
+        if face['preload']:
+            preloads.append(f'/{FONT_OUTPUT_DIR.replace(os.sep, "/")}/{files[0]}')
+
+    # 이전 빌드의 조각/스타일시트 정리
+    for old in glob.glob(os.path.join(out_dir, '*.woff2')):
+        if os.path.basename(old) not in keep:
+            os.remove(old)
+    css_dir = os.path.join(dist_dir, STYLESHEET_DIR)
+    os.makedirs(css_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(css_dir, f'{STYLESHEET_PREFIX}.*.css')):
+        os.remove(old)
+
+    tags = [face['cdn'] for face in fallback]
+    if rules:
+        body = '\n'.join(rules).encode('utf-8')
+        filename = f'{STYLESHEET_PREFIX}.{hashlib.sha1(body).hexdigest()[:10]}.css'
+        with open(os.path.join(css_dir, filename), 'wb') as f:
+            f.write(body)
+        tags = [f'<link rel="preload" href="{url}" as="font" type="font/woff2" crossorigin>'
+                for url in preloads] + \
+               [f'<link rel="stylesheet" href="/{STYLESHEET_DIR.replace(os.sep, "/")}/{filename}">'] + tags
+
+    return {
+        'markup': '\n    '.join(tags),
+        'faces': len(FONT_FACES) - len(fallback),
+        'slices': len(keep),
+        'created': created,
+        'bytes': primary_bytes,
+        'total_bytes': sum(os.path.getsize(os.path.join(out_dir, name)) for name in keep),
+        'fallback': [face['family'] for face in fallback],
+        'fonttools': fonttools_ready,
+    }